@@ -0,0 +1,71 @@
+"""Time-based animations on one shared timeline.
+
+Each effect records when it started on the timeline, and its frame is
+worked out from the elapsed time whenever it is drawn, so a slow render
+skips frames instead of slowing the animation down. Effects outside their
+time span are skipped without any work. The timeline runs at an adjustable
+speed: 0 pauses it, above 1 fast-forwards and below 0 rewinds, which is
+what replay playback needs. Nothing here depends on pygame, the clock is
+any function returning milliseconds.
+"""
+import math
+
+
+class Animation:
+    """frame_count frames of frame_ms each, from start until end on the timeline"""
+    __slots__ = ("start", "end", "frame_count", "frame_ms", "loop", "data")
+
+    def __init__(self, start, end, frame_count, frame_ms, loop, data):
+        self.start = start
+        self.end = end
+        self.frame_count = frame_count
+        self.frame_ms = frame_ms
+        self.loop = loop
+        self.data = data  # whatever the drawing code needs, e.g. the cell
+
+    def frame(self, now):
+        index = int((now - self.start) // self.frame_ms)
+        # A finished sequence holds its last frame until the animation ends
+        return index % self.frame_count if self.loop else min(index, self.frame_count - 1)
+
+
+class Timeline:
+    def __init__(self, clock):
+        self.clock = clock  # milliseconds, e.g. pygame.time.get_ticks
+        self.time = 0.0
+        self.speed = 1.0
+        self._last = None
+        self._animations = {}  # name -> Animation, starting one again replaces it
+
+    def update(self):
+        """Move the timeline on by the clock time since the last update, times the speed"""
+        now = self.clock()
+        if self._last is not None:
+            self.time += (now - self._last) * self.speed
+        self._last = now
+        return self.time
+
+    def seek(self, time):
+        self.time = time
+
+    def start(self, name, frame_count=1, frame_ms=1, duration=None, loop=False, **data):
+        """Start an animation now; without a duration it ends after its frames, or never if it loops"""
+        now = self.update()
+        if duration is None:
+            duration = math.inf if loop else frame_count * frame_ms
+        self._animations[name] = Animation(now, now + duration, frame_count, frame_ms, loop, data)
+
+    def stop(self, name):
+        self._animations.pop(name, None)
+
+    def get(self, name):
+        """The animation if it is running at the current time, else None"""
+        animation = self._animations.get(name)
+        if animation is None or not animation.start <= self.time < animation.end:
+            return None
+        return animation
+
+    def frame(self, name):
+        """Current frame number of a running animation, or None"""
+        animation = self.get(name)
+        return None if animation is None else animation.frame(self.time)
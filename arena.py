@@ -0,0 +1,219 @@
+"""Arena rounds: up to eight seekers hunting several Jerrys on one board.
+
+Seekers take turns in order, each moving one cell or placing a block, and
+whoever steps onto a Jerry finds him. The round ends when every Jerry is
+found, and the seeker who found the most wins. Any seeker can be played by
+the computer.
+
+Seeker state lives in arrays indexed by seeker number rather than in a
+pair of fields per player. Feedback comes from one distance field to the
+nearest Jerry still hidden, built in a single breadth-first pass from all
+of them at once. The field only changes when a block goes down or a Jerry
+is found, and every seeker's distance and feedback is a lookup in it, so a
+turn costs at most one pass over the board however many seekers and Jerrys
+there are. Like ``rules``, nothing here needs pygame; ``arena_view`` plays
+it in the game window::
+
+    python arena.py --seekers 6 --jerrys 3 --grid-size 60 --rounds 20
+    python hide_seek_game.py --arena --seekers 6 --jerrys 3 --computers 2
+"""
+import argparse
+import bisect
+import random
+import time
+from array import array
+
+import layouts
+from belief import BAND_EDGES, FEEDBACK_BANDS
+from pathfinding import block_cells, nearest_source_field
+from rules import DIRECTIONS
+
+ARENA_GRID_SIZE = 30
+MAX_SEEKERS = 8
+BLOCKS_PER_SEEKER = 2
+SPOTS_PER_JERRY = 4
+
+
+def feedback_band(distance):
+    """The feedback shown at a distance, the same bands as RoundState.get_feedback"""
+    return FEEDBACK_BANDS[bisect.bisect_right(BAND_EDGES, distance)]
+
+
+def start_cells(grid_size, count):
+    """Corners first, then the middle of each edge"""
+    last, middle = grid_size - 1, grid_size // 2
+    cells = [(0, 0), (last, last), (0, last), (last, 0), (0, middle), (last, middle), (middle, 0), (middle, last)]
+    return cells[:count]
+
+
+class ArenaState:
+    def __init__(self, grid_size=ARENA_GRID_SIZE, seekers=4, jerrys=2, computer=(), rng=random):
+        if not 2 <= seekers <= MAX_SEEKERS:
+            raise ValueError(f"An arena has 2 to {MAX_SEEKERS} seekers")
+        if jerrys < 1:
+            raise ValueError("An arena needs at least one Jerry")
+        self.grid_size = grid_size
+        self.seeker_count = seekers
+        self.jerry_count = jerrys
+        self.rng = rng
+        # One entry per seeker
+        self.seeker_x = array("i", [0] * seekers)
+        self.seeker_y = array("i", [0] * seekers)
+        self.blocks_remaining = array("i", [0] * seekers)
+        self.found_count = array("i", [0] * seekers)
+        self.distance = array("i", [0] * seekers)  # steps to the nearest hidden Jerry, -1 if none can be reached
+        self.feedback = [""] * seekers
+        self.computer = [i in computer for i in range(seekers)]
+        self.wins = array("i", [0] * seekers)
+
+        self.blocks = []
+        self.blocked = set()
+        self.hiding_spots = []
+        self.jerrys = []  # cells of the Jerrys still hidden
+        self.found = []  # (cell, seeker) in the order they were found
+        self.field = None
+        self.fields_built = 0
+        self.turn = 0  # the seeker to play
+        self.over = False
+        self.reset_round()
+
+    def seeker_pos(self, seeker):
+        return (self.seeker_x[seeker], self.seeker_y[seeker])
+
+    def reset_round(self):
+        starts = start_cells(self.grid_size, self.seeker_count)
+        for i, (x, y) in enumerate(starts):
+            self.seeker_x[i], self.seeker_y[i] = x, y
+            self.blocks_remaining[i] = BLOCKS_PER_SEEKER
+            self.found_count[i] = 0
+        self.blocks = []
+        self.blocked = set()
+        spot_count = min(self.jerry_count * SPOTS_PER_JERRY, self.grid_size * self.grid_size - len(starts))
+        self.hiding_spots = layouts.sample_cells(self.grid_size, spot_count, starts, self.rng)
+        self.jerrys = self.rng.sample(self.hiding_spots, min(self.jerry_count, spot_count))
+        self.found = []
+        self.turn = 0
+        self.over = False
+        self.update_field()
+
+    def update_field(self):
+        """Rebuild the distance field to the hidden Jerrys and read every seeker's feedback from it"""
+        self.field = nearest_source_field(self.grid_size, self.blocked, self.jerrys)
+        self.fields_built += 1
+        self.update_feedback()
+
+    def update_feedback(self):
+        n = self.grid_size
+        field = self.field
+        for i in range(self.seeker_count):
+            d = int(field[self.seeker_x[i] * n + self.seeker_y[i]])
+            self.distance[i] = d
+            self.feedback[i] = feedback_band(d) if d >= 0 else ""
+
+    def end_turn(self):
+        if not self.jerrys:
+            self.over = True
+            best = max(self.found_count)
+            for i in range(self.seeker_count):
+                if self.found_count[i] == best:
+                    self.wins[i] += 1
+            return
+        self.turn = (self.turn + 1) % self.seeker_count
+
+    def move(self, seeker, direction):
+        """Move a seeker one cell and end its turn, returns False if it cannot go there"""
+        if self.over or seeker != self.turn:
+            return False
+        dx, dy = DIRECTIONS[direction]
+        x, y = self.seeker_x[seeker] + dx, self.seeker_y[seeker] + dy
+        if not (0 <= x < self.grid_size and 0 <= y < self.grid_size) or (x, y) in self.blocked:
+            return False
+        self.seeker_x[seeker], self.seeker_y[seeker] = x, y
+        if (x, y) in self.jerrys:
+            self.jerrys.remove((x, y))
+            self.found.append(((x, y), seeker))
+            self.found_count[seeker] += 1
+            self.update_field()
+        else:
+            self.update_feedback()
+        self.end_turn()
+        return True
+
+    def block_allowed(self, x, y, orientation):
+        """In bounds, on free cells, off seekers and hiding spots, and walling nobody in"""
+        cells = block_cells(x, y, orientation)
+        seekers = {self.seeker_pos(i) for i in range(self.seeker_count)}
+        for cell in cells:
+            if not (0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size):
+                return False
+            if cell in self.blocked or cell in seekers or cell in self.hiding_spots:
+                return False
+        # Every seeker must still reach every hiding spot: one flood from the first seeker
+        reach = nearest_source_field(self.grid_size, self.blocked.union(cells), [self.seeker_pos(0)])
+        n = self.grid_size
+        return all(reach[cx * n + cy] >= 0 for cx, cy in list(seekers) + self.hiding_spots)
+
+    def place_block(self, seeker, x, y, orientation):
+        """Place one of the seeker's blocks and end its turn, returns False if not allowed"""
+        if self.over or seeker != self.turn or self.blocks_remaining[seeker] <= 0:
+            return False
+        if not self.block_allowed(x, y, orientation):
+            return False
+        self.blocks.append((x, y, orientation))
+        self.blocked.update(block_cells(x, y, orientation))
+        self.blocks_remaining[seeker] -= 1
+        self.update_field()
+        self.end_turn()
+        return True
+
+    def computer_move(self, skill=0.8):
+        """Step down the distance field towards the nearest Jerry, or at random now and then"""
+        seeker = self.turn
+        n = self.grid_size
+        x, y = self.seeker_x[seeker], self.seeker_y[seeker]
+        options = []
+        for name, (dx, dy) in DIRECTIONS.items():
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < n and 0 <= ny < n and (nx, ny) not in self.blocked:
+                options.append((int(self.field[nx * n + ny]), name))
+        if not options:
+            self.end_turn()
+            return
+        reachable = [option for option in options if option[0] >= 0]
+        if reachable and self.rng.random() < skill:
+            best = min(d for d, _ in reachable)
+            self.move(seeker, self.rng.choice([name for d, name in reachable if d == best]))
+        else:
+            self.move(seeker, self.rng.choice(options)[1])
+
+    def play_computers(self):
+        """Play computer seekers until a human's turn comes up or the round is over"""
+        while not self.over and self.computer[self.turn]:
+            self.computer_move()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play computer-only arena rounds and time their turns")
+    parser.add_argument("--grid-size", type=int, default=ARENA_GRID_SIZE)
+    parser.add_argument("--seekers", type=int, default=4)
+    parser.add_argument("--jerrys", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    arena = ArenaState(args.grid_size, args.seekers, args.jerrys, computer=range(args.seekers),
+                       rng=random.Random(args.seed))
+    turns = 0
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        while not arena.over:
+            arena.computer_move()
+            turns += 1
+        arena.reset_round()
+    elapsed = time.perf_counter() - start
+    print(f"{args.rounds} rounds, {turns} turns, {elapsed / turns * 1e6:.0f} us per turn,"
+          f" {arena.fields_built} distance fields built")
+    print("wins by seeker:", list(arena.wins))
+
+
+if __name__ == "__main__":
+    main()
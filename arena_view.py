@@ -0,0 +1,286 @@
+"""Arena rounds in the game window, for party cabinets with up to eight seats.
+
+    python hide_seek_game.py --arena --seekers 6 --jerrys 3 --computers 2
+
+The rules are ``arena.ArenaState``'s; this module draws the board and reads
+input. The first seekers are people and the last ``computers`` are played
+by the computer. Every seat has its own four movement keys (``ARENA_KEYS``,
+a cabinet wires one stick per seat to them) and they only work on that
+seat's turn. Blocks are placed with the mouse: B or the Place Block button
+picks one up, R turns it and a click on the board puts it down. The board
+scrolls and zooms like the two-player game's, following whoever is to
+play.
+"""
+import pygame
+
+import arena
+import hide_seek_game as ui
+from camera import Camera
+from sprite_cache import SpriteCache
+
+# Up, down, left and right for each seat, and how the side panel names them
+ARENA_KEYS = [
+    ui.PLAYER1_KEYS,
+    ui.PLAYER2_KEYS,
+    {pygame.K_i: "up", pygame.K_k: "down", pygame.K_j: "left", pygame.K_l: "right"},
+    {pygame.K_KP8: "up", pygame.K_KP5: "down", pygame.K_KP4: "left", pygame.K_KP6: "right"},
+    {pygame.K_t: "up", pygame.K_g: "down", pygame.K_f: "left", pygame.K_h: "right"},
+    {pygame.K_HOME: "up", pygame.K_END: "down", pygame.K_DELETE: "left", pygame.K_PAGEDOWN: "right"},
+    {pygame.K_1: "up", pygame.K_2: "down", pygame.K_3: "left", pygame.K_4: "right"},
+    {pygame.K_7: "up", pygame.K_8: "down", pygame.K_9: "left", pygame.K_0: "right"},
+]
+KEY_LABELS = ["arrows", "WASD", "IJKL", "numpad 8546", "TGFH", "Home End Del PgDn", "1234", "7890"]
+SEEKER_COLORS = [(40, 90, 220), (220, 40, 40), (30, 160, 60), (230, 140, 0),
+                 (150, 40, 200), (0, 170, 170), (200, 60, 140), (110, 80, 40)]
+COMPUTER_DELAY_MS = 250  # between computer seekers' moves, so people can follow them
+
+
+class ArenaView:
+    def __init__(self, state):
+        self.state = state
+        self.font = ui.get_font(24)
+        self.small_font = ui.get_font(18)
+        self.big_font = ui.get_font(36)
+        self.clock = pygame.time.Clock()
+        self.scaled_sprites = SpriteCache()
+        self.base_cell_size = ui.board_cell_size()
+        self.camera = Camera(state.grid_size, (ui.GRID_OFFSET_X, ui.GRID_OFFSET_Y, ui.WIDTH, ui.HEIGHT),
+                             self.base_cell_size)
+        self.followed_turn = None
+        self.block_placement_mode = False
+        self.block_orientation = "horizontal"
+        self.place_block_button = None
+        self.next_round_button = None
+        self.computer_wait = 0  # ms until the computer seeker to play moves
+
+    def sprite(self, image, size):
+        if image.get_size() == size:
+            return image
+        return self.scaled_sprites.get(image, size)
+
+    def fit_to_window(self):
+        cell = ui.board_cell_size()
+        zoom = self.camera.cell_size / self.base_cell_size
+        self.base_cell_size = cell
+        self.camera.resize((ui.GRID_OFFSET_X, ui.GRID_OFFSET_Y, ui.WIDTH, ui.HEIGHT), round(cell * zoom))
+
+    def handle_display_event(self, event):
+        """Follow window resizes and the fullscreen key, returns True if the event was one of them"""
+        if event.type == pygame.VIDEORESIZE:
+            if not ui.screen.get_flags() & pygame.FULLSCREEN:
+                ui.resize_window(event.w, event.h)
+        elif event.type == pygame.KEYDOWN and event.key == ui.FULLSCREEN_KEY:
+            ui.toggle_fullscreen()
+        else:
+            return False
+        self.fit_to_window()
+        return True
+
+    def human_turn(self):
+        return not self.state.over and not self.state.computer[self.state.turn]
+
+    def handle_event(self, event):
+        """Play one input event, returns False when the window is closed"""
+        a = self.state
+        if event.type == pygame.QUIT:
+            return False
+        if event.type == pygame.KEYDOWN:
+            if a.over:
+                if event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                    self.next_round()
+            elif not self.human_turn():
+                pass
+            elif event.key in ARENA_KEYS[a.turn]:
+                a.move(a.turn, ARENA_KEYS[a.turn][event.key])
+            elif event.key == pygame.K_b and a.blocks_remaining[a.turn] > 0:
+                self.block_placement_mode = not self.block_placement_mode
+            elif event.key == pygame.K_r:
+                self.block_orientation = "vertical" if self.block_orientation == "horizontal" else "horizontal"
+            elif event.key == pygame.K_ESCAPE:
+                self.block_placement_mode = False
+        elif event.type == pygame.MOUSEWHEEL:
+            self.camera.zoom(event.y, pygame.mouse.get_pos())
+        elif event.type == pygame.MOUSEMOTION and event.buttons[2]:
+            self.camera.pan(-event.rel[0], -event.rel[1])
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.next_round_button and self.next_round_button.collidepoint(event.pos):
+                self.next_round()
+            elif not self.human_turn():
+                pass
+            elif self.place_block_button and self.place_block_button.collidepoint(event.pos):
+                self.block_placement_mode = True
+            elif self.block_placement_mode:
+                cell = self.camera.cell_at(event.pos)
+                if cell is not None and a.place_block(a.turn, *cell, self.block_orientation):
+                    self.block_placement_mode = False
+        return True
+
+    def next_round(self):
+        self.state.reset_round()
+        self.block_placement_mode = False
+        self.followed_turn = None
+
+    def update(self, elapsed):
+        """Play the computer seeker whose turn it is, once its delay is up"""
+        a = self.state
+        if a.over or not a.computer[a.turn]:
+            self.computer_wait = COMPUTER_DELAY_MS
+            return
+        self.computer_wait -= elapsed
+        if self.computer_wait <= 0:
+            a.computer_move()
+            self.computer_wait = COMPUTER_DELAY_MS
+
+    def draw(self):
+        a = self.state
+        ui.screen.fill((230, 230, 255))
+        if a.turn != self.followed_turn:
+            # A new turn: follow the seeker to play, a block picked up by the last one is put back
+            self.followed_turn = a.turn
+            self.camera.following = True
+            self.block_placement_mode = False
+        if self.camera.following and not a.over:
+            self.camera.follow(a.seeker_pos(a.turn))
+        self.draw_board()
+        self.draw_panel()
+
+    def draw_board(self):
+        a, cam, screen = self.state, self.camera, ui.screen
+        assets = ui.load_assets()
+        c = cam.cell_size
+        cell = (c, c)
+        screen.set_clip(cam.viewport)
+        first_row, end_row, first_col, end_col = cam.visible_range()
+        # Zoomed far out the sprites would be specks, plain squares show the board instead
+        sprites = c >= ui.LOD_CELL_SIZE
+        if sprites:
+            for x in range(first_row, end_row):
+                for y in range(first_col, end_col):
+                    pygame.draw.rect(screen, ui.BLACK, cam.cell_rect(x, y), 2)
+        else:
+            pygame.draw.rect(screen, ui.WHITE, cam.cell_rect(0, 0, a.grid_size, a.grid_size))
+        found = {spot for spot, _ in a.found}
+        for spot in a.hiding_spots:
+            if cam.is_visible(*spot) and spot not in found:
+                if sprites:
+                    screen.blit(self.sprite(assets.cheese_image, cell), cam.cell_rect(*spot).topleft)
+                else:
+                    pygame.draw.rect(screen, (255, 210, 0), cam.cell_rect(*spot))
+        for x, y, orientation in a.blocks:
+            width, height = (2, 1) if orientation == "horizontal" else (1, 2)
+            if not cam.is_visible(x, y, width, height):
+                continue
+            if sprites:
+                image = assets.block_horizontal if orientation == "horizontal" else assets.block_vertical
+                screen.blit(self.sprite(image, (c * width, c * height)), cam.cell_rect(x, y).topleft)
+            else:
+                pygame.draw.rect(screen, (140, 90, 40), cam.cell_rect(x, y, width, height))
+        for spot in found:
+            if cam.is_visible(*spot):
+                if sprites:
+                    screen.blit(self.sprite(assets.jerry_image, cell), cam.cell_rect(*spot).topleft)
+                else:
+                    pygame.draw.rect(screen, (120, 70, 20), cam.cell_rect(*spot))
+        for i in range(a.seeker_count):
+            pos = a.seeker_pos(i)
+            if not cam.is_visible(*pos):
+                continue
+            rect = cam.cell_rect(*pos)
+            if sprites:
+                image = (assets.tom_images if i % 2 == 0 else assets.spike_images)["idle"]
+                screen.blit(self.sprite(image, cell), rect.topleft)
+                pygame.draw.rect(screen, SEEKER_COLORS[i], rect, 4 if i == a.turn else 2)
+                label = self.font.render(str(i + 1), True, SEEKER_COLORS[i])
+                screen.blit(label, (rect.x + 3, rect.y + 1))
+            else:
+                pygame.draw.rect(screen, SEEKER_COLORS[i], rect)
+        self.draw_block_preview()
+        screen.set_clip(None)
+
+    def draw_block_preview(self):
+        a = self.state
+        if not self.block_placement_mode or not self.human_turn():
+            return
+        cell = self.camera.cell_at(pygame.mouse.get_pos())
+        if cell is None:
+            return
+        width, height = (2, 1) if self.block_orientation == "horizontal" else (1, 2)
+        valid = a.block_allowed(*cell, self.block_orientation)
+        preview = pygame.Surface(self.camera.cell_rect(*cell, width, height).size, pygame.SRCALPHA)
+        preview.fill((0, 255, 0, 100) if valid else (255, 0, 0, 100))
+        ui.screen.blit(preview, self.camera.cell_rect(*cell).topleft)
+
+    def draw_panel(self):
+        a, screen = self.state, ui.screen
+        ui_x = ui.WINDOW_WIDTH - 260
+        y = 24
+        line_height = 24
+        screen.blit(self.big_font.render(f"Arena: {len(a.jerrys)} of {a.jerry_count} Jerrys hidden", True, ui.BLACK),
+                    (24, y))
+        for i in range(a.seeker_count):
+            row = y + 50 + i * line_height
+            pygame.draw.rect(screen, SEEKER_COLORS[i], (ui_x, row, 14, 14))
+            who = "computer" if a.computer[i] else "player"
+            text = f"{i + 1} {who}: {a.found_count[i]} found, {a.blocks_remaining[i]} blocks"
+            if a.feedback[i]:
+                text += f", {a.feedback[i]}"
+            color = SEEKER_COLORS[i] if i == a.turn and not a.over else ui.BLACK
+            screen.blit(self.small_font.render(text, True, color), (ui_x + 20, row))
+        action_y = y + 70 + a.seeker_count * line_height
+        self.place_block_button = None
+        self.next_round_button = None
+        if a.over:
+            best = max(a.found_count)
+            winners = [str(i + 1) for i in range(a.seeker_count) if a.found_count[i] == best]
+            result = f"Seeker {winners[0]} wins!" if len(winners) == 1 else f"Seekers {', '.join(winners)} tie!"
+            screen.blit(self.big_font.render(result, True, ui.BLACK), (ui_x, action_y))
+            self.next_round_button = pygame.Rect(ui_x, action_y + 50, 180, 38)
+            pygame.draw.rect(screen, (200, 200, 255), self.next_round_button, border_radius=8)
+            pygame.draw.rect(screen, ui.BLACK, self.next_round_button, 3, border_radius=8)
+            text = self.font.render("Next Round", True, ui.BLACK)
+            screen.blit(text, text.get_rect(center=self.next_round_button.center))
+        elif not self.human_turn():
+            screen.blit(self.small_font.render(f"Computer {a.turn + 1} is thinking...", True, (255, 200, 0)),
+                        (ui_x, action_y))
+        else:
+            screen.blit(self.small_font.render(f"Seeker {a.turn + 1} to play ({KEY_LABELS[a.turn]})", True,
+                                         SEEKER_COLORS[a.turn]), (ui_x, action_y))
+            if a.blocks_remaining[a.turn] > 0:
+                self.place_block_button = pygame.Rect(ui_x, action_y + 34, 180, 36)
+                pygame.draw.rect(screen, (160, 32, 240), self.place_block_button, border_radius=8)
+                pygame.draw.rect(screen, ui.BLACK, self.place_block_button, 3, border_radius=8)
+                text = self.font.render("Place Block (B)", True, ui.BLACK)
+                screen.blit(text, text.get_rect(center=self.place_block_button.center))
+                screen.blit(self.small_font.render(f"Orientation: {self.block_orientation}, R rotates", True,
+                                                   ui.BLACK), (ui_x, action_y + 76))
+                if self.block_placement_mode:
+                    screen.blit(self.small_font.render("Click on the board to place it", True, (160, 32, 240)),
+                                (ui_x, action_y + 96))
+            feedback = a.feedback[a.turn]
+            assets = ui.load_assets()
+            if feedback in assets.feedback_images:
+                # Below the panel's text, even in the smallest window
+                top = max(action_y + 120, ui.WINDOW_HEIGHT - 200)
+                screen.blit(assets.feedback_images[feedback], (ui_x, top))
+
+    def run(self):
+        """Play arena rounds until the window is closed"""
+        self.clock.tick()
+        while True:
+            for event in pygame.event.get():
+                if self.handle_display_event(event):
+                    continue
+                if not self.handle_event(event):
+                    return
+            self.update(self.clock.tick(ui.FPS))
+            self.draw()
+            pygame.display.flip()
+
+
+def play_arena(grid_size, seekers, jerrys, computers=0, fullscreen=False):
+    """Open an arena round in the game window, the last computers seekers played by the computer"""
+    if not 0 <= computers <= seekers:
+        raise ValueError("There cannot be more computer seekers than seekers")
+    state = arena.ArenaState(grid_size, seekers, jerrys, computer=range(seekers - computers, seekers))
+    ui.init_display(fullscreen=fullscreen)
+    ArenaView(state).run()
@@ -0,0 +1,260 @@
+"""Belief over Jerry's hiding spot for a computer player without hidden information.
+
+The fair computer never reads Jerry's position. It keeps a probability for
+every hiding spot and narrows it down with the same hot/cold feedback bands
+a human sees on screen. Each update or move evaluation is one gather of
+steps from every spot to a few cells and a few array operations over the
+spots. Steps are Manhattan distances until a block changes them: when a
+block lands, only the spots with a shortest path that needed one of its
+cells get a stored field, repaired around the block rather than rebuilt.
+"""
+try:
+    import numpy as np
+except ImportError:  # the fair computer needs NumPy, the other difficulties do not
+    np = None
+
+import core
+from pathfinding import NEIGHBORS, blocked_cells
+
+FEEDBACK_BANDS = ["FOUND", "BURNING", "HOT", "WARM", "COOL", "COLD"]
+# First distance of each band after FOUND, matching RoundState.get_feedback
+BAND_EDGES = [1, 3, 5, 7, 11]
+COLD = len(FEEDBACK_BANDS) - 1
+# Cells a field repair works through between yields, well under a millisecond
+REPAIR_SLICE_CELLS = 128
+
+
+def available():
+    return np is not None
+
+
+class SpotBelief:
+    """Probability that Jerry hides at each spot, given the feedback seen so far"""
+
+    def __init__(self, grid_size, spots):
+        self.grid_size = grid_size
+        self.spots = np.array(spots, dtype=np.intp).reshape(-1, 2)
+        self.probs = np.full(len(self.spots), 1.0 / len(self.spots))
+        self._epoch = None
+        self._free = np.ones((grid_size, grid_size), dtype=bool)
+        self._blocked_grid = bytearray(grid_size * grid_size)  # ~_free in the core's layout
+        self._blocked = set()  # cells blocked in the fields
+        # Spots whose steps are not Manhattan keep a field: slot in _fields, -1 for none
+        self._slot = np.full(len(self.spots), -1, dtype=np.intp)
+        self._fields = np.empty((0, grid_size, grid_size), dtype=np.int16)
+        self._used = 0
+        self._pending = {}  # spot -> cells blocked since its field was last repaired
+        self._repairing = None  # the repair repairs() was stopped in, if any
+        self._spot_grid = np.full((grid_size, grid_size), -1, dtype=np.intp)
+        self._spot_grid[self.spots[:, 0], self.spots[:, 1]] = np.arange(len(self.spots))
+
+    def sync(self, blocks, epoch):
+        """Note the blocks placed since the last call, and which spots' steps they change"""
+        if epoch == self._epoch:
+            return
+        self._epoch = epoch
+        n = self.grid_size
+        cells = {(x, y) for x, y in blocked_cells(blocks) if 0 <= x < n and 0 <= y < n}
+        if not self._blocked <= cells:
+            # A block was taken away: start again from the open board
+            self._free[:] = True
+            self._blocked_grid = bytearray(n * n)
+            self._blocked = set()
+            self._slot[:] = -1
+            self._used = 0
+            self._pending = {}
+            self._repairing = None
+        added = cells - self._blocked
+        if not added:
+            return
+        affected = self._affected(added)
+        for x, y in added:
+            self._free[x, y] = False
+            self._blocked_grid[x * n + y] = 1
+        self._blocked |= added
+        for spot in set(affected.tolist()) | set(self._pending):
+            self._pending.setdefault(spot, set()).update(added)
+
+    def _affected(self, added):
+        """Spots, not already pending, whose steps change once the added cells are blocked
+
+        Steps only change if a cell next to a newly blocked cell b, one step
+        further from the spot, has no other way in: a free neighbour at b's
+        distance that is not blocked now.
+        """
+        n = self.grid_size
+        pairs = []
+        for bx, by in added:
+            for dx, dy in NEIGHBORS:
+                vx, vy = bx + dx, by + dy
+                if 0 <= vx < n and 0 <= vy < n and (vx, vy) not in added and self._free[vx, vy]:
+                    ins = [(vx + ex, vy + ey) for ex, ey in NEIGHBORS
+                           if 0 <= vx + ex < n and 0 <= vy + ey < n and (vx + ex, vy + ey) not in added
+                           and self._free[vx + ex, vy + ey]]
+                    pairs.append(((bx, by), (vx, vy), ins))
+        candidates = np.array([i for i in range(len(self.spots)) if i not in self._pending], dtype=np.intp)
+        if not pairs or not candidates.size:
+            return candidates[:0]
+        m = len(pairs)
+        others = np.zeros((m, 4, 2), dtype=np.intp)
+        valid = np.zeros((m, 4), dtype=bool)
+        for k, (_, _, ins) in enumerate(pairs):
+            for j, cell in enumerate(ins):
+                others[k, j] = cell
+                valid[k, j] = True
+        steps = self._gather(np.concatenate([[b for b, _, _ in pairs], [v for _, v, _ in pairs],
+                                             others.reshape(-1, 2)]), candidates)
+        at_b, at_v, at_others = steps[:m], steps[m:2 * m], steps[2 * m:].reshape(m, 4, -1)
+        other_way = ((at_others == at_b[:, None]) & valid[:, :, None]).any(axis=1)
+        cut_off = (at_b >= 0) & (at_v == at_b + 1) & ~other_way
+        return candidates[cut_off.any(axis=0)]
+
+    def _gather(self, cells, spots=None):
+        """Steps from spots (all by default) to cells, shape (cells, spots), ignoring pending repairs"""
+        cells = np.asarray(cells, dtype=np.intp).reshape(-1, 2)
+        if spots is None:
+            spots = np.arange(len(self.spots))
+        where = self.spots[spots]
+        steps = (np.abs(cells[:, None, 0] - where[None, :, 0])
+                 + np.abs(cells[:, None, 1] - where[None, :, 1]))
+        stored = np.flatnonzero(self._slot[spots] >= 0)
+        if stored.size:
+            slots = self._slot[spots[stored]]
+            steps[:, stored] = self._fields[slots[:, None], cells[None, :, 0], cells[None, :, 1]].T
+        steps[~self._free[cells[:, 0], cells[:, 1]]] = -1
+        return steps
+
+    def _field(self, spot):
+        """The stored field of a spot, made from Manhattan distances the first time"""
+        if self._slot[spot] < 0:
+            if self._used == len(self._fields):
+                grown = np.empty((max(8, 2 * len(self._fields)),) + self._fields.shape[1:], dtype=np.int16)
+                grown[:self._used] = self._fields[:self._used]
+                self._fields = grown
+            rows = np.arange(self.grid_size)
+            x, y = self.spots[spot]
+            self._fields[self._used] = np.abs(rows - x)[:, None] + np.abs(rows - y)[None, :]
+            self._slot[spot] = self._used
+            self._used += 1
+        return self._fields[self._slot[spot]]
+
+    def _start_repair(self, spot):
+        cells = set(self._pending[spot])
+        n = self.grid_size
+        dist = self._field(spot).reshape(-1).tolist()
+        changed = []
+        # The repair may be resumed after more blocks land, it works on the board it started from
+        steps = core.repair_distances(n, bytearray(self._blocked_grid), dist, [x * n + y for x, y in cells],
+                                      changed, REPAIR_SLICE_CELLS)
+        return spot, cells, dist, changed, steps
+
+    def repairs(self, needed=None):
+        """Repair the pending fields of the needed spots, by default those with probability; yields between slices
+
+        A repair the caller stopped going through is picked up where it
+        left off by the next call.
+        """
+        if needed is None:
+            needed = self.probs > 0
+        while True:
+            if self._repairing is None:
+                spot = next((s for s in self._pending if needed[s]), None)
+                if spot is None:
+                    return
+                self._repairing = self._start_repair(spot)
+            spot, cells, dist, changed, steps = self._repairing
+            for _ in steps:
+                yield
+            field = self._field(spot).reshape(-1)
+            while changed:
+                chunk = changed[-REPAIR_SLICE_CELLS:]
+                field[chunk] = [dist[i] for i in chunk]
+                del changed[-REPAIR_SLICE_CELLS:]
+                yield
+            rest = self._pending.pop(spot) - cells
+            if rest:
+                self._pending[spot] = rest
+            self._repairing = None
+
+    def _refresh(self, needed):
+        for _ in self.repairs(needed):
+            pass
+
+    def _steps(self, cells):
+        # Spots without probability never change an answer, their fields may wait
+        self._refresh(self.probs > 0)
+        return self._gather(cells)
+
+    def bands_at(self, cells):
+        """Band index each spot would show at each cell, shape (cells, spots)"""
+        steps = self._steps(cells)
+        bands = np.digitize(steps, BAND_EDGES)
+        bands[steps < 0] = COLD
+        return bands
+
+    def observe(self, cell, feedback):
+        """Keep only the spots that would have shown this feedback at cell"""
+        consistent = self.bands_at([cell])[0] == FEEDBACK_BANDS.index(feedback)
+        probs = self.probs * consistent
+        total = probs.sum()
+        if total > 0:
+            self.probs = probs / total
+        else:
+            # Contradicts everything believed so far, trust the feedback
+            self._refresh(np.ones(len(self.spots), dtype=bool))
+            consistent = self.bands_at([cell])[0] == FEEDBACK_BANDS.index(feedback)
+            if consistent.any():
+                self.probs = consistent / consistent.sum()
+
+    def target_moved(self, seekers):
+        """Jerry jumped to a random other spot that no seeker stands on"""
+        free = np.ones(len(self.spots), dtype=bool)
+        for x, y in seekers:
+            if self._spot_grid[x, y] >= 0:
+                free[self._spot_grid[x, y]] = False
+        f = free.astype(np.float64)
+        total_free = f.sum()
+        if not total_free:
+            return
+        # From spot s' Jerry picks uniformly among the free spots other than s'
+        choices = total_free - f
+        jump = np.where(choices > 0, self.probs / np.maximum(choices, 1), 0.0)
+        probs = f * (jump.sum() - jump)
+        # With no other free spot he may stay where he is
+        probs += f * self.probs[choices == 0].sum() / total_free
+        self.probs = probs / probs.sum()
+
+    def entropy(self):
+        p = self.probs[self.probs > 0]
+        return float(-(p * np.log2(p)).sum())
+
+    def information_gain(self, cells):
+        """Expected entropy drop in bits from the feedback at each cell"""
+        bands = self.bands_at(cells)
+        count = len(bands)
+        slots = bands + len(FEEDBACK_BANDS) * np.arange(count)[:, None]
+        # Feedback is exact, so the gain is the entropy of the band distribution
+        outcome = np.bincount(slots.ravel(), weights=np.tile(self.probs, count),
+                              minlength=count * len(FEEDBACK_BANDS)).reshape(count, -1)
+        logs = np.log2(outcome, out=np.zeros_like(outcome), where=outcome > 0)
+        return -(outcome * logs).sum(axis=1)
+
+    def expected_distance(self, cells):
+        """Expected steps from each cell to Jerry"""
+        steps = self._steps(cells).astype(np.float64)
+        steps[steps < 0] = self.grid_size * self.grid_size
+        return steps @ self.probs
+
+    def probability_at(self, cells):
+        """Chance that Jerry is on each cell"""
+        cells = np.asarray(cells, dtype=np.intp).reshape(-1, 2)
+        index = self._spot_grid[cells[:, 0], cells[:, 1]]
+        return np.where(index >= 0, self.probs[index], 0.0)
+
+    def score_moves(self, cells, distance_weight=0.5, win_weight=10.0):
+        """Rank candidate cells: finding Jerry, then learning, then getting closer"""
+        return (win_weight * self.probability_at(cells) + self.information_gain(cells)
+                - distance_weight * self.expected_distance(cells))
+
+    def most_likely(self):
+        return tuple(int(v) for v in self.spots[int(self.probs.argmax())])
@@ -0,0 +1,83 @@
+"""Arena feedback: one multi-source distance field against a search per seeker and Jerry.
+
+Run from the repository root:
+
+    python benchmarks/bench_arena.py
+
+Computer-only arena rounds are played on boards of several sizes with more
+and more seekers and Jerrys, placing a few blocks first so the board is not
+open. After every turn each seeker's distance to the nearest Jerry is
+worked out twice: the arena's way (rebuild the field if a block went down
+or a Jerry was found, then one lookup per seeker) and the two-player game's
+way (a pathfinding search from every seeker to every Jerry, keeping the
+shortest). The answers are checked against each other. Most turns only
+look distances up; the time to rebuild the field, which a turn pays when a
+block goes down or a Jerry is found, is shown as well.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import arena  # noqa: E402
+import pathfinding  # noqa: E402
+
+SIZES = [30, 100, 200]
+LINEUPS = [(2, 1), (4, 2), (8, 4), (8, 8)]
+TURNS = 20
+REBUILDS = 5
+
+
+def setup(size, seekers, jerrys):
+    rng = random.Random(size * 100 + seekers * 10 + jerrys)
+    a = arena.ArenaState(size, seekers, jerrys, computer=range(seekers), rng=rng)
+    placed = 0
+    while placed < size // 2:
+        seeker = a.turn
+        if a.place_block(seeker, rng.randrange(size), rng.randrange(size), rng.choice(["horizontal", "vertical"])):
+            placed += 1
+            a.blocks_remaining[seeker] += 1
+    return a
+
+
+def per_search(a, pathfinder):
+    found = []
+    for i in range(a.seeker_count):
+        steps = [pathfinder.distance(a.seeker_pos(i), jerry, a.blocks) for jerry in a.jerrys]
+        d = min(steps, default=float('inf'))
+        found.append(-1 if d == float('inf') else d)
+    return found
+
+
+def main():
+    for size in SIZES:
+        for seekers, jerrys in LINEUPS:
+            a = setup(size, seekers, jerrys)
+            pathfinder = pathfinding.make_pathfinder("numpy", size)  # an exact reference
+            field_times, search_times = [], []
+            for _ in range(TURNS):
+                if a.over:
+                    break
+                start = time.perf_counter()
+                a.computer_move()  # includes the field rebuild and every seeker's lookup
+                field_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                expected = per_search(a, pathfinder)
+                search_times.append(time.perf_counter() - start)
+                assert list(a.distance) == expected, (list(a.distance), expected)
+            rebuilds = []
+            for _ in range(REBUILDS):
+                start = time.perf_counter()
+                a.update_field()
+                rebuilds.append(time.perf_counter() - start)
+            print(f"{size:>3}x{size:<3} board, {seekers} seekers, {jerrys} Jerrys: "
+                  f"field {statistics.mean(field_times) * 1000:6.3f} ms per turn"
+                  f" ({statistics.median(rebuilds) * 1000:5.2f} ms to rebuild), "
+                  f"{seekers * jerrys:>2} searches {statistics.mean(search_times) * 1000:7.1f} ms per turn")
+
+
+if __name__ == "__main__":
+    main()
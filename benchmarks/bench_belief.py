@@ -0,0 +1,100 @@
+"""Cost of the fair computer's belief updates on large boards.
+
+Run from the repository root:
+
+    python benchmarks/bench_belief.py
+
+Steps are Manhattan distances until a block lands, so "open ms" should be
+next to nothing. "block ms" is the work a block causes: finding the spots
+whose steps it changes and repairing their fields, with every spot still
+possible. The repairs run a spot at a time between the fair computer's
+yields, "slice ms" is the longest one. Times are CPU time, as the
+policies' budgets are, and each block is timed ROUNDS times from a fresh
+belief with the median kept. Observing a feedback band, a Move
+Target and scoring the four candidate moves happen every turn. Every
+update must stay under its limit, the benchmark fails otherwise.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import layouts  # noqa: E402
+from belief import SpotBelief  # noqa: E402
+
+CASES = [(10, 12), (50, 100), (100, 300), (150, 500)]  # (grid size, spots)
+REPEATS = 2000
+ROUNDS = 7
+# Upper limits in ms: opening sync, finding the changed spots, one repair slice, one turn's update
+OPEN_LIMIT_MS = 1.0
+SYNC_LIMIT_MS = 1.0
+SLICE_LIMIT_MS = 1.0
+TURN_LIMIT_MS = 1.0
+
+
+def per_call_us(fn):
+    start = time.process_time()
+    for _ in range(REPEATS):
+        fn()
+    return (time.process_time() - start) / REPEATS * 1e6
+
+
+def time_block(grid_size, spots, neighbors):
+    """(open ms, sync ms, block ms, slice ms, belief) for one block landing on a fresh belief"""
+    belief = SpotBelief(grid_size, spots)
+    start = time.process_time()
+    belief.sync([], 0)
+    open_ms = (time.process_time() - start) * 1000
+    blocks = [(grid_size // 2, grid_size // 2 - 1, "horizontal"), (1, grid_size - 1, "vertical")]
+    start = time.process_time()
+    belief.sync(blocks, 1)
+    sync_ms = (time.process_time() - start) * 1000
+    slice_ms = 0.0
+    repairs = belief.repairs()
+    while True:
+        slice_start = time.process_time()
+        try:
+            next(repairs)
+        except StopIteration:
+            break
+        slice_ms = max(slice_ms, (time.process_time() - slice_start) * 1000)
+    belief.score_moves(neighbors)
+    block_ms = (time.process_time() - start) * 1000
+    return open_ms, sync_ms, block_ms, slice_ms, belief
+
+
+def main():
+    rng = random.Random(5)
+    print(f"{'grid':>5} {'spots':>6} {'open ms':>8} {'sync ms':>8} {'block ms':>9} {'slice ms':>9} "
+          f"{'observe us':>11} {'moved us':>9} {'score us':>9}")
+    failures = []
+    for grid_size, spot_count in CASES:
+        spots, _ = layouts.generate_layout(grid_size, rng, (), spot_count, spot_count)
+        cell = (grid_size // 3, grid_size // 3)
+        neighbors = [(cell[0] + dx, cell[1] + dy) for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0))]
+        runs = [time_block(grid_size, spots, neighbors) for _ in range(ROUNDS)]
+        open_ms, sync_ms, block_ms, slice_ms = (statistics.median(run[i] for run in runs) for i in range(4))
+        belief = runs[-1][4]
+        observe = per_call_us(lambda: belief.observe(cell, "COLD"))
+        moved = per_call_us(lambda: belief.target_moved(((0, 0), cell)))
+        score = per_call_us(lambda: belief.score_moves(neighbors))
+        print(f"{grid_size:>5} {spot_count:>6} {open_ms:>8.2f} {sync_ms:>8.2f} {block_ms:>9.2f} {slice_ms:>9.2f} "
+              f"{observe:>11.1f} {moved:>9.1f} {score:>9.1f}")
+        for name, ms, limit in (("open sync", open_ms, OPEN_LIMIT_MS), ("block sync", sync_ms, SYNC_LIMIT_MS),
+                                ("repair slice", slice_ms, SLICE_LIMIT_MS),
+                                ("observe", observe / 1000, TURN_LIMIT_MS), ("Move Target", moved / 1000, TURN_LIMIT_MS),
+                                ("scoring", score / 1000, TURN_LIMIT_MS)):
+            if ms > limit:
+                failures.append(f"{grid_size}x{grid_size}, {spot_count} spots: {name} took {ms:.2f} ms,"
+                                f" over the {limit} ms limit")
+    for failure in failures:
+        print(failure)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Compiled core: the computer's decisions with core.py interpreted and compiled.
+
+Run from the repository root, after ``python build_core.py``:
+
+    python benchmarks/bench_core.py
+
+The interpreted core is loaded straight from core.py and the compiled one
+with ``import core``, then each is put in place in turn. First every core
+function is timed on its own on a seeded board with blocks down. Then the
+same seeded games against the normal and hard computer, with no time
+limit and the pure Python pathfinder, are played with each: both must
+play exactly the same games, and the CPU time of the computer's decisions
+is compared. Without a build only the interpreted numbers are printed.
+"""
+import importlib.util
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import core  # noqa: E402
+import pathfinding  # noqa: E402
+import policies  # noqa: E402
+import rules  # noqa: E402
+from rules import GameState, RoundState  # noqa: E402
+
+SIZES = [10, 20]
+GAMES = 5
+MAX_TURNS = 200
+DIFFICULTIES = ["normal", "hard"]
+CALL_BOARD_SIZE = 30
+CALL_BLOCKS = 40
+CALL_REPEATS = 200
+
+
+def interpreted_core():
+    spec = importlib.util.spec_from_file_location("core", os.path.join(ROOT, "core.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def use(module):
+    for user in (pathfinding, policies, rules):
+        user.core = module
+
+
+def call_board(rng):
+    r = RoundState(grid_size=CALL_BOARD_SIZE, rng=rng, pathfinding_backend="python")
+    r.reset_round()
+    while len(r.blocks) < CALL_BLOCKS:
+        x, y = rng.randrange(r.grid_size), rng.randrange(r.grid_size)
+        orientation = rng.choice(policies.ORIENTATIONS)
+        if r.can_place_block(x, y, orientation):
+            r.blocks.append((x, y, orientation))
+    return r
+
+
+def time_calls(module, r, queries):
+    """Microseconds per call of each core function"""
+    n = r.grid_size
+    blocked = module.blocked_grid(n, r.blocks)
+    starts = [x * n + y for (x, y), _ in queries]
+    goals = [x * n + y for _, (x, y) in queries]
+    calls = {
+        "grid_distance": lambda: [module.grid_distance(n, blocked, s, g) for s, g in zip(starts, goals)],
+        "grid_path": lambda: [module.grid_path(n, blocked, s, g) for s, g in zip(starts, goals)],
+        "cell_blocked": lambda: [module.cell_blocked(r.blocks, x, y) for (x, y), _ in queries],
+        "placement_clear": lambda: [module.placement_clear(n, r.blocks, x, y, "vertical", r.seeker1_pos,
+                                                           r.seeker2_pos, r.hiding_spots, r.gift_box_location)
+                                    for (x, y), _ in queries],
+        "block_score": lambda: [module.block_score(5, 7, 9, 8, x, y, r.hidden_pos, True) for (x, y), _ in queries],
+    }
+    results = {}
+    for name, call in calls.items():
+        start = time.process_time()
+        for _ in range(CALL_REPEATS):
+            call()
+        results[name] = (time.process_time() - start) / (CALL_REPEATS * len(queries)) * 1e6
+    return results
+
+
+def player_move(r, rng):
+    path = r.a_star_path(r.seeker1_pos, r.hidden_pos)
+    moves = r.legal_moves(1)
+    if len(path) > 1 and rng.random() < 0.7:
+        for direction, cell in moves:
+            if cell == tuple(path[1]):
+                r.take_action(1, ("move", direction))
+                return
+    r.take_action(1, ("move", rng.choice(moves)[0]))
+
+
+def play(size, difficulty):
+    """(CPU seconds in the computer's decisions, decisions, every position of every game)"""
+    seconds = decisions = 0
+    transcript = []
+    for game in range(GAMES):
+        rng = random.Random(game)
+        r = RoundState(grid_size=size, rng=rng, pathfinding_backend="python")
+        r.game_mode = "pvc"
+        r.computer_difficulty = difficulty
+        r.policy(difficulty).budget = None
+        r.reset_round()
+        for _ in range(MAX_TURNS):
+            if r.state == GameState.GAME_OVER:
+                break
+            if r.skip_frozen_turn():
+                continue
+            if r.state == GameState.PLAYER1_TURN:
+                player_move(r, rng)
+            else:
+                r.computer_move()
+            transcript.append((r.seeker1_pos, r.seeker2_pos, tuple(r.blocks), r.hidden_pos))
+        transcript.append(r.winner)
+        stats = r.policy_stats[difficulty]
+        seconds += stats.seconds
+        decisions += stats.decisions
+    return seconds, decisions, transcript
+
+
+def main():
+    builds = [("interpreted", interpreted_core())]
+    if core.compiled():
+        builds.append(("compiled", core))
+    else:
+        print("No compiled core, run `python build_core.py` to compare against one\n")
+
+    r = call_board(random.Random(0))
+    rng = random.Random(1)
+    free = [(x, y) for x in range(r.grid_size) for y in range(r.grid_size) if not r.is_position_blocked((x, y))]
+    queries = [(rng.choice(free), rng.choice(free)) for _ in range(50)]
+    calls = {}
+    for name, module in builds:
+        use(module)
+        calls[name] = time_calls(module, r, queries)
+    print(f"Per call on a {CALL_BOARD_SIZE}x{CALL_BOARD_SIZE} board with {CALL_BLOCKS} blocks:")
+    for function in calls["interpreted"]:
+        line = f"  {function:<16}" + "".join(f" {name} {calls[name][function]:8.2f} us" for name, _ in builds)
+        if len(builds) > 1:
+            line += f", {calls['interpreted'][function] / calls['compiled'][function]:5.1f}x"
+        print(line)
+
+    print(f"\nComputer decisions, {GAMES} seeded games per line, no time limit:")
+    for size in SIZES:
+        for difficulty in DIFFICULTIES:
+            played = {}
+            for name, module in builds:
+                use(module)
+                played[name] = play(size, difficulty)
+            seconds, decisions, transcript = played["interpreted"]
+            line = f"  {size:>3}x{size:<3} {difficulty:<7} {decisions:5} decisions, interpreted {seconds / decisions * 1000:7.2f} ms"
+            if len(builds) > 1:
+                compiled_seconds, _, compiled_transcript = played["compiled"]
+                assert compiled_transcript == transcript, "the compiled core played different games"
+                line += f", compiled {compiled_seconds / decisions * 1000:7.2f} ms, {seconds / compiled_seconds:4.1f}x"
+            print(line)
+    use(core)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Steps per second of the single-board and batched training environments.
+
+Run from the repository root:
+
+    python benchmarks/bench_env.py
+
+Both environments are driven by a random policy that mostly moves and now
+and then tries a block or Move Target, so every rule gets exercised.
+A batched step is a fixed number of NumPy calls, so small batches are
+bound by their fixed cost and steps per second grow with the batch. The
+time per ``step`` call shows the batch needed to reach a given throughput.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hide_seek_env import HideSeekEnv, VectorHideSeekEnv  # noqa: E402
+
+SINGLE_STEPS = 20_000
+VECTOR_STEPS = 400
+BATCH_SIZES = [64, 256, 1024, 4096]
+
+
+def random_actions(rng, count, action_count):
+    moves = rng.integers(0, 4, count)
+    other = rng.integers(4, action_count, count)
+    return np.where(rng.random(count) < 0.95, moves, other)
+
+
+def bench_single(rng):
+    env = HideSeekEnv(seed=0)
+    env.reset()
+    actions = random_actions(rng, SINGLE_STEPS, env.action_count)
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset()
+    return SINGLE_STEPS / (time.perf_counter() - start)
+
+
+def bench_vector(rng, num_envs):
+    env = VectorHideSeekEnv(num_envs, seed=0)
+    env.reset()
+    actions = [random_actions(rng, num_envs, env.action_count) for _ in range(VECTOR_STEPS)]
+    start = time.perf_counter()
+    for batch in actions:
+        env.step(batch)
+    elapsed = time.perf_counter() - start
+    return VECTOR_STEPS * num_envs / elapsed, elapsed / VECTOR_STEPS * 1000
+
+
+def main():
+    rng = np.random.default_rng(1)
+    print(f"{'environment':>22} {'steps/s':>12} {'ms per call':>12}")
+    single = bench_single(rng)
+    print(f"{'HideSeekEnv':>22} {single:>12,.0f} {1000 / single:>12.3f}")
+    for num_envs in BATCH_SIZES:
+        rate, ms = bench_vector(rng, num_envs)
+        print(f"{f'VectorHideSeekEnv x{num_envs}':>22} {rate:>12,.0f} {ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
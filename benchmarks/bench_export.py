@@ -0,0 +1,83 @@
+"""Offscreen frame export speed against copying or PNG-encoding each frame.
+
+Run from the repository root:
+
+    python benchmarks/bench_export.py
+
+A short computer game is recorded and exported with ``clip_export`` to a
+temporary raw video file, once drawing every frame and once holding each
+turn's frame. The per-frame cost of handing the surface's own buffer to
+the file is compared with copying the pixels to bytes first and with
+encoding a PNG, which is what a screenshot-per-frame capture does.
+"""
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # the game loads its images by relative path
+
+import clip_export  # noqa: E402
+import replay  # noqa: E402
+from rules import DIRECTIONS, GameState, RoundState  # noqa: E402
+
+TURNS = 60
+WRITES = 200
+PNGS = 10
+
+
+def record(path):
+    rng = random.Random(2)
+    r = RoundState(clip_export.ui.GRID_SIZE, rng=rng)
+    r.game_mode = "pvc"
+    r.reset_round()
+    with replay.ReplayWriter(path, r.grid_size) as writer:
+        while writer.frames < TURNS:
+            if r.state == GameState.GAME_OVER:
+                r.reset_round()
+            elif r.skip_frozen_turn():
+                pass
+            elif r.state == GameState.PLAYER1_TURN:
+                for direction in rng.sample(list(DIRECTIONS), len(DIRECTIONS)):
+                    if r.take_action(1, ("move", direction)):
+                        break
+            else:
+                r.computer_move()
+            writer.record(r)
+
+
+def per_frame(write, count, out):
+    start = time.perf_counter()
+    for _ in range(count):
+        write(out)
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    screen = clip_export.ui.init_display()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "game.hsr")
+        record(path)
+        with replay.ReplayFile(path) as recorded:
+            for hold in (False, True):
+                with open(os.path.join(tmp, "frames.raw"), "wb") as out:
+                    start = time.perf_counter()
+                    frames = clip_export.export_replay(recorded, out, hold=hold)
+                    elapsed = time.perf_counter() - start
+                label = "holding each turn" if hold else "drawing every frame"
+                print(f"export {label}: {frames} frames in {elapsed:.1f} s,"
+                      f" {frames / clip_export.VIDEO_FPS / elapsed:.1f}x real time")
+        with open(os.path.join(tmp, "frames.raw"), "wb") as out:
+            view = per_frame(lambda f: f.write(screen.get_view("0")), WRITES, out)
+            copy = per_frame(lambda f: f.write(clip_export.ui.pygame.image.tobytes(screen, "RGBX")), WRITES, out)
+            png = per_frame(lambda f: clip_export.ui.pygame.image.save(screen, io.BytesIO(), "frame.png"), PNGS, out)
+    print(f"per frame: buffer view {view * 1000:.2f} ms, copy to bytes {copy * 1000:.2f} ms,"
+          f" PNG encode {png * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
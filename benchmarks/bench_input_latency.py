@@ -0,0 +1,175 @@
+"""Input to display latency: how long a key press takes to show on screen.
+
+Run from the repository root:
+
+    python benchmarks/bench_input_latency.py
+
+The real ``run`` loop is driven with synthetic input under the SDL dummy
+driver. A click on "Player vs Player" is posted to the title screen, then
+arrow and WASD presses for whichever seeker's turn it is, each posted from
+a timer thread at a random point in the frame, as a player's would arrive.
+After every frame is drawn the game is checked: the first frame that shows
+the seeker off its cell gives the latency to the first visible movement,
+and the frame where it comes to rest on the new cell gives the latency to
+arrival, which includes the slide animation. The next press waits for both
+seekers to be at rest, and finished rounds are restarted with a posted
+click on "Next Round".
+
+Percentiles are listed for board sizes and for the ways the board can be
+drawn: sprites at the default cell size, sprites zoomed out, and the one
+pixel per cell board image zoomed out (when NumPy is installed).
+"""
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # the game loads its images by relative path
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+import board_image  # noqa: E402
+import hide_seek_game as ui  # noqa: E402
+from rules import DIRECTIONS, GameState  # noqa: E402
+
+SIZES = [10, 100, 1000]
+PRESSES = 60
+DROP_AFTER = 2.0  # seconds, a press the game ignored (a frozen turn skipped meanwhile) is given up on
+ZOOMED_OUT_CELL_SIZE = 8
+# name -> (cell size, None for the default, and whether the board image may be used)
+RENDERERS = {"sprites": (None, False), "sprites, zoomed out": (ZOOMED_OUT_CELL_SIZE, False)}
+if board_image.available():
+    RENDERERS["board image, zoomed out"] = (ZOOMED_OUT_CELL_SIZE, True)
+KEYS = {1: {direction: key for key, direction in ui.PLAYER1_KEYS.items()},
+        2: {direction: key for key, direction in ui.PLAYER2_KEYS.items()}}
+
+
+class Finished(Exception):
+    pass
+
+
+class ScriptedGame(ui.HideSeekGame):
+    """The game with a look at every frame once it is drawn"""
+
+    def __init__(self, harness, **kwargs):
+        super().__init__(**kwargs)
+        self.harness = harness
+
+    def draw_ui(self):
+        super().draw_ui()
+        self.harness.frame_drawn(self)
+
+
+class Harness:
+    def __init__(self, cell_size, presses, rng):
+        self.cell_size = cell_size
+        self.presses = presses
+        self.rng = rng
+        self.first_drawn = []  # seconds from each press to the first frame showing the seeker move
+        self.arrived = []  # seconds to the frame with the seeker at rest on its new cell
+        self.frames = 0
+        self.dropped = 0
+        self.pending = None  # (player, cell before the press) while a press is being followed
+        self.moved = False
+        self.posted_at = None  # set by the timer thread just before it posts the press
+        self.timer = None
+        self.restarting = False
+
+    def press(self, key):
+        self.posted_at = time.perf_counter()
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+
+    def frame_drawn(self, game):
+        now = time.perf_counter()
+        self.frames += 1
+        if self.cell_size is not None and game.camera.cell_size != self.cell_size:
+            game.camera.cell_size = self.cell_size
+        if self.pending is not None:
+            player, before = self.pending
+            if self.posted_at is None:
+                return
+            drawn = game.seeker_screen_cell(player)
+            if drawn != before and not self.moved:
+                self.moved = True
+                self.first_drawn.append(now - self.posted_at)
+            if drawn == game.seeker_pos(player) != before:
+                self.arrived.append(now - self.posted_at)
+                self.pending = None
+                if len(self.arrived) >= self.presses:
+                    raise Finished
+            elif not self.moved and now - self.posted_at > DROP_AFTER:
+                self.dropped += 1
+                self.pending = None
+            return
+        if game.state == GameState.GAME_OVER:
+            if not self.restarting and game.next_round_button is not None:
+                self.restarting = True
+                pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=game.next_round_button.center,
+                                                     button=1))
+            return
+        self.restarting = False
+        if game.state not in (GameState.PLAYER1_TURN, GameState.PLAYER2_TURN):
+            return
+        if any(game.seeker_screen_cell(p) != game.seeker_pos(p) for p in (1, 2)):
+            return  # still sliding from the last move
+        player = 1 if game.state == GameState.PLAYER1_TURN else 2
+        cell = game.seeker_pos(player)
+        moves = [direction for direction, (dx, dy) in DIRECTIONS.items()
+                 if 0 <= cell[0] + dx < game.grid_size and 0 <= cell[1] + dy < game.grid_size
+                 and not game.is_position_blocked((cell[0] + dx, cell[1] + dy))]
+        if not moves:
+            return
+        self.pending = (player, cell)
+        self.moved = False
+        self.posted_at = None
+        self.timer = threading.Timer(self.rng.uniform(0, 1 / ui.FPS), self.press,
+                                     (KEYS[player][self.rng.choice(moves)],))
+        self.timer.start()
+
+
+def measure(size, cell_size, use_board_image, seed=1):
+    rng = random.Random(seed)
+    harness = Harness(cell_size, PRESSES, rng)
+    game = ScriptedGame(harness, grid_size=size)
+    game.rng = random.Random(seed)
+    if not use_board_image:
+        game.board_image = None
+    title_button = (ui.WINDOW_WIDTH // 2, ui.WINDOW_HEIGHT - 125)  # "Player vs Player"
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=title_button, button=1))
+    start = time.perf_counter()
+    try:
+        game.run()
+    except Finished:
+        pass
+    finally:
+        if harness.timer is not None:
+            harness.timer.cancel()
+    fps = harness.frames / (time.perf_counter() - start)
+    return harness.first_drawn, harness.arrived, harness.dropped, fps
+
+
+def percentile(values, p):
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1] * 1000
+
+
+def main():
+    print(f"{PRESSES} presses per line, {ui.FPS} fps cap, {ui.SIMULATION_STEP_MS} ms simulation steps,"
+          f" {ui.SEEKER_SLIDE_MS} ms slides")
+    for size in SIZES:
+        for name, (cell_size, use_board_image) in RENDERERS.items():
+            first, arrived, dropped, fps = measure(size, cell_size, use_board_image)
+            print(f"{size:>4}x{size:<4} {name:<24} first drawn p50 {percentile(first, 50):5.1f}"
+                  f" p90 {percentile(first, 90):5.1f} p99 {percentile(first, 99):5.1f}"
+                  f" max {max(first) * 1000:5.1f} ms, arrived p50 {percentile(arrived, 50):5.1f}"
+                  f" p99 {percentile(arrived, 99):5.1f} ms, {fps:.0f} fps"
+                  + (f", {dropped} presses ignored" if dropped else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare the old rejection loop with the rejection-free layout generator.
+
+Run from the repository root:
+
+    python benchmarks/bench_layouts.py
+
+The old loop drew random cells until it found one that was not already a
+spot, checking membership in a list. Dense boards make it retry more and
+more. The last line measures bulk export throughput to a layout file.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import layouts  # noqa: E402
+
+CASES = [(10, 12), (30, 100), (30, 600), (60, 3000)]  # (grid size, spots)
+ROUNDS = 20
+EXPORT_COUNT = 1_000_000
+
+
+def rejection_layout(grid_size, spot_count, rng):
+    """The generator the game used before, kept here as the baseline"""
+    spots = []
+    excluded = [(0, 0), (grid_size - 1, grid_size - 1)]
+    for _ in range(spot_count):
+        while True:
+            pos = (rng.randint(0, grid_size - 1), rng.randint(0, grid_size - 1))
+            if pos not in spots and pos not in excluded:
+                spots.append(pos)
+                break
+    while True:
+        pos = (rng.randint(0, grid_size - 1), rng.randint(0, grid_size - 1))
+        if pos not in excluded + spots:
+            return spots, pos
+
+
+def time_per_layout(fn):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main():
+    rng = random.Random(99)
+    print(f"{'grid':>6} {'spots':>6} {'rejection ms':>13} {'sampling ms':>12}")
+    for grid_size, spots in CASES:
+        old = time_per_layout(lambda: rejection_layout(grid_size, spots, rng))
+        new = time_per_layout(lambda: layouts.generate_layout(grid_size, rng, (), spots, spots))
+        print(f"{grid_size:>6} {spots:>6} {old:>13.3f} {new:>12.3f}")
+
+    path = os.path.join(tempfile.gettempdir(), "bench_layouts.bin")
+    start = time.perf_counter()
+    layouts.export_layouts(path, 10, EXPORT_COUNT, seed=1)
+    elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    with layouts.LayoutFile(path) as board_file:
+        for i in range(0, len(board_file), 10):
+            board_file[i]
+    read = time.perf_counter() - start
+    size_mb = os.path.getsize(path) / 1e6
+    print(f"Exported {EXPORT_COUNT:,} 10x10 layouts in {elapsed:.2f}s ({size_mb:.1f} MB), "
+          f"random reads {len(range(0, EXPORT_COUNT, 10)) / read:,.0f} layouts/s")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Latency and throughput of the networked PvP protocol over loopback.
+
+Run from the repository root:
+
+    python benchmarks/bench_netplay.py
+
+Two headless clients play random legal turns against a local server. Each
+turn is timed from sending the action to seeing its delta come back, and
+both clients' replayed states are compared with the server's after every
+turn. Then many matches run at once on one event loop to measure total
+throughput. The wire size of a turn is compared with a JSON snapshot of
+the full state, which is what a naive protocol would send.
+"""
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import netplay  # noqa: E402
+from rules import DIRECTIONS, GameState  # noqa: E402
+
+TURNS = 3000
+MATCHES = 32
+TURNS_PER_MATCH = 300
+PRIMARY = {netplay.ROUND, netplay.MOVED, netplay.BLOCKED, netplay.TARGET_MOVED, netplay.REJECTED}
+
+
+def snapshot(r):
+    return (r.state, r.seeker1_pos, r.seeker2_pos, r.hidden_pos, r.gift_box_location, tuple(r.blocks),
+            r.player1_frozen_turns, r.player2_frozen_turns, r.player1_blocks_remaining,
+            r.player2_blocks_remaining, r.player1_moved_target, r.player2_moved_target, r.winner)
+
+
+def full_state_json(r):
+    return json.dumps({
+        "state": r.state.name, "seekers": [r.seeker1_pos, r.seeker2_pos], "hidden": r.hidden_pos,
+        "spots": r.hiding_spots, "gift": r.gift_box_location, "blocks": r.blocks,
+        "frozen": [r.player1_frozen_turns, r.player2_frozen_turns],
+        "blocks_left": [r.player1_blocks_remaining, r.player2_blocks_remaining],
+        "moved_target": [r.player1_moved_target, r.player2_moved_target], "winner": r.winner,
+    }).encode()
+
+
+def send_random_action(client, rng):
+    s = client.state
+    if s.state == GameState.GAME_OVER:
+        client.send_next_round()
+        return
+    moved_target = s.player1_moved_target if client.player == 1 else s.player2_moved_target
+    blocks_left = s.player1_blocks_remaining if client.player == 1 else s.player2_blocks_remaining
+    if not moved_target and rng.random() < 0.03:
+        client.send_move_target()
+        return
+    if blocks_left and rng.random() < 0.05:
+        for _ in range(20):
+            x, y = rng.randrange(s.grid_size), rng.randrange(s.grid_size)
+            orientation = rng.choice(netplay.ORIENTATIONS)
+            if s.can_place_block(x, y, orientation):
+                client.send_block(x, y, orientation)
+                return
+    x, y = s.seeker_pos(client.player)
+    legal = [name for name, (dx, dy) in DIRECTIONS.items()
+             if 0 <= x + dx < s.grid_size and 0 <= y + dy < s.grid_size and not s.is_position_blocked((x + dx, y + dy))]
+    client.send_move(rng.choice(legal))
+
+
+async def play_match(turns, seed, check):
+    rng = random.Random(seed)
+    server = netplay.GameServer(rng=random.Random(seed))
+    port = await server.start()
+    clients = [netplay.GameClient(), netplay.GameClient()]
+    queues = [asyncio.Queue(), asyncio.Queue()]
+
+    async def receive_forever(client, queue):
+        while True:
+            opcode, _ = await client.receive()
+            if opcode in PRIMARY:
+                queue.put_nowait(opcode)
+
+    for client in clients:
+        await client.connect("127.0.0.1", port)
+    tasks = [asyncio.ensure_future(receive_forever(c, q)) for c, q in zip(clients, queues)]
+    for queue in queues:
+        await queue.get()  # first ROUND
+    latencies = []
+    for _ in range(turns):
+        if server.round.state == GameState.GAME_OVER:
+            acting = 0
+        else:
+            acting = next(i for i, c in enumerate(clients) if c.my_turn())
+        send_random_action(clients[acting], rng)
+        start = time.perf_counter()
+        await clients[acting].drain()
+        opcode = await queues[acting].get()
+        latencies.append(time.perf_counter() - start)
+        if opcode != netplay.REJECTED:
+            await queues[1 - acting].get()
+        if check:
+            # Trailing deltas of the same turn arrive in the same packet
+            await asyncio.sleep(0)
+            expected = snapshot(server.round)
+            for client in clients:
+                assert snapshot(client.state) == expected, "client out of sync"
+    rejections = sum(c.rejections for c in clients)
+    json_bytes = len(full_state_json(server.round))
+    for task in tasks:
+        task.cancel()
+    for client in clients:
+        client.close()
+    await server.close()
+    return latencies, server.bytes_sent, rejections, json_bytes
+
+
+async def main():
+    latencies, sent, rejections, json_bytes = await play_match(TURNS, 1, check=True)
+    per_turn = sent / TURNS / 2
+    print(f"{TURNS} turns over loopback, clients in sync after every turn, {rejections} rejected actions")
+    print(f"round trip: median {statistics.median(latencies) * 1e6:.0f} us, "
+          f"p99 {sorted(latencies)[int(len(latencies) * 0.99)] * 1e6:.0f} us")
+    print(f"wire size: {per_turn:.1f} bytes per turn per client, a JSON snapshot is {json_bytes} bytes")
+    start = time.perf_counter()
+    await asyncio.gather(*(play_match(TURNS_PER_MATCH, seed, check=False) for seed in range(MATCHES)))
+    elapsed = time.perf_counter() - start
+    print(f"{MATCHES} concurrent matches: {MATCHES * TURNS_PER_MATCH / elapsed:,.0f} turns/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
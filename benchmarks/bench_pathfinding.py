@@ -0,0 +1,115 @@
+"""Compare pathfinding backends across board sizes.
+
+Run from the repository root:
+
+    python benchmarks/bench_pathfinding.py
+
+Each board gets random blocks on roughly 10% of its cells and a batch of
+corner-to-corner and random queries, the same shape as the AI's queries.
+The first size where NumPy wins is the crossover used by ``"auto"``.
+HPA* is faster still but only near-optimal (the share of its answers that
+are exact is listed), so ``"auto"`` keeps exact distances as long as the
+fastest exact backend answers within a 60 fps frame, and switches to HPA*
+from the first size where it no longer does. A second table shows what a large HPA* board costs: the
+constructor, the first long query (which builds the clusters it crosses),
+the same query again after ``place_block`` and how much of the board it
+touched.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pathfinding  # noqa: E402
+
+SIZES = [10, 20, 30, 40, 50, 60, 70, 80, 100, 150, 200, 300]
+QUERIES = 40
+FRAME_MS = 1000 / 60
+
+
+def random_blocks(rng, size):
+    blocks = []
+    for _ in range(size * size // 20):
+        orientation = rng.choice(["horizontal", "vertical"])
+        blocks.append((rng.randrange(size - 1), rng.randrange(size - 1), orientation))
+    return blocks
+
+
+def make_queries(rng, size, blocks):
+    blocked = pathfinding.blocked_cells(blocks)
+    free = [(x, y) for x in range(size) for y in range(size) if (x, y) not in blocked]
+    queries = [((0, 0), (size - 1, size - 1))] * (QUERIES // 2)
+    while len(queries) < QUERIES:
+        queries.append((rng.choice(free), rng.choice(free)))
+    return queries
+
+
+def time_backend(name, size, blocks, queries):
+    """(ms per query, answers)"""
+    finder = pathfinding.make_pathfinder(name, size)
+    finder.distance((0, 0), (0, 0), blocks)  # warm the occupancy cache
+    start = time.perf_counter()
+    answers = [finder.distance(a, b, blocks) for a, b in queries]
+    return (time.perf_counter() - start) / len(queries) * 1000, answers
+
+
+def main():
+    rng = random.Random(1234)
+    backends = pathfinding.available_backends()
+    exact = [name for name in backends if name != "hpa"]
+    print(f"{'size':>6} " + " ".join(f"{name + ' ms':>12}" for name in backends) + f" {'hpa exact':>10}")
+    crossover = None
+    hpa_from = None
+    for size in SIZES:
+        blocks = random_blocks(rng, size)
+        queries = make_queries(rng, size, blocks)
+        # The heap search is left out where it takes too long to be a candidate
+        timed = [name for name in backends if name != "python" or size <= 150]
+        results = {name: time_backend(name, size, blocks, queries) for name in timed}
+        timings = {name: ms for name, (ms, _) in results.items()}
+        reference = results[timed[0]][1]
+        hpa_exact = sum(a == b for a, b in zip(results["hpa"][1], reference)) / len(queries)
+        print(f"{size:>6} " + " ".join(f"{timings[name]:>12.3f}" if name in timings else f"{'-':>12}"
+                                      for name in backends) + f" {hpa_exact:>10.0%}")
+        if crossover is None and "numpy" in timings and timings["numpy"] < timings["python"]:
+            crossover = size
+        if min(timings[name] for name in exact if name in timings) > FRAME_MS:
+            hpa_from = hpa_from or size
+        else:
+            hpa_from = None
+    if "numpy" not in backends:
+        print("NumPy is not installed, only the Python backend was measured")
+    elif crossover is None:
+        print("NumPy never beat the Python backend on these sizes")
+    else:
+        print(f"Crossover: NumPy is faster from {crossover}x{crossover} "
+              f"(auto threshold is {pathfinding.NUMPY_CROSSOVER_GRID_SIZE})")
+    if hpa_from is not None:
+        print(f"Exact queries take longer than a frame from {hpa_from}x{hpa_from} "
+              f"(HPA_GRID_SIZE is {pathfinding.HPA_GRID_SIZE}, where --pathfinding hpa is worth it)")
+
+    print()
+    print(f"{'size':>6} {'build ms':>10} {'first ms':>10} {'update ms':>10} {'touched':>8} {'of cells':>9}")
+    for size in [100, 200, 500, 1000]:
+        blocks = random_blocks(rng, size)
+        start = time.perf_counter()
+        finder = pathfinding.HierarchicalPathfinder(size)
+        finder.sync(blocks)
+        build_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        finder.distance((0, 0), (size - 1, size - 1), blocks)
+        first_ms = (time.perf_counter() - start) * 1000
+        # One extra block, as when a player places one mid-round, then the same query
+        blocks.append((size // 2, size // 2, "horizontal"))
+        start = time.perf_counter()
+        finder.distance((0, 0), (size - 1, size - 1), blocks)
+        update_ms = (time.perf_counter() - start) * 1000
+        touched = finder.cells_touched
+        print(f"{size:>6} {build_ms:>10.1f} {first_ms:>10.1f} {update_ms:>10.2f} {touched:>8}"
+              f" {touched / (size * size):>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Block preview cost: placement masks against checking every mouse event.
+
+Run from the repository root:
+
+    python benchmarks/bench_placement.py
+
+Rounds with a few blocks already down are set up on boards of several
+sizes. A burst of mouse motion events, as a fast mouse delivers in one
+frame, is answered the old way (``can_place_block`` for every event) and
+the new way (the latest event only, read from the placement mask, which
+starts empty and asks about connectivity as the mouse reaches new cells).
+Mask answers are checked against ``can_place_block`` for every anchor first.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rules import RoundState  # noqa: E402
+
+SIZES = [10, 30, 100]
+BLOCKS = {10: 4, 30: 20, 100: 150}
+EVENTS_PER_FRAME = 40
+FRAMES = 200
+ORIENTATIONS = ["horizontal", "vertical"]
+
+
+def setup(size, seed):
+    rng = random.Random(seed)
+    r = RoundState(size, rng=rng)
+    r.game_mode = "pvp"
+    r.reset_round()
+    r.player1_blocks_remaining = BLOCKS[size]
+    while r.player1_blocks_remaining:
+        r.place_block(rng.randrange(size), rng.randrange(size), rng.choice(ORIENTATIONS), 1)
+    return r
+
+
+def check(r):
+    for orientation in ORIENTATIONS:
+        for x in range(r.grid_size):
+            for y in range(r.grid_size):
+                assert r.legal_placement(x, y, orientation) == r.can_place_block(x, y, orientation), (x, y)
+
+
+def frame_times(r, answer, coalesce):
+    rng = random.Random(1)
+    times = []
+    for _ in range(FRAMES):
+        # A mouse sweeping over neighbouring cells
+        x, y = rng.randrange(r.grid_size), rng.randrange(r.grid_size)
+        events = [(min(r.grid_size - 1, x + i // 8), y) for i in range(EVENTS_PER_FRAME)]
+        start = time.perf_counter()
+        for cell in events[-1:] if coalesce else events:
+            answer(*cell, "horizontal")
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e6
+
+
+def main():
+    for size in SIZES:
+        r = setup(size, size)
+        check(r)
+        r._placement_masks.clear()
+        start = time.perf_counter()
+        for orientation in ORIENTATIONS:
+            r.placement_mask(orientation)
+        build = time.perf_counter() - start
+        per_event = frame_times(r, r.can_place_block, coalesce=False)
+        r._placement_masks.clear()  # connectivity answers are filled in as the mouse reaches new cells
+        masked = frame_times(r, r.legal_placement, coalesce=True)
+        print(f"{size:>3}x{size:<3} board, {len(r.blocks):>3} blocks: {EVENTS_PER_FRAME} motion events per frame"
+              f" {per_event:8.1f} us checked each, {masked:5.1f} us coalesced from the mask"
+              f" (masks built in {build * 1000:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Computer policies: decision time per policy, with and without budgets.
+
+Run from the repository root:
+
+    python benchmarks/bench_policies.py
+
+The same seeded games against a scripted player (who walks towards Jerry
+and now and then takes a random step) are played with each difficulty on
+boards of growing size, once with no time limit and once with the default
+per-decision budget. The slowest decision, the share of turns handed to the
+fallback policy and the player's win rate show what the budget costs in
+thinking time and in strength. A third-party policy that keeps searching
+long after its budget is also played: it should never hold a turn up for
+much longer than the budget.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import belief  # noqa: E402
+import policies  # noqa: E402
+from rules import GameState, RoundState  # noqa: E402
+
+SIZES = [10, 30]
+GAMES = 10
+MAX_TURNS = 300
+DIFFICULTIES = ["normal", "hard", "fair"] if belief.available() else ["normal", "hard"]
+
+
+class Dawdler(policies.Policy):
+    """Thinks for half a second per move, yielding as it goes, then steps at random"""
+
+    fallback = "random"
+
+    def decide(self, view):
+        end = time.process_time() + 0.5
+        while time.process_time() < end:
+            yield
+        moves = view.legal_moves(2)
+        return ("move", view.rng.choice(moves)[0]) if moves else None
+
+
+policies.register("dawdler", Dawdler)
+
+
+def player_move(r, rng):
+    path = r.a_star_path(r.seeker1_pos, r.hidden_pos)
+    moves = r.legal_moves(1)
+    if len(path) > 1 and rng.random() < 0.7:
+        for direction, cell in moves:
+            if cell == tuple(path[1]):
+                r.take_action(1, ("move", direction))
+                return
+    r.take_action(1, ("move", rng.choice(moves)[0]))
+
+
+def play(size, difficulty, budget):
+    stats = policies.LatencyHistogram()
+    fallbacks = turns = player_wins = 0
+    for game in range(GAMES):
+        rng = random.Random(game)
+        r = RoundState(grid_size=size, rng=rng)
+        r.game_mode = "pvc"
+        r.computer_difficulty = difficulty
+        r.policy(difficulty).budget = budget
+        r.reset_round()
+        for _ in range(MAX_TURNS):
+            if r.state == GameState.GAME_OVER:
+                break
+            if r.skip_frozen_turn():
+                continue
+            if r.state == GameState.PLAYER1_TURN:
+                player_move(r, rng)
+            else:
+                r.computer_move()
+                turns += 1
+                fallbacks += r.ai_fallback
+        player_wins += r.winner is not None and r.winner.startswith("Tom")
+        stats.merge(r.policy_stats[difficulty])
+    return stats, fallbacks / max(turns, 1), player_wins / GAMES
+
+
+def main():
+    for size in SIZES:
+        for difficulty in DIFFICULTIES + ["dawdler"]:
+            for budget in (None, policies.DEFAULT_BUDGET):
+                if difficulty == "dawdler" and (budget is None or size != SIZES[0]):
+                    continue
+                stats, fallbacks, player_wins = play(size, difficulty, budget)
+                limit = "no limit" if budget is None else f"{budget * 1000:.0f} ms budget"
+                print(f"{size:>3}x{size:<3} {difficulty:<8} {limit:<15} mean {stats.seconds / stats.decisions * 1000:6.2f} ms,"
+                      f" p99 <= {stats.percentile(99):>4} ms, slowest {stats.slowest * 1000:7.1f} ms,"
+                      f" {fallbacks:6.1%} of turns fell back, player won {player_wins:4.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Block search tables: replaying the same boards with and without them.
+
+Run from the repository root:
+
+    python benchmarks/bench_precompute.py
+
+A tuning run replays a set of seeded boards against the normal and hard
+computer. Player 1 walks towards Jerry, taking a random step now and then.
+The run is played without a table cache, then twice with one in an empty
+directory: the first pass builds the tables and the second, with a new
+cache object as a new process would have, finds them all on disk. Every
+pass must play exactly the same games. The time spent in computer turns is
+compared, along with the size of the table directory.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import precompute  # noqa: E402
+from rules import DIRECTIONS, GameState, RoundState  # noqa: E402
+
+BOARDS = 100
+DIFFICULTIES = ["normal", "hard"]
+MAX_TURNS = 400
+
+
+def player_move(r, rng):
+    path = r.a_star_path(r.seeker1_pos, r.hidden_pos)
+    if len(path) > 1 and rng.random() < 0.7:
+        step = (path[1][0] - r.seeker1_pos[0], path[1][1] - r.seeker1_pos[1])
+        direction = next(name for name, delta in DIRECTIONS.items() if delta == step)
+        if r.take_action(1, ("move", direction)):
+            return
+    for direction in rng.sample(list(DIRECTIONS), len(DIRECTIONS)):
+        if r.take_action(1, ("move", direction)):
+            return
+    r.end_turn()
+
+
+def play(table_cache):
+    outcomes = []
+    computer = 0.0
+    for board in range(BOARDS):
+        for difficulty in DIFFICULTIES:
+            rng = random.Random(board)
+            r = RoundState(rng=rng)
+            r.game_mode = "pvc"
+            r.computer_difficulty = difficulty
+            r.table_cache = table_cache
+            r.reset_round()
+            for _ in range(MAX_TURNS):
+                if r.state == GameState.GAME_OVER:
+                    break
+                if r.skip_frozen_turn():
+                    continue
+                if r.state == GameState.PLAYER1_TURN:
+                    player_move(r, rng)
+                else:
+                    start = time.perf_counter()
+                    r.computer_move()
+                    computer += time.perf_counter() - start
+            outcomes.append((r.winner, r.seeker1_pos, r.seeker2_pos, tuple(r.blocks)))
+    return computer, outcomes
+
+
+def main():
+    baseline, outcomes = play(None)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = precompute.TableCache(directory)
+        cold, cold_outcomes = play(cache)
+        built = cache.builds
+        cache.close()
+        cache = precompute.TableCache(directory)
+        warm, warm_outcomes = play(cache)
+        assert cache.builds == 0, "tables were built again"
+        cache.close()
+        size = sum(entry.stat().st_size for entry in os.scandir(directory))
+    assert outcomes == cold_outcomes == warm_outcomes, "the tables changed the games"
+    games = len(outcomes)
+    print(f"{games} games on {BOARDS} boards, time in computer turns:")
+    print(f"  no tables       {baseline * 1000 / games:6.2f} ms per game")
+    print(f"  building tables {cold * 1000 / games:6.2f} ms per game ({built} tables)")
+    print(f"  tables on disk  {warm * 1000 / games:6.2f} ms per game ({baseline / warm:.1f}x faster)")
+    print(f"table directory: {size / 1024 / 1024:.1f} MB, {size / built / 1024:.0f} KB per table")
+
+
+if __name__ == "__main__":
+    main()
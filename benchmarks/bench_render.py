@@ -0,0 +1,100 @@
+"""Board drawing and hit-testing cost as the board grows past the window.
+
+Run from the repository root:
+
+    python benchmarks/bench_render.py
+
+A round is started on boards of increasing size with the default cell
+size, so only a window's worth of cells is in view. ``draw_grid`` and
+``cell_at`` are timed with the camera following the seeker. With culling
+both stay flat, while drawing every cell would grow with the board's area.
+
+The largest board is then zoomed out until cells are a few pixels wide,
+and drawing it through the one-pixel-per-cell board image is compared with
+drawing rects and sprites per cell, along with the side panel minimap. A
+seeker moves every frame, so the image is updated and scaled again each
+time rather than served from its cache.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # the game loads its images by relative path
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import hide_seek_game as ui  # noqa: E402
+
+SIZES = [10, 100, 1000]
+FRAMES = 100
+CLICKS = 10000
+ZOOMED_OUT_CELL_SIZES = [8, 4, 2]
+
+
+def median_ms(draw, frames=FRAMES):
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        draw()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    for size in SIZES:
+        game = ui.HideSeekGame(grid_size=size)
+        game.rng = random.Random(3)
+        game.game_mode = "pvp"
+        game.start_game()
+        draw = median_ms(game.draw_grid)
+        rng = random.Random(1)
+        view = game.camera.viewport
+        points = [(rng.randrange(view.left, view.right), rng.randrange(view.top, view.bottom))
+                  for _ in range(CLICKS)]
+        start = time.perf_counter()
+        for pos in points:
+            game.cell_at(pos)
+        click = (time.perf_counter() - start) / CLICKS
+        first_row, end_row, first_col, end_col = game.camera.visible_range()
+        print(f"{size:>4}x{size:<4} board, {(end_row - first_row) * (end_col - first_col):>3} cells in view:"
+              f" draw_grid median {draw:.2f} ms, cell_at {click * 1e6:.2f} us")
+
+    board_image = game.board_image
+    rng = random.Random(4)
+    for _ in range(2000):
+        x, y = rng.randrange(size), rng.randrange(size)
+        game.blocks.append((x, y, rng.choice(["horizontal", "vertical"])))
+    game.blocks_epoch = game.path_service.new_epoch()
+    game.state = ui.GameState.GAME_OVER  # keep the camera still while the seeker moves
+
+    def moving(draw):
+        def frame():
+            x, y = game.seeker1_pos
+            game.seeker1_pos = (x, (y + 1) % size)
+            draw()
+        return frame
+
+    for cell_size in ZOOMED_OUT_CELL_SIZES:
+        game.camera.cell_size = cell_size
+        game.camera.follow((size // 2, size // 2))
+        game.board_image = None
+        sprites = median_ms(game.draw_grid, 5)
+        game.board_image = board_image
+        image = median_ms(moving(game.draw_grid))
+        minimap = median_ms(moving(lambda: game.draw_minimap((0, 0))))
+        print(f"{size}x{size} board at {cell_size} px per cell: sprites {sprites:.1f} ms,"
+              f" board image {image:.2f} ms, minimap {minimap:.2f} ms")
+    step = median_ms(moving(lambda: board_image.sync(game))) / 1000
+    start = time.perf_counter()
+    board_image._spots = None
+    board_image.sync(game)
+    full = time.perf_counter() - start
+    print(f"board image update: {step * 1e6:.0f} us per moved seeker, {full * 1000:.1f} ms to repaint everything")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Seek and playback speed of replay files.
+
+Run from the repository root:
+
+    python benchmarks/bench_replay.py
+
+A long two-player game on a large board is recorded once. It is then
+written again with different keyframe intervals and timed seeking to random
+turns, with a fresh reader state each time so nothing is reused between
+seeks. The largest interval only writes keyframes when a round starts, so
+a seek replays every delta since the start of the round, which is the
+baseline.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import replay  # noqa: E402
+from rules import DIRECTIONS, GameState, RoundState  # noqa: E402
+
+GRID_SIZE = 100
+TURNS = 10000
+SEEKS = 300
+INTERVALS = [16, 64, 256, 65535]
+
+
+def record_game(path):
+    rng = random.Random(5)
+    r = RoundState(GRID_SIZE, rng=rng)
+    r.game_mode = "pvp"
+    r.reset_round()
+    states = []
+    with replay.ReplayWriter(path, GRID_SIZE) as writer:
+        while writer.frames < TURNS:
+            if r.state == GameState.GAME_OVER:
+                r.reset_round()
+            elif not r.skip_frozen_turn():
+                player = 1 if r.state == GameState.PLAYER1_TURN else 2
+                if rng.random() < 0.01:
+                    x, y = rng.randrange(GRID_SIZE), rng.randrange(GRID_SIZE)
+                    r.take_action(player, ("block", x, y, rng.choice(replay.ORIENTATIONS)))
+                else:
+                    for direction in rng.sample(list(DIRECTIONS), len(DIRECTIONS)):
+                        if r.take_action(player, ("move", direction)):
+                            break
+            if writer.record(r):
+                states.append((replay.scalars(r), list(r.blocks), list(r.hiding_spots)))
+    return states
+
+
+def rewrite(states, path, interval):
+    """Write the recorded states again with another keyframe interval"""
+    r = RoundState(GRID_SIZE)
+    with replay.ReplayWriter(path, GRID_SIZE, interval) as writer:
+        for values, blocks, spots in states:
+            replay.apply_scalars(r, values)
+            r.blocks = blocks
+            r.hiding_spots = spots
+            writer.record(r)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        states = record_game(os.path.join(tmp, "game.hsr"))
+        print(f"Recorded {len(states)} turns on a {GRID_SIZE}x{GRID_SIZE} board"
+              f" in {time.perf_counter() - start:.1f} s (mostly playing the rules)")
+        rng = random.Random(1)
+        targets = [rng.randrange(len(states)) for _ in range(SEEKS)]
+        for interval in INTERVALS:
+            path = os.path.join(tmp, f"game{interval}.hsr")
+            rewrite(states, path, interval)
+            with replay.ReplayFile(path) as f:
+                times = []
+                for index in targets:
+                    f._cursor = None
+                    start = time.perf_counter()
+                    frame = f.frame(index)
+                    times.append(time.perf_counter() - start)
+                    assert frame[0] == states[index][0]
+                start = time.perf_counter()
+                for index in range(len(f)):
+                    f.frame(index)
+                playback = (time.perf_counter() - start) / len(f)
+                label = f"every {interval} turns" if interval < 65535 else "round starts only"
+                print(f"keyframes {label:>17}: {os.path.getsize(path) / len(f):5.1f} bytes/turn,"
+                      f" seek median {statistics.median(times) * 1e6:8.1f} us, playback {playback * 1e6:.1f} us/turn")
+
+
+if __name__ == "__main__":
+    main()
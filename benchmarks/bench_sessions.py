@@ -0,0 +1,164 @@
+"""Memory per session and scheduling fairness of the headless session host.
+
+Run from the repository root:
+
+    python benchmarks/bench_sessions.py
+
+First hundreds of computer rounds are played on one host and the memory
+they hold is measured with tracemalloc and with ``session_footprint``. Then
+the resident size of a windowed ``HideSeekGame`` is measured when the image
+surfaces are shared and when every game loads its own. Last, slow
+hard-difficulty computers run beside many player-vs-player matches, with
+and without time slicing, and the delay a player sees between the
+opponent's move and their own turn is timed.
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import session_host  # noqa: E402
+from rules import DIRECTIONS, GameState  # noqa: E402
+
+SESSIONS = 200
+TURNS = 10
+GAMES = 8
+FAIR_GRID = 20
+SLOW_SESSIONS = 8
+MATCHES = 64
+MATCH_TURNS = 60
+
+
+def random_move(host, session_id, player, rng):
+    for direction in rng.sample(list(DIRECTIONS), len(DIRECTIONS)):
+        if host.submit(session_id, player, ("move", direction)):
+            return
+
+
+def toward_jerry(host, session_id, rng):
+    """Tom walks at Jerry with some noise, so the computer has to block him"""
+    r = host.sessions[session_id].round
+    (x, y), (hx, hy) = r.seeker1_pos, r.hidden_pos
+    order = sorted(DIRECTIONS, key=lambda d: abs(x + DIRECTIONS[d][0] - hx) + abs(y + DIRECTIONS[d][1] - hy)
+                   + 3 * rng.random())
+    for direction in order:
+        if host.submit(session_id, 1, ("move", direction)):
+            return
+
+
+async def play_pvc(host, session_id, turns, policy=random_move):
+    rng = random.Random(session_id)
+    for _ in range(turns):
+        if await host.wait_turn(session_id, 1) == GameState.GAME_OVER:
+            host.next_round(session_id)
+            continue
+        if policy is random_move:
+            random_move(host, session_id, 1, rng)
+        else:
+            policy(host, session_id, rng)
+
+
+async def measure_memory():
+    tracemalloc.start()
+    host = session_host.SessionHost(max_sessions=SESSIONS)
+    host.start()
+    before = tracemalloc.take_snapshot()
+    sessions = [host.create_session("pvc", "hard" if i % 2 else "normal", seed=i) for i in range(SESSIONS)]
+    await asyncio.gather(*(play_pvc(host, s.id, TURNS) for s in sessions))
+    after = tracemalloc.take_snapshot()
+    await host.close()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    footprints = [host.session_footprint(s) for s in sessions]
+    cache = len(host.path_service._cache)
+    print(f"{SESSIONS} computer sessions after {TURNS} turns each, on a {host.grid_size}x{host.grid_size} board:")
+    print(f"  tracemalloc: {total / SESSIONS / 1024:.1f} KiB per session, shared path cache included"
+          f" ({cache} entries)")
+    print(f"  session_footprint: median {statistics.median(footprints) / 1024:.1f} KiB,"
+          f" max {max(footprints) / 1024:.1f} KiB")
+
+
+def resident_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure_windowed_games():
+    if not os.path.exists("/proc/self/statm"):
+        print("Resident size needs /proc, skipped")
+        return
+    os.chdir(ROOT)  # the game loads its images by relative path
+    import hide_seek_game
+    hide_seek_game.HideSeekGame()  # warm up pygame and the shared surfaces
+    hide_seek_game.load_assets()
+    for shared in (True, False):
+        games = []
+        start = resident_bytes()
+        for _ in range(GAMES):
+            if not shared:
+                hide_seek_game._assets = None
+            game = hide_seek_game.HideSeekGame()
+            games.append((game, game.assets))  # the game and the surfaces it was given
+        per_game = (resident_bytes() - start) / GAMES
+        label = "shared surfaces" if shared else "own surfaces"
+        print(f"HideSeekGame with {label}: {per_game / 1024:.0f} KiB resident per game")
+
+
+async def measure_fairness(slice_seconds):
+    host = session_host.SessionHost(FAIR_GRID, max_sessions=SLOW_SESSIONS + MATCHES, slice_seconds=slice_seconds)
+    host.start()
+    slow = [host.create_session("pvc", "hard", seed=i) for i in range(SLOW_SESSIONS)]
+    matches = [host.create_session("pvp", seed=1000 + i) for i in range(MATCHES)]
+    waits = []
+    moved_at = {}
+    turns = {}
+
+    async def player(session_id, number):
+        rng = random.Random(session_id * 2 + number)
+        while session_id in host.sessions:
+            state = await host.wait_turn(session_id, number)
+            if session_id in moved_at:
+                waits.append(time.perf_counter() - moved_at.pop(session_id))
+            if state == GameState.GAME_OVER:
+                host.next_round(session_id)
+            elif session_id in host.sessions:
+                await asyncio.sleep(0)  # think for a moment
+                random_move(host, session_id, number, rng)
+                moved_at[session_id] = time.perf_counter()
+                turns[session_id] = turns.get(session_id, 0) + 1
+                if turns[session_id] == MATCH_TURNS:
+                    host.close_session(session_id)
+
+    start = time.perf_counter()
+    computer = asyncio.gather(*(play_pvc(host, s.id, 10 ** 6, toward_jerry) for s in slow))
+    await asyncio.gather(*(player(s.id, p) for s in matches for p in (1, 2)))
+    elapsed = time.perf_counter() - start
+    computer.cancel()
+    await asyncio.gather(computer, return_exceptions=True)
+    await host.close()
+    waits.sort()
+    thinking = sum(s.ai_seconds for s in slow)
+    label = f"{slice_seconds * 1000:.0f} ms slices" if slice_seconds != float("inf") else "no slicing"
+    print(f"  {label}: player waits p50 {waits[len(waits) // 2] * 1000:.2f} ms,"
+          f" p99 {waits[int(len(waits) * 0.99)] * 1000:.2f} ms, max {waits[-1] * 1000:.1f} ms"
+          f" (computers thinking {thinking / elapsed:.0%} of {elapsed:.1f} s)")
+
+
+def main():
+    asyncio.run(measure_memory())
+    measure_windowed_games()
+    print(f"{MATCHES} player matches beside {SLOW_SESSIONS} hard computers on a {FAIR_GRID}x{FAIR_GRID} board:")
+    for slice_seconds in (session_host.SLICE_SECONDS, float("inf")):
+        asyncio.run(measure_fairness(slice_seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Fixed-step simulation: frame rate independence and headless speed.
+
+Run from the repository root:
+
+    python benchmarks/bench_simulation.py
+
+The same seeded player vs computer game is driven through ``advance``
+with frame times of a fast machine, a slow one and a stuttering one.
+Player 1 presses a key every 300 ms of game time. Every simulation step's
+state is logged, and the logs must match: slow frames may draw less often,
+but never change when the computer moves. The game is then stepped with
+``simulation_step`` alone, as a headless run would, to see how much faster
+than real time it goes.
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # the game loads its images by relative path
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import hide_seek_game as ui  # noqa: E402
+from rules import DIRECTIONS, GameState  # noqa: E402
+
+GAME_MS = 60000
+KEY_EVERY_STEPS = 300 // ui.SIMULATION_STEP_MS
+HEADLESS_STEPS = 100000
+
+
+def new_game(seed):
+    random.seed(seed)
+    game = ui.HideSeekGame()
+    game.game_mode = "pvc"
+    game.start_game()
+    game.seeker_slides = {}
+    steps = 0
+    log = []
+    step = game.simulation_step
+
+    def scripted_step():
+        nonlocal steps
+        if game.state == GameState.GAME_OVER:
+            game.start_game()
+        if steps % KEY_EVERY_STEPS == 0 and game.state == GameState.PLAYER1_TURN:
+            for direction in random.sample(list(DIRECTIONS), len(DIRECTIONS)):
+                if game.take_action(1, ("move", direction)):
+                    break
+        step()
+        steps += 1
+        log.append((game.state, game.seeker1_pos, game.seeker2_pos, game.scores["Computer"]))
+
+    game.simulation_step = scripted_step
+    return game, log
+
+
+def play(frame_times):
+    game, log = new_game(9)
+    played = 0
+    frames = 0
+    while played < GAME_MS:
+        elapsed = next(frame_times)
+        game.render_alpha = game.advance(elapsed)
+        played += elapsed
+        frames += 1
+    return log, frames
+
+
+def every(ms):
+    while True:
+        yield ms
+
+
+def stutter():
+    rng = random.Random(4)
+    while True:
+        yield rng.choice([4, 16, 16, 16, 33, 120, 250])
+
+
+def main():
+    runs = {"60 fps": every(1000 / 60), "12 fps": every(1000 / 12), "stuttering": stutter()}
+    logs = {}
+    for label, frame_times in runs.items():
+        logs[label], frames = play(frame_times)
+        print(f"{label:>10}: {frames:5d} frames drew {len(logs[label])} simulation steps,"
+              f" computer won {logs[label][-1][3]} rounds")
+    reference = logs["60 fps"]
+    for label, log in logs.items():
+        common = min(len(log), len(reference))
+        assert log[:common] == reference[:common], f"{label} changed the game"
+    print("every frame rate played the same game, step for step")
+
+    game, log = new_game(9)
+    start = time.perf_counter()
+    for _ in range(HEADLESS_STEPS):
+        game.simulation_step()
+    elapsed = time.perf_counter() - start
+    game_seconds = HEADLESS_STEPS * ui.SIMULATION_STEP_MS / 1000
+    print(f"headless: {HEADLESS_STEPS} steps ({game_seconds:.0f} s of game time) in {elapsed:.1f} s,"
+          f" {game_seconds / elapsed:.0f}x real time")
+
+
+if __name__ == "__main__":
+    main()
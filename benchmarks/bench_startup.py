@@ -0,0 +1,92 @@
+"""Cold start: time from launching the game to its first title frame.
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py
+
+Each run is a fresh interpreter that starts the game the way
+``python hide_seek_game.py`` does and exits as soon as the first title
+frame is flipped to the screen. The time is measured by this process from
+launch, so it includes starting Python and importing pygame. Runs are
+repeated with an empty and a warm font cache, and with the game's images
+loaded before the title is shown, as they were when importing the module
+opened the window and every game loaded its images up front.
+
+Importing ``hide_seek_game`` is also timed on its own and checked not to
+open a window.
+"""
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 7
+
+FIRST_FRAME = """
+import sys
+import pygame
+flip = pygame.display.flip
+
+
+def first_flip():
+    flip()
+    sys.stdout.write("frame\\n")
+    sys.stdout.flush()
+    import os
+    os._exit(0)
+
+
+pygame.display.flip = first_flip
+import hide_seek_game
+if {eager}:
+    hide_seek_game.load_assets()
+hide_seek_game.main([])
+"""
+
+IMPORT_ONLY = """
+import time
+start = time.perf_counter()
+import hide_seek_game
+import pygame
+print(time.perf_counter() - start, pygame.display.get_init())
+"""
+
+
+def run(code, cache):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1",
+               HIDE_SEEK_CACHE=cache)
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True,
+                         check=True).stdout
+    return time.perf_counter() - start, out
+
+
+def first_frame(cache, eager=False, cold=False):
+    times = []
+    for _ in range(RUNS):
+        if cold:
+            shutil.rmtree(cache)
+            os.makedirs(cache)
+        elapsed, out = run(FIRST_FRAME.format(eager=eager), cache)
+        assert out.strip() == "frame", out
+        times.append(elapsed)
+    return statistics.median(times) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache:
+        imports = [run(IMPORT_ONLY, cache)[1].split() for _ in range(RUNS)]
+        assert all(window == "False" for _, window in imports), "importing the game opened a window"
+        print(f"import hide_seek_game: {statistics.median(float(t) for t, _ in imports) * 1000:.0f} ms,"
+              f" no window opened")
+        print(f"time to first title frame, empty font cache: {first_frame(cache, cold=True):.0f} ms")
+        print(f"time to first title frame, warm font cache: {first_frame(cache):.0f} ms")
+        print(f"time to first title frame, images loaded first: {first_frame(cache, eager=True):.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
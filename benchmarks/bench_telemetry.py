@@ -0,0 +1,90 @@
+"""Computer turn telemetry: its cost, and where the computer spends its time.
+
+Run from the repository root:
+
+    python benchmarks/bench_telemetry.py
+
+The same seeded games against the normal, hard and fair computer are
+played three times: with no telemetry sink, with records kept in memory and
+with records written to a JSON lines file. Player 1 walks towards Jerry,
+taking a random step now and then. The games must come out the same every
+time, and the overhead is the difference in total time. The records of the
+file run are read back and summarized the way ``python telemetry.py`` does.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import telemetry  # noqa: E402
+from rules import DIRECTIONS, GameState, RoundState  # noqa: E402
+
+GAMES = 300
+DIFFICULTIES = ["normal", "hard", "fair"]
+MAX_TURNS = 400
+
+
+def player_move(r, rng):
+    path = r.a_star_path(r.seeker1_pos, r.hidden_pos)
+    if len(path) > 1 and rng.random() < 0.7:
+        step = (path[1][0] - r.seeker1_pos[0], path[1][1] - r.seeker1_pos[1])
+        direction = next(name for name, delta in DIRECTIONS.items() if delta == step)
+        if r.take_action(1, ("move", direction)):
+            return
+    for direction in rng.sample(list(DIRECTIONS), len(DIRECTIONS)):
+        if r.take_action(1, ("move", direction)):
+            return
+    r.end_turn()
+
+
+def play(sink):
+    outcomes = []
+    start = time.perf_counter()
+    for game in range(GAMES):
+        rng = random.Random(game)
+        r = RoundState(rng=rng)
+        r.game_mode = "pvc"
+        r.computer_difficulty = DIFFICULTIES[game % len(DIFFICULTIES)]
+        if sink is not None:
+            r.telemetry = sink.tagged(game=game)
+        r.reset_round()
+        for _ in range(MAX_TURNS):
+            if r.state == GameState.GAME_OVER:
+                break
+            if r.skip_frozen_turn():
+                continue
+            if r.state == GameState.PLAYER1_TURN:
+                player_move(r, rng)
+            else:
+                r.computer_move()
+        outcomes.append((r.winner, r.seeker1_pos, r.seeker2_pos, len(r.blocks)))
+    return time.perf_counter() - start, outcomes
+
+
+def main():
+    play(None)  # warm up
+    baseline, outcomes = play(None)
+    memory = telemetry.MemorySink()
+    in_memory, memory_outcomes = play(memory)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ai.jsonl")
+        with telemetry.JsonlSink(path) as sink:
+            to_file, file_outcomes = play(sink)
+        records = list(telemetry.read(path))
+        size = os.path.getsize(path)
+    assert outcomes == memory_outcomes == file_outcomes, "telemetry changed the games"
+    decisions = [(record["game"], record["branch"], record["nodes"]) for record in records]
+    assert decisions == [(record["game"], record["branch"], record["nodes"]) for record in memory.records]
+    turns = len(records)
+    print(f"{GAMES} games, {turns} computer turns")
+    print(f"no sink {baseline:.2f} s, in memory {in_memory:.2f} s ({in_memory / baseline - 1:+.1%}),"
+          f" JSON lines file {to_file:.2f} s ({to_file / baseline - 1:+.1%}), {size / turns:.0f} bytes per turn")
+    print()
+    telemetry.print_summary(telemetry.summarize(records))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""The board as one pixel per cell, for zoomed-out views and the minimap.
+
+Blocks, hiding spots, the gift box and the seekers are written straight
+into a grid_size x grid_size surface through ``pygame.surfarray``. Each
+sync only repaints the cells that changed since the last one: new blocks
+are painted on, and markers that moved are restored to what lies under
+them. The image is then scaled in one call, nearest-neighbour, instead of
+drawing a rect and a sprite per cell, which is both faster and easier to
+read when a cell is only a few pixels wide.
+"""
+try:
+    import numpy as np
+except ImportError:  # surfarray needs NumPy, without it the board is always drawn with sprites
+    np = None
+
+import pygame
+
+from pathfinding import block_cells
+from rules import GameState
+
+EMPTY = (235, 235, 245)
+BLOCK = (110, 70, 40)
+SPOT = (250, 200, 40)
+GIFT = (160, 32, 240)
+TOM = (40, 90, 220)
+SPIKE = (200, 40, 40)
+JERRY = (30, 160, 60)
+
+
+def available():
+    return np is not None
+
+
+class BoardImage:
+    """One pixel per cell, x across the columns and y down the rows"""
+
+    def __init__(self, grid_size):
+        self.grid_size = grid_size
+        self.surface = pygame.Surface((grid_size, grid_size))
+        self.version = 0  # bumped on every change, for caching scaled copies
+        self._colors = {color: self.surface.map_rgb(color) for color in (EMPTY, BLOCK, SPOT, GIFT, TOM, SPIKE, JERRY)}
+        self._base = np.full((grid_size, grid_size), self._colors[EMPTY], dtype=np.uint32)  # blocks and spots
+        self._spots = None
+        self._blocks = []
+        self._blocks_epoch = None
+        self._markers = {}  # cell -> colour drawn over the base
+        self._scaled = {}
+
+    def sync(self, r):
+        """Bring the image up to date with a round, touching only the cells that changed"""
+        dirty = set()
+        if r.hiding_spots != self._spots or r.blocks[:len(self._blocks)] != self._blocks:
+            # New round: repaint the whole base layer
+            self._spots = list(r.hiding_spots)
+            self._blocks = []
+            self._blocks_epoch = None
+            self._base.fill(self._colors[EMPTY])
+            if self._spots:
+                spots = np.array(self._spots, dtype=np.intp)
+                self._base[spots[:, 1], spots[:, 0]] = self._colors[SPOT]
+            self._markers = {}
+            dirty = None
+        if r.blocks_epoch != self._blocks_epoch:
+            self._blocks_epoch = r.blocks_epoch
+            for x, y, orientation in r.blocks[len(self._blocks):]:
+                for cell in block_cells(x, y, orientation):
+                    if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size:
+                        self._base[cell[1], cell[0]] = self._colors[BLOCK]
+                        if dirty is not None:
+                            dirty.add(cell)
+            self._blocks = list(r.blocks)
+        markers = {}
+        if r.gift_box_location is not None:
+            markers[r.gift_box_location] = GIFT
+        if r.state == GameState.GAME_OVER and r.hidden_pos is not None:
+            markers[r.hidden_pos] = JERRY
+        markers[r.seeker2_pos] = SPIKE
+        markers[r.seeker1_pos] = TOM
+        if dirty is None:
+            self._markers = markers
+            pixels = self._base.copy()
+            for (x, y), color in markers.items():
+                pixels[y, x] = self._colors[color]
+            pygame.surfarray.blit_array(self.surface, pixels)
+        elif dirty or markers != self._markers:
+            dirty.update(cell for cell in self._markers if markers.get(cell) != self._markers[cell])
+            dirty.update(cell for cell in markers if markers[cell] != self._markers.get(cell))
+            self._markers = markers
+            if not dirty:
+                return
+            pixels = pygame.surfarray.pixels2d(self.surface)
+            for cell in dirty:
+                color = markers.get(cell)
+                pixels[cell[1], cell[0]] = self._colors[color] if color else self._base[cell[1], cell[0]]
+            del pixels  # unlocks the surface
+        else:
+            return
+        self.version += 1
+
+    def scaled(self, key, area, size):
+        """The cells in area (a rect in cells) scaled to size pixels, cached until the image changes"""
+        cached = self._scaled.get(key)
+        if cached is not None and cached[0] == (self.version, tuple(area), tuple(size)):
+            return cached[1]
+        image = pygame.transform.scale(self.surface.subsurface(area), size)
+        self._scaled[key] = ((self.version, tuple(area), tuple(size)), image)
+        return image
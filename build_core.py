@@ -0,0 +1,69 @@
+"""Compile core.py into an extension module next to it.
+
+    python build_core.py          # mypyc when it is installed, otherwise Cython
+    python build_core.py cython   # pick the compiler
+    python build_core.py clean    # remove the build, back to the interpreted core
+
+Python imports the extension in preference to core.py, so nothing else has
+to change: ``core.compiled()`` tells which one was loaded. The build
+targets the running interpreter and is not shipped with the game; without
+it, or without a C compiler, the game runs the interpreted core.
+"""
+import glob
+import importlib.util
+import os
+import shutil
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+COMPILERS = ("mypyc", "cython")
+
+
+def available(compiler):
+    return importlib.util.find_spec("mypyc" if compiler == "mypyc" else "Cython") is not None
+
+
+def extensions(compiler):
+    if compiler == "mypyc":
+        from mypyc.build import mypycify
+        return mypycify(["core.py"], opt_level="3")
+    from Cython.Build import cythonize
+    return cythonize(["core.py"], compiler_directives={"language_level": 3})
+
+
+def clean():
+    for path in glob.glob(os.path.join(ROOT, "core.*.so")) + glob.glob(os.path.join(ROOT, "core.*.pyd")) \
+            + [os.path.join(ROOT, "core.c")]:
+        if os.path.exists(path):
+            os.remove(path)
+    shutil.rmtree(os.path.join(ROOT, "build"), ignore_errors=True)
+
+
+def build(compiler):
+    from setuptools import setup
+    os.chdir(ROOT)
+    clean()
+    setup(name="hide_seek_core", ext_modules=extensions(compiler), script_args=["build_ext", "--inplace"])
+    shutil.rmtree(os.path.join(ROOT, "build"), ignore_errors=True)
+    if os.path.exists(os.path.join(ROOT, "core.c")):
+        os.remove(os.path.join(ROOT, "core.c"))
+
+
+def main(argv):
+    if argv and argv[0] == "clean":
+        clean()
+        return 0
+    choices = [argv[0]] if argv else [c for c in COMPILERS if available(c)]
+    if not choices or choices[0] not in COMPILERS:
+        print("Install mypy (for mypyc) or Cython, or run `python build_core.py mypyc|cython|clean`")
+        return 1
+    if not available(choices[0]):
+        print(f"{choices[0]} is not installed")
+        return 1
+    build(choices[0])
+    print(f"Built core with {choices[0]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
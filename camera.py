@@ -0,0 +1,111 @@
+"""Scrollable, zoomable view of a board that may be larger than the window.
+
+The camera maps board cells to screen rectangles inside a fixed viewport.
+Drawing and hit-testing ask it which cells are visible, so the work done
+per frame depends on the viewport's size, not on the board's.
+"""
+import pygame
+
+MIN_CELL_SIZE = 8
+MAX_CELL_SIZE = 120
+ZOOM_STEP = 1.25
+FOLLOW_MARGIN = 2  # cells kept between the followed seeker and the viewport edge
+
+
+class Camera:
+    def __init__(self, grid_size, viewport, cell_size):
+        self.grid_size = grid_size
+        self.viewport = pygame.Rect(viewport)  # screen area the board is drawn in
+        self.min_cell_size = self._min_cell_size(cell_size)
+        self.cell_size = cell_size
+        self.offset_x = 0  # board pixels scrolled past the viewport's left edge
+        self.offset_y = 0
+        self.following = True  # follow the active seeker until the player pans away
+        self._clamp()
+
+    def cell_rect(self, x, y, width=1, height=1):
+        """Screen rect of the cells from (x, y), spanning width columns and height rows"""
+        c = self.cell_size
+        return pygame.Rect(self.viewport.x + y * c - self.offset_x, self.viewport.y + x * c - self.offset_y,
+                           width * c, height * c)
+
+    def visible_range(self):
+        """(first row, end row, first column, end column) of the cells in view"""
+        c = self.cell_size
+        first_col = max(0, self.offset_x // c)
+        first_row = max(0, self.offset_y // c)
+        end_col = min(self.grid_size, -(-(self.offset_x + self.viewport.width) // c))
+        end_row = min(self.grid_size, -(-(self.offset_y + self.viewport.height) // c))
+        return first_row, end_row, first_col, end_col
+
+    def is_visible(self, x, y, width=1, height=1):
+        first_row, end_row, first_col, end_col = self.visible_range()
+        return x + height > first_row and x < end_row and y + width > first_col and y < end_col
+
+    def cell_at(self, pos):
+        """Board cell under a screen position, or None outside the board or viewport"""
+        if not self.viewport.collidepoint(pos):
+            return None
+        x = (pos[1] - self.viewport.y + self.offset_y) // self.cell_size
+        y = (pos[0] - self.viewport.x + self.offset_x) // self.cell_size
+        if 0 <= x < self.grid_size and 0 <= y < self.grid_size:
+            return (x, y)
+        return None
+
+    def follow(self, cell):
+        """Scroll just enough to keep a cell away from the viewport's edges"""
+        c = self.cell_size
+        margin = min(FOLLOW_MARGIN * c, (min(self.viewport.width, self.viewport.height) - c) // 2)
+        left = cell[1] * c - margin
+        right = (cell[1] + 1) * c + margin - self.viewport.width
+        top = cell[0] * c - margin
+        bottom = (cell[0] + 1) * c + margin - self.viewport.height
+        self.offset_x = min(max(self.offset_x, right), left)
+        self.offset_y = min(max(self.offset_y, bottom), top)
+        self._clamp()
+
+    def pan(self, dx, dy):
+        self.offset_x += dx
+        self.offset_y += dy
+        self.following = False
+        self._clamp()
+
+    def zoom(self, steps, anchor=None):
+        """Zoom in (positive steps) or out around a screen point, the viewport's centre by default"""
+        size = round(self.cell_size * ZOOM_STEP ** steps)
+        if size == self.cell_size:
+            size += 1 if steps > 0 else -1
+        size = max(self.min_cell_size, min(MAX_CELL_SIZE, size))
+        ax, ay = anchor if anchor is not None else self.viewport.center
+        ax -= self.viewport.x
+        ay -= self.viewport.y
+        # Keep the board point under the anchor where it is
+        self.offset_x = (self.offset_x + ax) * size // self.cell_size - ax
+        self.offset_y = (self.offset_y + ay) * size // self.cell_size - ay
+        self.cell_size = size
+        self._clamp()
+
+    def resize(self, viewport, cell_size):
+        """Move to a new viewport at a new cell size, keeping the board point at its centre in view"""
+        centre_x = (self.offset_x + self.viewport.width / 2) / self.cell_size
+        centre_y = (self.offset_y + self.viewport.height / 2) / self.cell_size
+        self.viewport = pygame.Rect(viewport)
+        self.min_cell_size = self._min_cell_size(cell_size)
+        self.cell_size = max(self.min_cell_size, min(MAX_CELL_SIZE, cell_size))
+        self.offset_x = round(centre_x * self.cell_size - self.viewport.width / 2)
+        self.offset_y = round(centre_y * self.cell_size - self.viewport.height / 2)
+        self._clamp()
+
+    def _min_cell_size(self, cell_size):
+        # Never zoom out further than showing the whole board
+        fit = min(self.viewport.width, self.viewport.height) // self.grid_size
+        return max(1, min(MIN_CELL_SIZE, fit, cell_size))
+
+    def _clamp(self):
+        board = self.grid_size * self.cell_size
+        for axis, view in (("offset_x", self.viewport.width), ("offset_y", self.viewport.height)):
+            if board <= view:
+                # A board smaller than the viewport sits in its centre
+                setattr(self, axis, -((view - board) // 2))
+            else:
+                setattr(self, axis, max(0, min(getattr(self, axis), board - view)))
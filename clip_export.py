@@ -0,0 +1,113 @@
+"""Render a replay offscreen and stream the raw frames out.
+
+The game draws into SDL's dummy video driver, so no window is opened.
+Every frame is written straight from the display surface's pixel buffer,
+without PNG encoding or copying the pixels in Python, to a raw video file,
+to stdout, or into an ffmpeg process::
+
+    python clip_export.py game.hsr --out frames.raw
+    python clip_export.py game.hsr --ffmpeg highlight.mp4 --first 120 --last 200
+    python clip_export.py game.hsr --out - | ffplay -f rawvideo -pixel_format bgr0 -video_size 1000x800 -
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Must be set before pygame opens the display, and before it is imported
+# since its greeting would end up in the video when frames go to stdout
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import hide_seek_game as ui  # noqa: E402
+import replay  # noqa: E402
+
+VIDEO_FPS = 30
+
+
+def pixel_format(surface):
+    """ffmpeg's name for the byte layout of a 32-bit surface, e.g. "bgr0" """
+    if surface.get_bytesize() != 4 or surface.get_pitch() != surface.get_width() * 4:
+        raise ValueError("Only unpadded 32-bit surfaces can be streamed as raw video")
+    names = ["0"] * 4
+    for channel, mask, shift in zip("rgba", surface.get_masks(), surface.get_shifts()):
+        if mask:
+            names[shift // 8] = channel
+    if sys.byteorder == "big":
+        names.reverse()
+    return "".join(names)
+
+
+def export_replay(recorded, out, fps=VIDEO_FPS, turns_per_second=ui.REPLAY_TURNS_PER_SECOND, first=0, last=None,
+                  hold=False):
+    """Write the frames of turns first..last to a binary file object, returns the frame count
+
+    With ``hold`` each turn is drawn once and its frame repeated, which
+    stops the background animation but skips most of the drawing.
+    """
+    game = ui.HideSeekGame(grid_size=recorded.grid_size)
+    game.timeline.speed = 0  # animations follow the video's time, not the wall clock
+    last = len(recorded) - 1 if last is None else min(last, len(recorded) - 1)
+    frames_per_turn = max(1, round(fps / turns_per_second))
+    frames = 0
+    for index in range(first, last + 1):
+        game.timeline.seek(index * 1000 / turns_per_second)
+        game.restore_replay_frame(recorded, index, index - 1 if index > first else None)
+        for i in range(frames_per_turn):
+            game.timeline.seek((index + i / frames_per_turn) * 1000 / turns_per_second)
+            if i == 0 or not hold:
+                game.draw_replay_frame(recorded, index, turns_per_second, True)
+            # The view is the surface's own pixels, the file reads them in place
+            out.write(ui.screen.get_view("0"))
+            frames += 1
+    return frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a replay as raw video frames")
+    parser.add_argument("replay")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="raw video file, or - for stdout")
+    target.add_argument("--ffmpeg", metavar="VIDEO", help="encode with ffmpeg into this file")
+    parser.add_argument("--fps", type=int, default=VIDEO_FPS)
+    parser.add_argument("--turns-per-second", type=float, default=ui.REPLAY_TURNS_PER_SECOND)
+    parser.add_argument("--first", type=int, default=0, help="first turn to export")
+    parser.add_argument("--last", type=int, help="last turn to export")
+    parser.add_argument("--hold", action="store_true", help="draw each turn once, a still background")
+    args = parser.parse_args(argv)
+
+    fmt = pixel_format(ui.init_display())
+    size = f"{ui.WINDOW_WIDTH}x{ui.WINDOW_HEIGHT}"
+    encoder = None
+    if args.ffmpeg:
+        command = ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pixel_format", fmt,
+                   "-video_size", size, "-framerate", str(args.fps), "-i", "-", args.ffmpeg]
+        try:
+            encoder = subprocess.Popen(command, stdin=subprocess.PIPE)
+        except FileNotFoundError:
+            parser.error("ffmpeg was not found on PATH, use --out to write raw frames")
+        out = encoder.stdin
+    elif args.out == "-":
+        out = sys.stdout.buffer
+    else:
+        out = open(args.out, "wb")
+
+    start = time.perf_counter()
+    with replay.ReplayFile(args.replay) as recorded:
+        try:
+            frames = export_replay(recorded, out, args.fps, args.turns_per_second, args.first, args.last,
+                                   args.hold)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+    if encoder is not None and encoder.wait() != 0:
+        sys.exit("ffmpeg failed")
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames of {size} {fmt} at {args.fps} fps in {elapsed:.1f} s,"
+          f" {frames / args.fps / elapsed:.1f}x real time", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
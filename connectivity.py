@@ -0,0 +1,87 @@
+"""Reachability guard for block placement.
+
+A block covers two cells. Removing them can only disconnect the board if the
+free cells around the block stop being connected to each other. So most
+placements are settled by a search over the dozen cells of a small window
+around the block. Only placements that fail that local test pay for a full
+flood fill, and its answer is memoised until the blocks change.
+"""
+from pathfinding import NEIGHBORS, block_cells, blocked_cells
+
+
+class ConnectivityIndex:
+    """Answers "would this block cut a seeker off from a hiding spot?" """
+
+    def __init__(self, grid_size):
+        self.grid_size = grid_size
+        self.blocked = set()
+        self._epoch = None
+        self._memo = {}
+        # Counters for profiling: how often the cheap local test was enough
+        self.local_checks = 0
+        self.flood_fills = 0
+
+    def sync(self, blocks, epoch):
+        """Refresh the blocked cells when the blocks epoch changes"""
+        if epoch != self._epoch:
+            self._epoch = epoch
+            self.blocked = blocked_cells(blocks)
+            self._memo.clear()
+
+    def placement_disconnects(self, x, y, orientation, blocks, epoch, seekers, targets):
+        """True if the block would separate any seeker from any target cell"""
+        self.sync(blocks, epoch)
+        cells = block_cells(x, y, orientation)
+        self.local_checks += 1
+        if self._locally_connected(cells):
+            return False
+        key = (cells, tuple(seekers), tuple(targets))
+        if key not in self._memo:
+            self.flood_fills += 1
+            self._memo[key] = self._flood_disconnects(cells, seekers, targets)
+        return self._memo[key]
+
+    def _free(self, cell, removed):
+        return 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size \
+            and cell not in self.blocked and cell not in removed
+
+    def _locally_connected(self, cells):
+        """Check that the free neighbours of the block still reach each other next to it"""
+        x0 = min(c[0] for c in cells) - 1
+        x1 = max(c[0] for c in cells) + 1
+        y0 = min(c[1] for c in cells) - 1
+        y1 = max(c[1] for c in cells) + 1
+        neighbors = set()
+        for cx, cy in cells:
+            for dx, dy in NEIGHBORS:
+                cell = (cx+dx, cy+dy)
+                if self._free(cell, cells):
+                    neighbors.add(cell)
+        if len(neighbors) <= 1:
+            return True
+        start = next(iter(neighbors))
+        seen = {start}
+        frontier = [start]
+        while frontier:
+            cx, cy = frontier.pop()
+            for dx, dy in NEIGHBORS:
+                cell = (cx+dx, cy+dy)
+                if x0 <= cell[0] <= x1 and y0 <= cell[1] <= y1 and cell not in seen \
+                        and self._free(cell, cells):
+                    seen.add(cell)
+                    frontier.append(cell)
+        return neighbors <= seen
+
+    def _flood_disconnects(self, cells, seekers, targets):
+        required = set(seekers) | set(targets)
+        start = seekers[0]
+        seen = {start}
+        frontier = [start]
+        while frontier:
+            cx, cy = frontier.pop()
+            for dx, dy in NEIGHBORS:
+                cell = (cx+dx, cy+dy)
+                if cell not in seen and self._free(cell, cells):
+                    seen.add(cell)
+                    frontier.append(cell)
+        return not required <= seen
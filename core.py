@@ -0,0 +1,252 @@
+"""The rule and search code the computer spends its time in, strictly typed.
+
+Grid searches run on cell indices ``x * grid_size + y`` over a bytearray
+that is 1 where a cell is blocked, so the inner loops only touch ints.
+Every function is plain, annotated Python that mypyc or Cython can
+compile as it is: ``python build_core.py`` builds the extension next to
+this file, and from then on ``import core`` loads the compiled module
+instead. Without a build, or after ``python build_core.py clean``, the
+interpreted module is used and plays exactly the same games.
+"""
+import heapq
+from typing import Iterator, List, Optional, Tuple
+
+Cell = Tuple[int, int]
+Block = Tuple[int, int, str]
+
+NO_PATH = -1
+
+
+def compiled() -> bool:
+    """True when this module was loaded from the built extension"""
+    return not __file__.endswith(".py")
+
+
+def blocked_grid(grid_size: int, blocks: List[Block]) -> bytearray:
+    """1 for every on-board cell covered by a block, indexed x * grid_size + y"""
+    grid = bytearray(grid_size * grid_size)
+    for bx, by, orientation in blocks:
+        if orientation == "horizontal":
+            cx, cy = bx, by + 1
+        else:
+            cx, cy = bx + 1, by
+        if 0 <= bx < grid_size and 0 <= by < grid_size:
+            grid[bx * grid_size + by] = 1
+        if 0 <= cx < grid_size and 0 <= cy < grid_size:
+            grid[cx * grid_size + cy] = 1
+    return grid
+
+
+def _search(grid_size: int, blocked: bytearray, start: int, goal: int, came_from: List[int]) -> Tuple[int, int]:
+    """A* from start to goal: (steps, or NO_PATH, and the cells taken off the open set)
+
+    Open set entries are ``f * cells + index``, which pops in the same order
+    as ``(f, (x, y))`` tuples would. Stale entries are popped and counted
+    like fresh ones. came_from is filled in when it is not empty.
+    """
+    cells = grid_size * grid_size
+    gx = goal // grid_size
+    gy = goal % grid_size
+    g_score = [-1] * cells
+    g_score[start] = 0
+    track = len(came_from) > 0
+    open_set = [start]
+    expanded = 0
+    while open_set:
+        current = heapq.heappop(open_set) % cells
+        expanded += 1
+        if current == goal:
+            return g_score[current], expanded
+        x = current // grid_size
+        y = current % grid_size
+        temp = g_score[current] + 1
+        for i in range(4):
+            if i == 0:
+                if y + 1 >= grid_size:
+                    continue
+                neighbor = current + 1
+                nx, ny = x, y + 1
+            elif i == 1:
+                if x + 1 >= grid_size:
+                    continue
+                neighbor = current + grid_size
+                nx, ny = x + 1, y
+            elif i == 2:
+                if y == 0:
+                    continue
+                neighbor = current - 1
+                nx, ny = x, y - 1
+            else:
+                if x == 0:
+                    continue
+                neighbor = current - grid_size
+                nx, ny = x - 1, y
+            if blocked[neighbor]:
+                continue
+            old = g_score[neighbor]
+            if old < 0 or temp < old:
+                g_score[neighbor] = temp
+                if track:
+                    came_from[neighbor] = current
+                dx = nx - gx
+                dy = ny - gy
+                f = temp + (dx if dx >= 0 else -dx) + (dy if dy >= 0 else -dy)
+                heapq.heappush(open_set, f * cells + neighbor)
+    return NO_PATH, expanded
+
+
+def grid_distance(grid_size: int, blocked: bytearray, start: int, goal: int) -> Tuple[int, int]:
+    """(steps from start to goal or NO_PATH, cells expanded)"""
+    if start == goal:
+        return 0, 0
+    return _search(grid_size, blocked, start, goal, [])
+
+
+def grid_path(grid_size: int, blocked: bytearray, start: int, goal: int) -> Tuple[List[int], int]:
+    """(cells from start to goal inclusive, empty when there is none, cells expanded)"""
+    if start == goal:
+        return [start], 0
+    came_from = [-1] * (grid_size * grid_size)
+    steps, expanded = _search(grid_size, blocked, start, goal, came_from)
+    if steps == NO_PATH:
+        return [], expanded
+    path = [goal]
+    current = goal
+    while current != start:
+        current = came_from[current]
+        path.append(current)
+    path.reverse()
+    return path, expanded
+
+
+def cell_blocked(blocks: List[Block], x: int, y: int) -> bool:
+    """True if a block covers (x, y)"""
+    for bx, by, orientation in blocks:
+        if x == bx and y == by:
+            return True
+        if orientation == "horizontal":
+            if x == bx and y == by + 1:
+                return True
+        elif x == bx + 1 and y == by:
+            return True
+    return False
+
+
+def placement_clear(grid_size: int, blocks: List[Block], x: int, y: int, orientation: str, seeker1: Cell,
+                    seeker2: Cell, hiding_spots: List[Cell], gift: Optional[Cell]) -> bool:
+    """Every check of a block placement except connectivity: on the board, on free cells, off seekers, spots and gift"""
+    if orientation == "horizontal":
+        x2, y2 = x, y + 1
+        if y2 >= grid_size:
+            return False
+    else:
+        x2, y2 = x + 1, y
+        if x2 >= grid_size:
+            return False
+    if cell_blocked(blocks, x, y) or cell_blocked(blocks, x2, y2):
+        return False
+    first = (x, y)
+    second = (x2, y2)
+    if first == seeker1 or first == seeker2 or second == seeker1 or second == seeker2:
+        return False
+    if first in hiding_spots or second in hiding_spots:
+        return False
+    if gift is not None and (first == gift or second == gift):
+        return False
+    return True
+
+
+def block_score(player_dist: float, computer_dist: float, new_player_dist: float, new_computer_dist: float,
+                x: int, y: int, hidden: Cell, hard: bool) -> float:
+    """How good a block is for the computer: twice the steps it costs Tom minus the steps it costs itself
+
+    Hard adds 2 for blocks that cost Tom 3 or more steps and 1 for blocks
+    within two steps of Jerry.
+    """
+    player_impact = new_player_dist - player_dist
+    score = player_impact * 2 - (new_computer_dist - computer_dist)
+    if hard:
+        if player_impact >= 3:
+            score += 2
+        if abs(x - hidden[0]) + abs(y - hidden[1]) <= 2:
+            score += 1
+    return score
+
+
+def _neighbors(grid_size: int, i: int) -> List[int]:
+    x = i // grid_size
+    y = i % grid_size
+    result: List[int] = []
+    if x > 0:
+        result.append(i - grid_size)
+    if x < grid_size - 1:
+        result.append(i + grid_size)
+    if y > 0:
+        result.append(i - 1)
+    if y < grid_size - 1:
+        result.append(i + 1)
+    return result
+
+
+def repair_distances(grid_size: int, blocked: bytearray, dist: List[int], new_blocked: List[int],
+                     changed: List[int], slice_cells: int) -> Iterator[None]:
+    """Fix a steps-from-source field after new_blocked were blocked; yields every slice_cells cells
+
+    dist holds the steps of every cell before the blocks (-1 for none) and
+    is updated in place, the cells it changes are appended to changed. Only
+    the cells that lost every shortest path are recomputed: they are found
+    outward from the blocks in old-distance order, then filled in from the
+    cells around them that kept theirs.
+    """
+    queue: List[Tuple[int, int]] = []
+    for b in new_blocked:
+        steps = dist[b]
+        if steps >= 0:
+            for w in _neighbors(grid_size, b):
+                if not blocked[w] and dist[w] == steps + 1:
+                    heapq.heappush(queue, (steps + 1, w))
+    cut = set()
+    work = 0
+    while queue:
+        work += 1
+        if work % slice_cells == 0:
+            yield None
+        steps, v = heapq.heappop(queue)
+        if v in cut:
+            continue
+        kept = False
+        for u in _neighbors(grid_size, v):
+            if not blocked[u] and dist[u] == steps - 1 and u not in cut:
+                kept = True
+                break
+        if kept:
+            continue
+        cut.add(v)
+        for w in _neighbors(grid_size, v):
+            if not blocked[w] and dist[w] == steps + 1:
+                heapq.heappush(queue, (steps + 1, w))
+    for v in cut:
+        best = -1
+        for u in _neighbors(grid_size, v):
+            if not blocked[u] and u not in cut and dist[u] >= 0 and (best < 0 or dist[u] + 1 < best):
+                best = dist[u] + 1
+        if best >= 0:
+            queue.append((best, v))
+    for v in cut:
+        dist[v] = -1
+    for b in new_blocked:
+        dist[b] = -1
+    heapq.heapify(queue)
+    while queue:
+        work += 1
+        if work % slice_cells == 0:
+            yield None
+        steps, v = heapq.heappop(queue)
+        if dist[v] >= 0:
+            continue
+        dist[v] = steps
+        for w in _neighbors(grid_size, v):
+            if w in cut and dist[w] < 0:
+                heapq.heappush(queue, (steps + 1, w))
+    changed.extend(new_blocked)
+    changed.extend(cut)
@@ -0,0 +1,413 @@
+"""Gym-style training environments for the hide and seek rules.
+
+``HideSeekEnv`` plays one round at a time on top of ``rules.RoundState``, so
+it follows the interactive game's rules exactly. ``VectorHideSeekEnv`` keeps
+a whole batch of boards in NumPy arrays and steps them all with array
+operations, which is what makes millions of training steps affordable.
+
+Both follow the Gymnasium calling convention without depending on it:
+``reset()`` returns ``(obs, info)`` and ``step(action)`` returns
+``(obs, reward, terminated, truncated, info)``. The agent plays Spike
+(player 2) against a scripted Tom, who walks the shortest path to Jerry with
+probability ``opponent_skill`` and otherwise takes a random legal step.
+Observations only hold what a player sees on screen: the board, both
+seekers, the gift box and the agent's hot/cold feedback, never Jerry.
+
+Actions are integers::
+
+    0-3                  move up, down, left, right
+    4                    Move Target (once per round)
+    5 + o*N*N + x*N + y  place a block at (x, y), o=0 horizontal, o=1 vertical
+"""
+import random
+
+import numpy as np
+
+import layouts
+from belief import BAND_EDGES, COLD, FEEDBACK_BANDS
+from pathfinding import batch_distance_fields, blocked_cells
+from rules import DIRECTIONS, GRID_SIZE, GameState, RoundState
+
+MOVES = ["up", "down", "left", "right"]
+MOVE_TARGET = 4
+BLOCK_BASE = 5
+ORIENTATIONS = ["horizontal", "vertical"]
+STEPS = np.array([DIRECTIONS[m] for m in MOVES])
+DIRECTION_OF_STEP = {step: name for name, step in DIRECTIONS.items()}
+
+# Observation layout: board planes and status entries, agent first
+PLANES = ["blocked", "hiding_spots", "self", "opponent", "gift"]
+STATUS = ["feedback", "blocks_left", "opponent_blocks_left", "moved_target",
+          "opponent_moved_target", "frozen", "opponent_frozen"]
+
+WIN_REWARD = 1.0
+LOSS_REWARD = -1.0
+STEP_REWARD = -0.01
+INVALID_REWARD = -0.05
+
+TOM, SPIKE = 0, 1  # seeker index in the vector env arrays
+NO_WINNER = 0
+
+
+def action_count(grid_size):
+    return BLOCK_BASE + 2 * grid_size * grid_size
+
+
+def decode_action(action, grid_size):
+    """Return ("move", direction), ("move_target",) or ("block", x, y, orientation)"""
+    if 0 <= action < MOVE_TARGET:
+        return ("move", MOVES[action])
+    if action == MOVE_TARGET:
+        return ("move_target",)
+    if not BLOCK_BASE <= action < action_count(grid_size):
+        raise ValueError(f"Action {action} is out of range")
+    o, cell = divmod(action - BLOCK_BASE, grid_size * grid_size)
+    x, y = divmod(cell, grid_size)
+    return ("block", x, y, ORIENTATIONS[o])
+
+
+def encode_block(x, y, orientation, grid_size):
+    return BLOCK_BASE + ORIENTATIONS.index(orientation) * grid_size * grid_size + x * grid_size + y
+
+
+class HideSeekEnv:
+    """One round at a time on the real rules, for debugging and evaluation"""
+
+    def __init__(self, grid_size=GRID_SIZE, opponent_skill=0.7, max_turns=200, seed=None,
+                 pathfinding_backend="auto", layout_source=None):
+        self.grid_size = grid_size
+        self.opponent_skill = opponent_skill
+        self.max_turns = max_turns
+        self.action_count = action_count(grid_size)
+        self.rng = random.Random(seed)
+        self.round = RoundState(grid_size, pathfinding_backend, layout_source, self.rng)
+        self.round.game_mode = "pvp"
+        self.turns = 0
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        r = self.round
+        # Tom moves first; a board he wins before Spike's first move is dealt again
+        while True:
+            r.reset_round()
+            self._play_opponent()
+            if r.state != GameState.GAME_OVER:
+                break
+        self.turns = 0
+        return self._observe(), self._info(True)
+
+    def step(self, action):
+        r = self.round
+        if r.state == GameState.GAME_OVER:
+            raise RuntimeError("step() called on a finished round, call reset()")
+        reward = STEP_REWARD
+        valid = self._apply(int(action))
+        if not valid:
+            # A wasted action still costs the turn
+            reward += INVALID_REWARD
+            r.end_turn()
+        self._play_opponent()
+        self.turns += 1
+        terminated = r.state == GameState.GAME_OVER
+        if terminated:
+            reward += WIN_REWARD if r.seeker2_pos == r.hidden_pos else LOSS_REWARD
+        truncated = not terminated and self.turns >= self.max_turns
+        return self._observe(), reward, terminated, truncated, self._info(valid)
+
+    def _apply(self, action):
+        try:
+            return self.round.take_action(2, decode_action(action, self.grid_size))
+        except ValueError:
+            return False
+
+    def _play_opponent(self):
+        """Play Tom's turns, and Spike's frozen ones, until Spike can act"""
+        r = self.round
+        while r.state != GameState.GAME_OVER:
+            if r.skip_frozen_turn():
+                continue
+            if r.state == GameState.PLAYER2_TURN:
+                return
+            direction = self._opponent_move()
+            if direction is None or not r.move_seeker(1, direction):
+                r.end_turn()
+
+    def _opponent_move(self):
+        r = self.round
+        x, y = r.seeker1_pos
+        if self.rng.random() < self.opponent_skill:
+            path = r.a_star_path(r.seeker1_pos, r.hidden_pos)
+            if len(path) > 1:
+                return DIRECTION_OF_STEP[(path[1][0] - x, path[1][1] - y)]
+        legal = [name for name in MOVES
+                 if 0 <= x + DIRECTIONS[name][0] < self.grid_size and 0 <= y + DIRECTIONS[name][1] < self.grid_size
+                 and not r.is_position_blocked((x + DIRECTIONS[name][0], y + DIRECTIONS[name][1]))]
+        return self.rng.choice(legal) if legal else None
+
+    def _observe(self):
+        r = self.round
+        board = np.zeros((len(PLANES), self.grid_size, self.grid_size), dtype=np.uint8)
+        for cell in blocked_cells(r.blocks):
+            board[0][cell] = 1
+        for cell in r.hiding_spots:
+            board[1][cell] = 1
+        board[2][r.seeker2_pos] = 1
+        board[3][r.seeker1_pos] = 1
+        if r.gift_box_location is not None:
+            board[4][r.gift_box_location] = 1
+        feedback = r.get_feedback(r.a_star_distance(r.seeker2_pos, r.hidden_pos))
+        status = np.array([
+            FEEDBACK_BANDS.index(feedback) / COLD,
+            r.player2_blocks_remaining, r.player1_blocks_remaining,
+            r.player2_moved_target, r.player1_moved_target,
+            r.player2_frozen_turns / 2, r.player1_frozen_turns / 2,
+        ], dtype=np.float32)
+        return {"board": board, "status": status}
+
+    def _info(self, valid):
+        return {"winner": self.round.winner, "turns": self.turns, "invalid": not valid}
+
+
+class VectorHideSeekEnv:
+    """num_envs boards stepped together with NumPy array operations
+
+    Same actions, observations and rewards as ``HideSeekEnv``, with every
+    value batched along the first axis. Jerry's distance field is kept per
+    board and only recomputed where Jerry or the blocks changed, so Tom's
+    greedy step is a lookup. Finished boards reset on their own: the
+    returned observation is the new board and ``info["final_observation"]``
+    holds the last one of the finished round.
+    """
+
+    def __init__(self, num_envs, grid_size=GRID_SIZE, opponent_skill=0.7, max_turns=200, seed=None,
+                 layout_source=None):
+        self.num_envs = num_envs
+        self.grid_size = grid_size
+        self.opponent_skill = opponent_skill
+        self.max_turns = max_turns
+        self.action_count = action_count(grid_size)
+        self.rng = np.random.default_rng(seed)
+        # Optional (count, spots + 2) array of layout records, e.g. LayoutFile.as_array()
+        self.layout_rows = layout_source
+        self._next_layout = 0
+
+        b, n = num_envs, grid_size
+        self.blocked = np.zeros((b, n, n), dtype=bool)
+        self.spots = np.zeros((b, n, n), dtype=bool)
+        self.gift = np.zeros((b, n, n), dtype=bool)  # one cell, or none once collected
+        self.seekers = np.zeros((b, 2, 2), dtype=np.int64)  # board, TOM/SPIKE, (x, y)
+        self.hidden = np.zeros((b, 2), dtype=np.int64)
+        self.blocks_left = np.zeros((b, 2), dtype=np.int8)
+        self.moved_target = np.zeros((b, 2), dtype=bool)
+        self.frozen = np.zeros((b, 2), dtype=np.int8)
+        self.turns = np.zeros(b, dtype=np.int32)
+        self.jerry_dist = np.zeros((b, n, n), dtype=np.int16)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._deal(np.arange(self.num_envs))
+        return self._observe(), {"turns": self.turns.copy()}
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+        b, cells = self.num_envs, self.grid_size * self.grid_size
+        reward = np.full(b, STEP_REWARD, dtype=np.float32)
+        winner = np.full(b, NO_WINNER, dtype=np.int8)
+        invalid = (actions < 0) | (actions >= self.action_count)
+
+        idx = np.flatnonzero(actions < MOVE_TARGET)
+        idx = idx[actions[idx] >= 0]
+        invalid[idx] = ~self._move(idx, SPIKE, STEPS[actions[idx]], winner)
+
+        wants_target = actions == MOVE_TARGET
+        invalid |= wants_target & self.moved_target[:, SPIKE]
+        idx = np.flatnonzero(wants_target & ~self.moved_target[:, SPIKE])
+        self._move_targets(idx)
+        self.moved_target[idx, SPIKE] = True
+
+        idx = np.flatnonzero((actions >= BLOCK_BASE) & ~invalid)
+        o, cell = np.divmod(actions[idx] - BLOCK_BASE, cells)
+        invalid[idx] = ~self._place_blocks(idx, *np.divmod(cell, self.grid_size), o)
+
+        self._opponent_phase(winner == NO_WINNER, winner)
+        self.turns += 1
+        reward[invalid] += INVALID_REWARD
+        reward[winner == 2] += WIN_REWARD
+        reward[winner == 1] += LOSS_REWARD
+        terminated = winner != NO_WINNER
+        truncated = ~terminated & (self.turns >= self.max_turns)
+        info = {"winner": winner, "invalid": invalid, "turns": self.turns.copy()}
+        done = np.flatnonzero(terminated | truncated)
+        if done.size:
+            info["final_observation"] = self._observe()
+            self._deal(done)
+        return self._observe(), reward, terminated, truncated, info
+
+    def _layout_rows(self, count):
+        if self.layout_rows is None:
+            return layouts.sample_layout_rows(self.rng, count, self.grid_size)
+        rows = np.arange(self._next_layout, self._next_layout + count) % len(self.layout_rows)
+        self._next_layout = (self._next_layout + count) % len(self.layout_rows)
+        return self.layout_rows[rows]
+
+    def _deal(self, idx):
+        """Start new rounds on the given boards and play Tom's first turn"""
+        while idx.size:
+            self._reset_boards(idx)
+            winner = np.zeros(self.num_envs, dtype=np.int8)
+            mask = np.zeros(self.num_envs, dtype=bool)
+            mask[idx] = True
+            self._opponent_phase(mask, winner)
+            # A board Tom wins before Spike's first move is dealt again
+            idx = np.flatnonzero(winner != NO_WINNER)
+
+    def _reset_boards(self, idx):
+        n, k = self.grid_size, len(idx)
+        rows = self._layout_rows(k).astype(np.int64)
+        counts = rows[:, 0]
+        cells = rows[:, 2:]
+        used = np.arange(cells.shape[1]) < counts[:, None]
+        spots = np.zeros((k, n * n), dtype=bool)
+        spots[np.repeat(np.arange(k), counts), cells[used]] = True
+        gift = np.zeros((k, n * n), dtype=bool)
+        gift[np.arange(k), rows[:, 1]] = True
+        jerry = cells[np.arange(k), (self.rng.random(k) * counts).astype(np.int64)]
+
+        self.spots[idx] = spots.reshape(k, n, n)
+        self.gift[idx] = gift.reshape(k, n, n)
+        self.blocked[idx] = False
+        self.seekers[idx] = layouts.start_positions(n)
+        self.hidden[idx] = np.stack(np.divmod(jerry, n), axis=1)
+        self.blocks_left[idx] = 1
+        self.moved_target[idx] = False
+        self.frozen[idx] = 0
+        self.turns[idx] = 0
+        self._refresh_distances(idx)
+
+    def _refresh_distances(self, idx):
+        if idx.size:
+            self.jerry_dist[idx] = batch_distance_fields(~self.blocked[idx], self.hidden[idx])
+
+    def _move(self, idx, player, steps, winner):
+        """Move one seeker per board, returns which moves were legal"""
+        n = self.grid_size
+        target = self.seekers[idx, player] + steps
+        inside = ((target >= 0) & (target < n)).all(axis=1)
+        tx, ty = np.clip(target, 0, n - 1).T
+        legal = inside & ~self.blocked[idx, tx, ty]
+        moved = idx[legal]
+        self.seekers[moved, player] = target[legal]
+        x, y = self.seekers[moved, player].T
+        # Collecting the gift box freezes the opponent for two turns
+        got_gift = moved[self.gift[moved, x, y]]
+        self.gift[got_gift] = False
+        self.frozen[got_gift, 1 - player] = 2
+        found = (x == self.hidden[moved, 0]) & (y == self.hidden[moved, 1])
+        winner[moved[found]] = player + 1
+        return legal
+
+    def _move_targets(self, idx):
+        """Move Jerry to a random other hiding spot that no seeker stands on"""
+        if not idx.size:
+            return
+        n, k = self.grid_size, len(idx)
+        rows = np.arange(k)
+        occupied = np.zeros((k, n, n), dtype=bool)
+        for player in (TOM, SPIKE):
+            occupied[rows, self.seekers[idx, player, 0], self.seekers[idx, player, 1]] = True
+        choices = self.spots[idx] & ~occupied
+        fallback = choices.copy()
+        choices[rows, self.hidden[idx, 0], self.hidden[idx, 1]] = False
+        empty = ~choices.any(axis=(1, 2))
+        choices[empty] = fallback[empty]
+        keys = np.where(choices, self.rng.random(choices.shape), -1.0).reshape(k, -1)
+        has_choice = keys.max(axis=1) >= 0
+        picked = keys.argmax(axis=1)
+        moved = idx[has_choice]
+        self.hidden[moved] = np.stack(np.divmod(picked[has_choice], n), axis=1)
+        self._refresh_distances(moved)
+
+    def _place_blocks(self, idx, x, y, o):
+        """Place Spike's block where the rules allow it, returns which were placed"""
+        n = self.grid_size
+        x2, y2 = x + o, y + 1 - o
+        ok = (x2 < n) & (y2 < n) & (self.blocks_left[idx, SPIKE] > 0)
+        x2, y2 = np.minimum(x2, n - 1), np.minimum(y2, n - 1)
+        for cx, cy in ((x, y), (x2, y2)):
+            ok &= ~(self.blocked[idx, cx, cy] | self.spots[idx, cx, cy] | self.gift[idx, cx, cy])
+            for player in (TOM, SPIKE):
+                ok &= (cx != self.seekers[idx, player, 0]) | (cy != self.seekers[idx, player, 1])
+        idx, x, y, x2, y2 = idx[ok], x[ok], y[ok], x2[ok], y2[ok]
+        if idx.size:
+            # Never wall a seeker off from any hiding spot. Tom's reach and Jerry's
+            # new distance field come out of one wavefront over both copies of the boards
+            k = len(idx)
+            rows = np.arange(k)
+            free = ~self.blocked[idx]
+            free[rows, x, y] = False
+            free[rows, x2, y2] = False
+            fields = batch_distance_fields(np.concatenate([free, free]),
+                                           np.concatenate([self.seekers[idx, TOM], self.hidden[idx]]))
+            reach = fields[:k] >= 0
+            connected = (reach | ~self.spots[idx]).all(axis=(1, 2))
+            connected &= reach[rows, self.seekers[idx, SPIKE, 0], self.seekers[idx, SPIKE, 1]]
+            ok[np.flatnonzero(ok)[~connected]] = False
+            idx, x, y, x2, y2 = idx[connected], x[connected], y[connected], x2[connected], y2[connected]
+            self.blocked[idx, x, y] = True
+            self.blocked[idx, x2, y2] = True
+            self.blocks_left[idx, SPIKE] -= 1
+            self.jerry_dist[idx] = fields[k:][connected]
+        return ok
+
+    def _opponent_phase(self, mask, winner):
+        """Play Tom's turns, and Spike's frozen ones, until Spike can act"""
+        active = mask.copy()
+        while active.any():
+            self._opponent_turn(active, winner)
+            active &= winner == NO_WINNER
+            skipped = active & (self.frozen[:, SPIKE] > 0)
+            self.frozen[skipped, SPIKE] -= 1
+            active = skipped
+
+    def _opponent_turn(self, mask, winner):
+        frozen = mask & (self.frozen[:, TOM] > 0)
+        self.frozen[frozen, TOM] -= 1
+        idx = np.flatnonzero(mask & ~frozen)
+        if not idx.size:
+            return
+        n, k = self.grid_size, len(idx)
+        target = self.seekers[idx, TOM][:, None, :] + STEPS[None]
+        inside = ((target >= 0) & (target < n)).all(axis=2)
+        tx, ty = np.clip(target, 0, n - 1).transpose(2, 0, 1)
+        legal = inside & ~self.blocked[idx[:, None], tx, ty]
+        dist = self.jerry_dist[idx[:, None], tx, ty].astype(np.float64)
+        dist[~legal | (dist < 0)] = np.inf
+        noise = self.rng.random((k, 4))
+        # Shortest-path step with random tie breaks, or any legal step
+        greedy = np.argmin(dist + noise * 0.5, axis=1)
+        wander = np.argmax(np.where(legal, noise, -1.0), axis=1)
+        use_greedy = (self.rng.random(k) < self.opponent_skill) & np.isfinite(dist.min(axis=1))
+        choice = np.where(use_greedy, greedy, wander)
+        self._move(idx, TOM, STEPS[choice], winner)
+
+    def _observe(self):
+        b = self.num_envs
+        rows = np.arange(b)
+        board = np.zeros((b, len(PLANES), self.grid_size, self.grid_size), dtype=np.uint8)
+        board[:, 0] = self.blocked
+        board[:, 1] = self.spots
+        board[rows, 2, self.seekers[:, SPIKE, 0], self.seekers[:, SPIKE, 1]] = 1
+        board[rows, 3, self.seekers[:, TOM, 0], self.seekers[:, TOM, 1]] = 1
+        board[:, 4] = self.gift
+        dist = self.jerry_dist[rows, self.seekers[:, SPIKE, 0], self.seekers[:, SPIKE, 1]]
+        band = np.digitize(dist, BAND_EDGES)
+        band[dist < 0] = COLD
+        status = np.stack([
+            band / COLD,
+            self.blocks_left[:, SPIKE], self.blocks_left[:, TOM],
+            self.moved_target[:, SPIKE], self.moved_target[:, TOM],
+            self.frozen[:, SPIKE] / 2, self.frozen[:, TOM] / 2,
+        ], axis=1).astype(np.float32)
+        return {"board": board, "status": status}
@@ -1,21 +1,45 @@
 import pygame
+import argparse
+import json
+import os
 import sys
 import random
-import heapq
 import math
-from enum import Enum
-
-pygame.init()
-pygame.mixer.init()
-pygame.mixer.music.set_volume(0.5)
-
-GRID_SIZE = 10
+import types
+
+import arena
+import belief
+import board_image
+import pathfinding
+import precompute
+from animation import Timeline
+import replay
+import rules
+import telemetry
+from camera import Camera
+from rules import GameState, RoundState
+from sprite_cache import SpriteCache
+
+GRID_SIZE = rules.GRID_SIZE
 CELL_SIZE = 60
+# Size of the board viewport, larger boards scroll and zoom inside it
 WIDTH = GRID_SIZE * CELL_SIZE
 HEIGHT = GRID_SIZE * CELL_SIZE
 WINDOW_WIDTH = WIDTH + 400
 WINDOW_HEIGHT = HEIGHT + 200
 FPS = 60
+# Game logic runs in fixed steps, independent of the frame rate
+SIMULATION_STEP_MS = 20
+MAX_CATCH_UP_MS = 1000  # after a longer stall the game resumes instead of fast-forwarding
+COMPUTER_DELAY_MS = 800
+SEEKER_SLIDE_MS = 120  # time a seeker takes to slide one cell on screen
+# Replay playback: turns per second at 1x and the top speed
+REPLAY_TURNS_PER_SECOND = 2
+REPLAY_MAX_SPEED = 64
+GIFT_BOX_FRAME_COUNT = 45  # frames in the gift box's idle loop
+# Below this cell size the board is drawn as one coloured pixel block per cell
+LOD_CELL_SIZE = 12
+MINIMAP_SIZE = 110
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -24,104 +48,159 @@ LIGHT_GREEN = (180, 255, 230)
 RED = (255, 0, 0)
 ORANGE = (255, 165, 0)
 
+# Movement keys for each player
+PLAYER1_KEYS = {pygame.K_UP: "up", pygame.K_DOWN: "down", pygame.K_LEFT: "left", pygame.K_RIGHT: "right"}
+PLAYER2_KEYS = {pygame.K_w: "up", pygame.K_s: "down", pygame.K_a: "left", pygame.K_d: "right"}
+REPLAY_STEPS = {pygame.K_LEFT: -1, pygame.K_RIGHT: 1, pygame.K_PAGEUP: -10, pygame.K_PAGEDOWN: 10}
+
 # --- Center the grid in the window ---
 GRID_OFFSET_X = (WINDOW_WIDTH - WIDTH) // 3
 GRID_OFFSET_Y = 120  # Slightly more space for buttons above
-
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-FONT = pygame.font.SysFont("Segoe UI Emoji", 28)
-
-class GameState(Enum):
-    MENU = 1
-    PLAYER1_TURN = 2
-    PLAYER2_TURN = 3
-    GAME_OVER = 4
-
-class HideSeekGame:
-    def __init__(self):
-        self.stars = [
-            {
-                "x": random.randint(0, WINDOW_WIDTH),
-                "y": random.randint(0, WINDOW_HEIGHT),
-                "size": random.randint(2, 5),
-                "speed": random.uniform(0.3, 0.8),
-                "color": random.choice([(255,255,255), (255,230,200), (200,220,255), (255,255,180)]),
-                "alpha": random.randint(100, 255),
-                "alpha_direction": random.choice([-1, 1])
-            }
-            for _ in range(60)
-        ]
-        self.main_menu_button = None
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 24)
-        self.big_font = pygame.font.Font(None, 36)
-        self.game_mode = None  # 'pvc' or 'pvp'
-        self.computer_difficulty = "normal"  # 'normal' or 'hard'
-        self.next_round_button = None
-        self.move_target_button = None
-        self.computer_thinking = False
-        self.computer_think_time = 0
-        self.player1_moved_target = False
-        self.player2_moved_target = False
-        
-        # Block system variables
-        self.blocks = []  # List of block positions and orientations
-        self.player1_blocks_remaining = 1
-        self.player2_blocks_remaining = 1
-        self.place_block_button = None
-        self.block_placement_mode = False
-        self.block_orientation = "horizontal"  # "horizontal" or "vertical"
-        # Block preview variables
-        self.block_preview_pos = None  # (x, y) position for preview
-        self.block_preview_valid = False  # Whether the preview position is valid
-
-        self.tom_images = {
+# The window can be resized down to this, the side panel and title buttons need the room
+MIN_WINDOW_WIDTH = 900
+MIN_WINDOW_HEIGHT = 600
+FULLSCREEN_KEY = pygame.K_F11
+
+# Fonts looked up by name are found once per machine and remembered here
+CACHE_DIR = os.environ.get("HIDE_SEEK_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "pygame_hide_seek"))
+TITLE_FONT = "Segoe UI Emoji"
+
+screen = None  # the window, opened by init_display()
+_fonts = {}
+_assets = None
+_title_background = None
+_windowed_size = (WINDOW_WIDTH, WINDOW_HEIGHT)  # the window's size to return to when leaving fullscreen
+
+
+def init_display(fullscreen=False):
+    """Start pygame and open the window on first use, returns the screen surface"""
+    global screen
+    if screen is None:
+        pygame.init()
+        pygame.mixer.init()
+        pygame.mixer.music.set_volume(0.5)
+        if fullscreen:
+            screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.RESIZABLE)
+        set_layout(*screen.get_size())
+    return screen
+
+
+def set_layout(width, height):
+    """Lay the screen out for a window size, the board viewport gets what the side panel leaves"""
+    global WINDOW_WIDTH, WINDOW_HEIGHT, WIDTH, HEIGHT, GRID_OFFSET_X, _title_background
+    WINDOW_WIDTH = max(MIN_WINDOW_WIDTH, width)
+    WINDOW_HEIGHT = max(MIN_WINDOW_HEIGHT, height)
+    WIDTH = WINDOW_WIDTH - 400
+    HEIGHT = WINDOW_HEIGHT - 200
+    GRID_OFFSET_X = (WINDOW_WIDTH - WIDTH) // 3
+    _title_background = None  # scaled to the new size when next shown
+
+
+def board_cell_size():
+    """Cell size at which a board of the default size fills the viewport"""
+    return max(1, min(WIDTH, HEIGHT) // GRID_SIZE)
+
+
+def resize_window(width, height):
+    global screen
+    screen = pygame.display.set_mode((max(MIN_WINDOW_WIDTH, width), max(MIN_WINDOW_HEIGHT, height)), pygame.RESIZABLE)
+    set_layout(*screen.get_size())
+
+
+def toggle_fullscreen():
+    """Switch between fullscreen and a resizable window of the size it had before"""
+    global screen, _windowed_size
+    if screen.get_flags() & pygame.FULLSCREEN:
+        screen = pygame.display.set_mode(_windowed_size, pygame.RESIZABLE)
+    else:
+        _windowed_size = screen.get_size()
+        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    set_layout(*screen.get_size())
+
+
+def font_path(name):
+    """File of a system font, or None for pygame's bundled font
+
+    Looking a font up by name makes pygame scan every installed font (and
+    run fc-list on Linux), so the answer is kept in the cache directory and
+    later starts read it back instead.
+    """
+    cache = os.path.join(CACHE_DIR, "fonts.json")
+    try:
+        with open(cache) as f:
+            paths = json.load(f)
+    except (OSError, ValueError):
+        paths = {}
+    if name in paths and (paths[name] is None or os.path.exists(paths[name])):
+        return paths[name]
+    paths[name] = pygame.font.match_font(name)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache, "w") as f:
+            json.dump(paths, f)
+    except OSError:
+        pass  # a read-only home only costs the lookup again next time
+    return paths[name]
+
+
+def get_font(size, name=None):
+    """A font by system name, or pygame's bundled font when name is None, created once per size"""
+    key = (name, size)
+    if key not in _fonts:
+        pygame.font.init()
+        _fonts[key] = pygame.font.Font(font_path(name) if name else None, size)
+    return _fonts[key]
+
+
+def title_background():
+    global _title_background
+    if _title_background is None:
+        image = pygame.image.load("assets/title_screen.png")
+        _title_background = pygame.transform.scale(image, (WINDOW_WIDTH, WINDOW_HEIGHT))
+    return _title_background
+
+
+def load_assets():
+    """Load every image once, all games share the same surfaces
+
+    Board sprites stay at their original resolution and are scaled to the
+    cell size they are drawn at by each game's SpriteCache, so every size
+    is scaled from the original rather than from a copy at the default
+    size. Panel images have one fixed size and are scaled here.
+    """
+    global _assets
+    if _assets is None:
+        a = types.SimpleNamespace()
+        a.tom_images = {
             "up": pygame.image.load("tom/tom_walking_up.png"),
             "down": pygame.image.load("tom/tom_walking_down.png"),
             "left": pygame.image.load("tom/tom_walking_left.png"),
             "right": pygame.image.load("tom/tom_walking_right.png"),
             "idle": pygame.image.load("tom/tom_standing.png"),
         }
-        for key in self.tom_images:
-            self.tom_images[key] = pygame.transform.scale(self.tom_images[key], (CELL_SIZE, CELL_SIZE))
-        self.tom_direction = "idle"
 
-        self.spike_images = {
+        a.spike_images = {
             "up": pygame.image.load("spike/spike_walking_up.png"),
             "down": pygame.image.load("spike/spike_walking_down.png"),
             "left": pygame.image.load("spike/spike_walking_left.png"),
             "right": pygame.image.load("spike/spike_walking_right.png"),
             "idle": pygame.image.load("spike/spike_standing.png"),
         }
-        for key in self.spike_images:
-            self.spike_images[key] = pygame.transform.scale(self.spike_images[key], (CELL_SIZE, CELL_SIZE))
-        self.spike_direction = "idle"
 
         # Load block images
-        self.block_horizontal = pygame.transform.scale(pygame.image.load("assets/block_horizontal.png"), (CELL_SIZE * 2, CELL_SIZE))
-        self.block_vertical = pygame.transform.scale(pygame.image.load("assets/block_vertical.png"), (CELL_SIZE, CELL_SIZE * 2))
+        a.block_horizontal = pygame.image.load("assets/block_horizontal.png")
+        a.block_vertical = pygame.image.load("assets/block_vertical.png")
 
         # Load cheese wedge image for hiding spots
-        self.cheese_image = pygame.transform.scale(pygame.image.load("assets/Cheese-wedge.png"), (CELL_SIZE, CELL_SIZE))
-
-        self.jerry_image = pygame.transform.scale(pygame.image.load("jerry/jerry_hiding2.png"), (CELL_SIZE, CELL_SIZE))
+        a.cheese_image = pygame.image.load("assets/Cheese-wedge.png")
 
-        self.jerry_running_frames = [
-            pygame.transform.scale(
-                pygame.image.load(f"jerry/frame_{i:02d}_delay-0.08s.png"), 
-                (CELL_SIZE, CELL_SIZE)
-            )
-            for i in range(14)  
-        ]
-        self.jerry_running_frame_index = 0
-        self.jerry_running_frame_timer = 0
-        self.jerry_running_frame_duration = 50  # milliseconds = 0.05s
-        self.show_jerry_running = False
-        self.jerry_running_pos = None
-        self.jerry_running_start_time = 0
+        a.jerry_image = pygame.image.load("jerry/jerry_hiding2.png")
 
+        a.jerry_running_frames = [pygame.image.load(f"jerry/frame_{i:02d}_delay-0.08s.png") for i in range(14)]
 
-        self.feedback_images = {
+        a.feedback_images = {
             "FOUND": pygame.image.load("feed_back/found.png"),
             "BURNING": pygame.image.load("feed_back/burning_hot.png"),
             "HOT": pygame.image.load("feed_back/hot.png"),
@@ -129,111 +208,151 @@ class HideSeekGame:
             "COOL": pygame.image.load("feed_back/cool.png"),
             "COLD": pygame.image.load("feed_back/cold.png")
         }
-        for key in self.feedback_images:
-            self.feedback_images[key] = pygame.transform.scale(self.feedback_images[key], (180, 180))
-
-        self.state = GameState.MENU
-        self.seeker1_pos = (0, 0)
-        self.seeker2_pos = (GRID_SIZE - 1, GRID_SIZE - 1)
-        self.hidden_pos = None
-        self.feedback_text = ""
-        self.winner = None
-        self.hiding_spots = []
-        self.generate_hiding_spots()
+        for key in a.feedback_images:
+            a.feedback_images[key] = pygame.transform.scale(a.feedback_images[key], (180, 180))
 
-        self.tutorial_image = pygame.image.load("assets/tutorial.png")
-        self.tutorial_image = pygame.transform.scale(self.tutorial_image, (887, 426))
+        a.tutorial_image = pygame.image.load("assets/tutorial.png")
+        a.tutorial_image = pygame.transform.scale(a.tutorial_image, (887, 426))
 
-        self.player1_keys_image = pygame.image.load("assets/player1_keys.jfif")
-        self.player1_keys_image = pygame.transform.scale(self.player1_keys_image, (160, 100))
+        a.player1_keys_image = pygame.image.load("assets/player1_keys.jfif")
+        a.player1_keys_image = pygame.transform.scale(a.player1_keys_image, (160, 100))
 
-        self.player2_keys_image = pygame.image.load("assets/player2_keys.jpg")
-        self.player2_keys_image = pygame.transform.scale(self.player2_keys_image, (160, 100))
+        a.player2_keys_image = pygame.image.load("assets/player2_keys.jpg")
+        a.player2_keys_image = pygame.transform.scale(a.player2_keys_image, (160, 100))
 
-        self.FIND_JERRY_FIRST = pygame.image.load("assets/FIND_JERRY_FIRST.png")
-        self.FIND_JERRY_FIRST = pygame.transform.scale(self.FIND_JERRY_FIRST, (160, 160))
+        a.FIND_JERRY_FIRST = pygame.image.load("assets/FIND_JERRY_FIRST.png")
+        a.FIND_JERRY_FIRST = pygame.transform.scale(a.FIND_JERRY_FIRST, (160, 160))
 
-        self.surprise_image = pygame.image.load("assets/surprise-gift.png")
-        self.surprise_image = pygame.transform.scale(self.surprise_image, (160, 160))
+        a.surprise_image = pygame.image.load("assets/surprise-gift.png")
+        a.surprise_image = pygame.transform.scale(a.surprise_image, (160, 160))
 
         # --- Frozen images ---
-        self.tom_frozen_image = pygame.transform.scale(pygame.image.load("tom/tom_frozen.png"), (CELL_SIZE, CELL_SIZE))
-        self.spike_frozen_image = pygame.transform.scale(pygame.image.load("spike/spike_frozen.png"), (CELL_SIZE, CELL_SIZE))
-        # If you have a tom frozen image, use: self.tom_frozen_image = pygame.transform.scale(pygame.image.load("tom/tom_frozen.png"), (CELL_SIZE, CELL_SIZE))
-
-        # Freeze state
-        self.player1_frozen_turns = 0
-        self.player2_frozen_turns = 0
-        # Unfreeze animation state
-        self.player1_unfreezing = False
-        self.player2_unfreezing = False
-        self.player1_unfreeze_timer = 0
-        self.player2_unfreeze_timer = 0
-        self.unfreeze_anim_duration = 500  # ms
-        self.unfreeze_anim_jitter = 6  # px
+        a.tom_frozen_image = pygame.image.load("tom/tom_frozen.png")
+        a.spike_frozen_image = pygame.image.load("spike/spike_frozen.png")
 
         # --- Gift Box Animation ---
-        self.gift_box_frames = [
-            pygame.transform.scale(
-                pygame.image.load(f"suprise_box/on_board/frame_{i:03d}_delay-0.03s.gif"),
-                (CELL_SIZE, CELL_SIZE)
-            ) for i in range(45)
+        a.gift_box_frames = [
+            pygame.image.load(f"suprise_box/on_board/frame_{i:03d}_delay-0.03s.gif") for i in range(GIFT_BOX_FRAME_COUNT)
         ]
-        self.gift_box_frame_index = 0
-        self.gift_box_frame_timer = 0
-        self.gift_box_frame_duration = 30  # ms per frame
-        self.gift_box_location = None
-        self.place_gift_box()
 
         # --- Gift Box Pop Animation ---
-        self.gift_box_pop_frames = [
-            pygame.transform.scale(
-                pygame.image.load(f"suprise_box/take/frame_{i:03d}_delay-0.03s.gif"),
-                (CELL_SIZE, CELL_SIZE)
-            ) for i in range(114, 150)
+        a.gift_box_pop_frames = [
+            pygame.image.load(f"suprise_box/take/frame_{i:03d}_delay-0.03s.gif") for i in range(114, 150)
         ]
-        self.gift_box_popping = False
-        self.gift_box_pop_frame_index = 0
-        self.gift_box_pop_frame_timer = 0
+        _assets = a
+    return _assets
+
+
+class HideSeekGame(RoundState):
+    def __init__(self, pathfinding_backend="auto", layout_source=None, recorder=None, grid_size=GRID_SIZE):
+        super().__init__(grid_size, pathfinding_backend, layout_source)
+        init_display()
+        self.recorder = recorder  # optional replay.ReplayWriter that gets every turn
+        self.tables_opened = False  # the table cache is made by the first block search that wants it
+        self.stars = [
+            {
+                "x": random.randint(0, WINDOW_WIDTH),
+                "y": random.randint(0, WINDOW_HEIGHT),
+                "size": random.randint(2, 5),
+                "speed": random.uniform(0.3, 0.8),
+                "color": random.choice([(255,255,255), (255,230,200), (200,220,255), (255,255,180)]),
+                "alpha": random.randint(100, 255),
+                "alpha_direction": random.choice([-1, 1])
+            }
+            for _ in range(60)
+        ]
+        self.main_menu_button = None
+        self.has_main_menu = True  # False where there is no local menu to go back to, as in online games
+        self.clock = pygame.time.Clock()
+        self.font = get_font(24)
+        self.big_font = get_font(36)
+        self.next_round_button = None
+        self.move_target_button = None
+        self.computer_thinking = False
+        self.computer_think_steps = 0
+        self.simulation_lag = 0  # wall time not yet simulated, in ms
+        self.seeker_slides = None  # player -> (previous, current) on-screen cell, while run() animates moves
+        self.render_alpha = 1.0  # how far the frame being drawn is between two simulation steps
+
+        # Block placement UI
+        self.place_block_button = None
+        self.block_placement_mode = False
+        self.block_orientation = "horizontal"  # "horizontal" or "vertical"
+        # Block preview variables
+        self.block_preview_pos = None  # (x, y) position for preview
+        self.block_preview_valid = False  # Whether the preview position is valid
+        self.pointer_pos = None  # latest mouse position this frame, motion events are coalesced into it
+
+        self.scaled_sprites = SpriteCache()  # images scaled for the sizes the board is drawn at
+
+        self.base_cell_size = board_cell_size()  # the cell size before any zooming, follows the window
+        self.camera = Camera(grid_size, (GRID_OFFSET_X, GRID_OFFSET_Y, WIDTH, HEIGHT), self.base_cell_size)
+        self.followed_turn = None  # the turn the camera last started following
+        self.board_image = board_image.BoardImage(grid_size) if board_image.available() else None
+
+        # Every animation runs on one timeline, frames follow from the time elapsed
+        self.timeline = Timeline(pygame.time.get_ticks)
+        self.jerry_running_frame_duration = 50  # milliseconds = 0.05s
+        self.jerry_running_duration = 1100  # ms, holds the last frame to the end
+        self.unfreeze_anim_duration = 500  # ms
+        self.unfreeze_anim_jitter = 6  # px
+        self.gift_box_frame_duration = 30  # ms per frame
         self.gift_box_pop_frame_duration = 25  # ms per frame (faster)
-        self.gift_box_pop_position = None
+        self.timeline.start("gift_box", GIFT_BOX_FRAME_COUNT, self.gift_box_frame_duration, loop=True)
 
-        # --- Score tracking ---
-        self.scores = {"Tom": 0, "Spike": 0, "Computer": 0}
-        self.last_game_mode = None
         self.debug_message = None
 
+    def block_table(self):
+        if not self.tables_opened:
+            self.tables_opened = True
+            try:
+                self.table_cache = precompute.TableCache(os.path.join(CACHE_DIR, "tables"))
+            except OSError:
+                pass  # without a writable cache directory the computer searches without tables
+        return super().block_table()
+
+    @property
+    def assets(self):
+        """The images, loaded on first use so the title screen can show before they are
+
+        Surfaces are read-only, so every game shares the same copies.
+        """
+        return load_assets()
+
     def show_title_screen(self):
         # Always reset scores and last_game_mode when entering main menu
         self.scores = {"Tom": 0, "Spike": 0, "Computer": 0}
         self.last_game_mode = None
-        background = pygame.image.load("assets/title_screen.png")
-        background = pygame.transform.scale(background, (WINDOW_WIDTH, WINDOW_HEIGHT))
-
+        title_font = get_font(28, TITLE_FONT)
         button_color = (255, 200, 0)
-        button_rect_pvc = pygame.Rect(WINDOW_WIDTH // 2 - 120, WINDOW_HEIGHT - 220, 240, 50)
-        button_rect_pvp = pygame.Rect(WINDOW_WIDTH // 2 - 120, WINDOW_HEIGHT - 150, 240, 50)
-        button_rect_tutorial = pygame.Rect(WINDOW_WIDTH // 2 - 120, WINDOW_HEIGHT - 80, 240, 40)
-
-        # Difficulty selection UI
-        radio_normal = pygame.Rect(WINDOW_WIDTH // 2 - 100, WINDOW_HEIGHT - 300, 30, 30)
-        radio_hard = pygame.Rect(WINDOW_WIDTH // 2 + 40, WINDOW_HEIGHT - 300, 30, 30)
-        start_button_rect = pygame.Rect(WINDOW_WIDTH // 2 - 80, WINDOW_HEIGHT - 220, 160, 50)
         show_difficulty = False
         selected_difficulty = "normal"
 
+        images_loaded = False
         running_title = True
         while running_title:
-            screen.blit(background, (0, 0))
+            # Laid out every frame, the window may have been resized
+            button_rect_pvc = pygame.Rect(WINDOW_WIDTH // 2 - 120, WINDOW_HEIGHT - 220, 240, 50)
+            button_rect_pvp = pygame.Rect(WINDOW_WIDTH // 2 - 120, WINDOW_HEIGHT - 150, 240, 50)
+            button_rect_tutorial = pygame.Rect(WINDOW_WIDTH // 2 - 120, WINDOW_HEIGHT - 80, 240, 40)
+
+            # Difficulty selection UI
+            radio_normal = pygame.Rect(WINDOW_WIDTH // 2 - 150, WINDOW_HEIGHT - 300, 30, 30)
+            radio_hard = pygame.Rect(WINDOW_WIDTH // 2 - 20, WINDOW_HEIGHT - 300, 30, 30)
+            # The fair computer only learns from feedback, it needs NumPy
+            radio_fair = pygame.Rect(WINDOW_WIDTH // 2 + 90, WINDOW_HEIGHT - 300, 30, 30) if belief.available() else None
+            start_button_rect = pygame.Rect(WINDOW_WIDTH // 2 - 80, WINDOW_HEIGHT - 220, 160, 50)
+
+            screen.blit(title_background(), (0, 0))
 
             # Draw buttons
             if not show_difficulty:
                 pygame.draw.rect(screen, button_color, button_rect_pvc)
                 pygame.draw.rect(screen, button_color, button_rect_pvp)
                 pygame.draw.rect(screen, button_color, button_rect_tutorial)
-                start_text_pvc = FONT.render("Player vs Computer", True, (0, 0, 0))
-                start_text_pvp = FONT.render("Player vs Player", True, (0, 0, 0))
-                tutorial_text = FONT.render("Tutorial", True, (0, 0, 0))
+                start_text_pvc = title_font.render("Player vs Computer", True, (0, 0, 0))
+                start_text_pvp = title_font.render("Player vs Player", True, (0, 0, 0))
+                tutorial_text = title_font.render("Tutorial", True, (0, 0, 0))
                 screen.blit(start_text_pvc, start_text_pvc.get_rect(center=button_rect_pvc.center))
                 screen.blit(start_text_pvp, start_text_pvp.get_rect(center=button_rect_pvp.center))
                 screen.blit(tutorial_text, tutorial_text.get_rect(center=button_rect_tutorial.center))
@@ -243,27 +362,40 @@ class HideSeekGame:
                 pygame.draw.rect(screen, (245, 240, 255), bg_rect, border_radius=18)
                 pygame.draw.rect(screen, (120, 120, 180), bg_rect, 4, border_radius=18)
                 # Draw difficulty selection
-                diff_label = FONT.render("Computer Difficulty:", True, (0, 0, 0))
+                diff_label = title_font.render("Computer Difficulty:", True, (0, 0, 0))
                 screen.blit(diff_label, (WINDOW_WIDTH // 2 - 140, WINDOW_HEIGHT - 340))
                 # Radio buttons
                 pygame.draw.circle(screen, BLACK, radio_normal.center, 15, 2)
                 pygame.draw.circle(screen, BLACK, radio_hard.center, 15, 2)
+                if radio_fair:
+                    pygame.draw.circle(screen, BLACK, radio_fair.center, 15, 2)
                 if selected_difficulty == "normal":
                     pygame.draw.circle(screen, (0, 200, 0), radio_normal.center, 9)
+                elif selected_difficulty == "fair":
+                    pygame.draw.circle(screen, (0, 200, 0), radio_fair.center, 9)
                 else:
                     pygame.draw.circle(screen, (0, 200, 0), radio_hard.center, 9)
-                normal_text = FONT.render("Normal", True, (0, 0, 0))
-                hard_text = FONT.render("Hard", True, (0, 0, 0))
+                normal_text = title_font.render("Normal", True, (0, 0, 0))
+                hard_text = title_font.render("Hard", True, (0, 0, 0))
                 screen.blit(normal_text, (radio_normal.right + 10, radio_normal.y - 2))
                 screen.blit(hard_text, (radio_hard.right + 10, radio_hard.y - 2))
+                if radio_fair:
+                    fair_text = title_font.render("Fair", True, (0, 0, 0))
+                    screen.blit(fair_text, (radio_fair.right + 10, radio_fair.y - 2))
                 # Start button
                 pygame.draw.rect(screen, button_color, start_button_rect)
-                start_text = FONT.render("Start", True, (0, 0, 0))
+                start_text = title_font.render("Start", True, (0, 0, 0))
                 screen.blit(start_text, start_text.get_rect(center=start_button_rect.center))
 
             pygame.display.flip()
+            if not images_loaded:
+                # The title is up, load the game's images while the player reads it
+                load_assets()
+                images_loaded = True
 
             for event in pygame.event.get():
+                if self.handle_display_event(event):
+                    continue
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -282,6 +414,8 @@ class HideSeekGame:
                             selected_difficulty = "normal"
                         elif radio_hard.collidepoint(event.pos):
                             selected_difficulty = "hard"
+                        elif radio_fair and radio_fair.collidepoint(event.pos):
+                            selected_difficulty = "fair"
                         elif start_button_rect.collidepoint(event.pos):
                             self.game_mode = 'pvc'
                             self.computer_difficulty = selected_difficulty
@@ -304,28 +438,28 @@ class HideSeekGame:
             screen.blit(title, (WINDOW_WIDTH // 2 - title.get_width() // 2, 30))
 
             # 🧠 הצגת תמונה ראשית במרכז
-            tutorial_rect = self.tutorial_image.get_rect(center=(WINDOW_WIDTH // 2, 150 + self.tutorial_image.get_height() // 3.2))
-            screen.blit(self.tutorial_image, tutorial_rect.topleft)
+            tutorial_rect = self.assets.tutorial_image.get_rect(center=(WINDOW_WIDTH // 2, 150 + self.assets.tutorial_image.get_height() // 3.2))
+            screen.blit(self.assets.tutorial_image, tutorial_rect.topleft)
 
             # 🕹️ Player 1 keys – ימין למטה
             p1_x = WINDOW_WIDTH - 200
             p1_y = WINDOW_HEIGHT - 180
-            screen.blit(self.player1_keys_image, (p1_x, p1_y))
+            screen.blit(self.assets.player1_keys_image, (p1_x, p1_y))
             p1_text = self.font.render("Player 1", True, BLACK)
             screen.blit(p1_text, (p1_x + 40, p1_y + 110))
 
             # 🧀 Find Jerry First – באמצע בין השניים
-            fjf_rect = self.FIND_JERRY_FIRST.get_rect(center=(WINDOW_WIDTH // 2, p1_y + 50))
-            screen.blit(self.FIND_JERRY_FIRST, fjf_rect.topleft)
+            fjf_rect = self.assets.FIND_JERRY_FIRST.get_rect(center=(WINDOW_WIDTH // 2, p1_y + 50))
+            screen.blit(self.assets.FIND_JERRY_FIRST, fjf_rect.topleft)
 
              # 📦 Surprise gift explanation image – מתחת לתמונה הראשית
-            surprise_rect = self.surprise_image.get_rect(center=(105, tutorial_rect.bottom + -290))
-            screen.blit(self.surprise_image, surprise_rect.topleft)
+            surprise_rect = self.assets.surprise_image.get_rect(center=(105, tutorial_rect.bottom + -290))
+            screen.blit(self.assets.surprise_image, surprise_rect.topleft)
 
             # 🕹️ Player 2 keys – שמאל למטה
             p2_x = 60
             p2_y = WINDOW_HEIGHT - 180
-            screen.blit(self.player2_keys_image, (p2_x, p2_y))
+            screen.blit(self.assets.player2_keys_image, (p2_x, p2_y))
             p2_text = self.font.render("Player 2", True, BLACK)
             screen.blit(p2_text, (p2_x + 40, p2_y + 110))
 
@@ -339,6 +473,8 @@ class HideSeekGame:
             pygame.display.flip()
 
             for event in pygame.event.get():
+                if self.handle_display_event(event):
+                    continue
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -346,586 +482,228 @@ class HideSeekGame:
                     if self.main_menu_button.collidepoint(event.pos):
                         running_tutorial = False
 
-    def place_gift_box(self):
-        # Place the gift box at a random location not occupied by players or hiding spots
-        excluded = [(0, 0), (GRID_SIZE-1, GRID_SIZE-1)] + self.hiding_spots
-        while True:
-            pos = (random.randint(0, GRID_SIZE - 1), random.randint(0, GRID_SIZE - 1))
-            if pos not in excluded:
-                self.gift_box_location = pos
-                break
-
-    def generate_hiding_spots(self):
-        self.hiding_spots = []
-        # Define starting positions that should be excluded
-        excluded_positions = [(0, 0), (GRID_SIZE-1, GRID_SIZE-1)]  # Tom's and Spike's starting positions
-        
-        for _ in range(random.randint(8, 12)):
-            while True:
-                pos = (random.randint(0, GRID_SIZE - 1), random.randint(0, GRID_SIZE - 1))
-                if pos not in self.hiding_spots and pos not in excluded_positions:
-                    self.hiding_spots.append(pos)
-                    break
-        # After hiding spots are generated, place the gift box
-        self.place_gift_box()
-
-    def is_position_blocked(self, pos):
-        """Check if a position is blocked by any block"""
-        x, y = pos
-        for block in self.blocks:
-            block_x, block_y, orientation = block
-            if orientation == "horizontal":
-                if x == block_x and y == block_y or x == block_x and y == block_y + 1:
-                    return True
-            else:  # vertical
-                if x == block_x and y == block_y or x == block_x + 1 and y == block_y:
-                    return True
-        return False
-
-    def can_place_block(self, x, y, orientation):
-        """Check if a block can be placed at the given position and orientation"""
-        if orientation == "horizontal":
-            # Check if both cells are within bounds
-            if y + 1 >= GRID_SIZE:
-                return False
-            # Check if either cell is blocked
-            if self.is_position_blocked((x, y)) or self.is_position_blocked((x, y + 1)):
-                return False
-            # Check if either cell is occupied by a player
-            if (x, y) == self.seeker1_pos or (x, y) == self.seeker2_pos:
-                return False
-            if (x, y + 1) == self.seeker1_pos or (x, y + 1) == self.seeker2_pos:
-                return False
-            # Check if either cell is a hiding spot
-            if (x, y) in self.hiding_spots or (x, y + 1) in self.hiding_spots:
-                return False
-            # Prevent blocking a gift box
-            if self.gift_box_location is not None:
-                if (x, y) == self.gift_box_location or (x, y + 1) == self.gift_box_location:
-                    return False
-        else:  # vertical
-            # Check if both cells are within bounds
-            if x + 1 >= GRID_SIZE:
-                return False
-            # Check if either cell is blocked
-            if self.is_position_blocked((x, y)) or self.is_position_blocked((x + 1, y)):
-                return False
-            # Check if either cell is occupied by a player
-            if (x, y) == self.seeker1_pos or (x, y) == self.seeker2_pos:
-                return False
-            if (x + 1, y) == self.seeker1_pos or (x + 1, y) == self.seeker2_pos:
-                return False
-            # Check if either cell is a hiding spot
-            if (x, y) in self.hiding_spots or (x + 1, y) in self.hiding_spots:
-                return False
-            # Prevent blocking a gift box
-            if self.gift_box_location is not None:
-                if (x, y) == self.gift_box_location or (x + 1, y) == self.gift_box_location:
-                    return False
-        # Prevent trapping a hiding spot in a corner with two blocks
-        # For each corner, if a hiding spot is there, check if this block would trap it
-        corners = [(0,0), (0,GRID_SIZE-1), (GRID_SIZE-1,0), (GRID_SIZE-1,GRID_SIZE-1)]
-        for hx, hy in self.hiding_spots:
-            if (hx, hy) in corners:
-                # For each corner, check the two adjacent cells
-                if (hx, hy) == (0,0):
-                    adj1 = (0,1)
-                    adj2 = (1,0)
-                elif (hx, hy) == (0,GRID_SIZE-1):
-                    adj1 = (0,GRID_SIZE-2)
-                    adj2 = (1,GRID_SIZE-1)
-                elif (hx, hy) == (GRID_SIZE-1,0):
-                    adj1 = (GRID_SIZE-2,0)
-                    adj2 = (GRID_SIZE-1,1)
-                elif (hx, hy) == (GRID_SIZE-1,GRID_SIZE-1):
-                    adj1 = (GRID_SIZE-2,GRID_SIZE-1)
-                    adj2 = (GRID_SIZE-1,GRID_SIZE-2)
-                # If this block would block either adjacent cell, and the other is already blocked, disallow
-                blocks_adj1 = self.is_position_blocked(adj1) or \
-                    ((orientation == "horizontal" and (x, y) == adj1) or (orientation == "vertical" and (x, y) == adj1))
-                blocks_adj2 = self.is_position_blocked(adj2) or \
-                    ((orientation == "horizontal" and (x, y) == adj2) or (orientation == "vertical" and (x, y) == adj2))
-                if blocks_adj1 and blocks_adj2:
-                    return False
+    def sprite(self, image, size):
+        """An image scaled to size, scaled on first use at that size"""
+        if image.get_size() == size:
+            return image
+        return self.scaled_sprites.get(image, size)
+
+    def handle_display_event(self, event):
+        """Follow window resizes and the fullscreen key, returns True if the event was one of them"""
+        if event.type == pygame.VIDEORESIZE:
+            if not screen.get_flags() & pygame.FULLSCREEN:
+                resize_window(event.w, event.h)
+        elif event.type == pygame.KEYDOWN and event.key == FULLSCREEN_KEY:
+            toggle_fullscreen()
+        else:
+            return False
+        self.fit_to_window()
         return True
 
-    def place_block(self, x, y, orientation, player):
-        """Place a block at the given position and orientation"""
-        if self.can_place_block(x, y, orientation):
-            self.blocks.append((x, y, orientation))
-            if player == 1:
-                self.player1_blocks_remaining -= 1
-            else:
-                self.player2_blocks_remaining -= 1
-            return True
-        return False
-
-    def a_star_distance(self, start, goal):
-        if start == goal:
-            return 0
-        open_set = [(0, start)]
-        g_score = {start: 0}
-        while open_set:
-            _, current = heapq.heappop(open_set)
-            if current == goal:
-                return g_score[current]
-            for dx, dy in [(0,1),(1,0),(0,-1),(-1,0)]:
-                neighbor = (current[0]+dx, current[1]+dy)
-                if 0 <= neighbor[0] < GRID_SIZE and 0 <= neighbor[1] < GRID_SIZE:
-                    # Check if the neighbor position is blocked
-                    if self.is_position_blocked(neighbor):
-                        continue
-                    temp = g_score[current] + 1
-                    if neighbor not in g_score or temp < g_score[neighbor]:
-                        g_score[neighbor] = temp
-                        f = temp + abs(neighbor[0]-goal[0]) + abs(neighbor[1]-goal[1])
-                        heapq.heappush(open_set, (f, neighbor))
-        return float('inf')
-
-    def get_feedback(self, distance):
-        if distance == 0:
-            return "FOUND"
-        elif distance <= 2:
-            return "BURNING"
-        elif distance <= 4:
-            return "HOT"
-        elif distance <= 6:
-            return "WARM"
-        elif distance <= 10:
-            return "COOL"
-        return "COLD"
-
-    def computer_move(self):
-        # Use difficulty to branch AI logic
-        if self.computer_difficulty == "normal":
-            # --- Move Target logic (same as hard mode) ---
-            if not self.player2_moved_target:
-                computer_dist = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
-                player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                if computer_dist > 6 and player_dist <= 4:
-                    self.move_target_to_new_location()
-                    self.player2_moved_target = True
-                    self.state = GameState.PLAYER1_TURN
-                    return
-            # --- Block placement logic (improved for normal mode) ---
-            player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-            computer_dist = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
-            
-            # --- Gift box logic: go for the gift if it helps ---
-            go_for_gift = False
-            if self.gift_box_location:
-                # Get path to gift and to Jerry
-                path_to_gift = self.a_star_path(self.seeker2_pos, self.gift_box_location)
-                path_to_jerry = self.a_star_path(self.seeker2_pos, self.hidden_pos)
-                # If the gift is on the way to Jerry, or if freezing the player would let computer win
-                player_path_to_jerry = self.a_star_path(self.seeker1_pos, self.hidden_pos)
-                if self.gift_box_location in path_to_jerry:
-                    go_for_gift = True
-                else:
-                    # If computer is behind, but freezing player would let it catch up or win
-                    if player_dist < computer_dist and (computer_dist - player_dist) <= 2:
-                        # Estimate: if player is frozen for 2 turns, computer can catch up
-                        go_for_gift = True
-            if go_for_gift:
-                # Move toward the gift box
-                path = self.a_star_path(self.seeker2_pos, self.gift_box_location)
-                if len(path) > 1:
-                    next_pos = path[1]
-                    dx = next_pos[0] - self.seeker2_pos[0]
-                    dy = next_pos[1] - self.seeker2_pos[1]
-                    if dx == -1:
-                        self.spike_direction = "up"
-                    elif dx == 1:
-                        self.spike_direction = "down"
-                    elif dy == -1:
-                        self.spike_direction = "left"
-                    elif dy == 1:
-                        self.spike_direction = "right"
-                    else:
-                        self.spike_direction = "idle"
-                    self.seeker2_pos = next_pos
-                    # Trigger gift box animation and freeze opponent immediately
-                    if self.seeker2_pos == self.gift_box_location:
-                        self.gift_box_popping = True
-                        self.gift_box_pop_position = self.gift_box_location
-                        self.gift_box_pop_frame_index = 0
-                        self.gift_box_pop_frame_timer = pygame.time.get_ticks()
-                        self.gift_box_location = None
-                        self.freeze_opponent(2)
-                    self.state = GameState.PLAYER1_TURN
-                    return
-            # --- Block placement logic for normal mode ---
-            should_place_block = False
-            if player_dist <= 5 and computer_dist > player_dist:
-                should_place_block = True
-            elif player_dist <= 3:
-                should_place_block = True
-            elif player_dist < computer_dist:
-                should_place_block = True
-
-            if should_place_block and self.player2_blocks_remaining > 0 and random.random() < 0.5:  # 50% chance for normal mode
-                if self.computer_place_block():
-                    self.state = GameState.PLAYER1_TURN
-                    return
-            # --- Movement logic: feedback-based ---
-            x, y = self.seeker2_pos
-            feedback_distance = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
-            prev_pos = getattr(self, '_prev_seeker2_pos', None)
-            best_moves = []
-            min_new_distance = feedback_distance
-            for dx, dy in [(0,1),(1,0),(0,-1),(-1,0)]:
-                nx, ny = x+dx, y+dy
-                if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-                    if self.is_position_blocked((nx, ny)):
-                        continue
-                    new_distance = self.a_star_distance((nx, ny), self.hidden_pos)
-                    if new_distance < min_new_distance:
-                        min_new_distance = new_distance
-                        best_moves = [(nx, ny)]
-                    elif new_distance == min_new_distance:
-                        best_moves.append((nx, ny))
-            # Prefer moves that decrease the distance
-            if best_moves and min_new_distance < feedback_distance:
-                chosen_move = random.choice(best_moves)
-            else:
-                # If no move decreases the distance, allow moves that keep the same distance, but avoid going back to previous position
-                same_dist_moves = []
-                for dx, dy in [(0,1),(1,0),(0,-1),(-1,0)]:
-                    nx, ny = x+dx, y+dy
-                    if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-                        if self.is_position_blocked((nx, ny)):
-                            continue
-                        if self.a_star_distance((nx, ny), self.hidden_pos) == feedback_distance:
-                            if prev_pos is None or (nx, ny) != prev_pos:
-                                same_dist_moves.append((nx, ny))
-                if same_dist_moves:
-                    chosen_move = random.choice(same_dist_moves)
-                else:
-                    # If stuck, just pick any valid move
-                    valid_moves = []
-                    for dx, dy in [(0,1),(1,0),(0,-1),(-1,0)]:
-                        nx, ny = x+dx, y+dy
-                        if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-                            if not self.is_position_blocked((nx, ny)):
-                                valid_moves.append((nx, ny))
-                    if valid_moves:
-                        chosen_move = random.choice(valid_moves)
-                    else:
-                        chosen_move = (x, y)
-            dx = chosen_move[0] - x
-            dy = chosen_move[1] - y
-            if dx == -1:
-                self.spike_direction = "up"
-            elif dx == 1:
-                self.spike_direction = "down"
-            elif dy == -1:
-                self.spike_direction = "left"
-            elif dy == 1:
-                self.spike_direction = "right"
-            else:
-                self.spike_direction = "idle"
-            self._prev_seeker2_pos = self.seeker2_pos
-            self.seeker2_pos = chosen_move
-            if self.seeker2_pos == self.hidden_pos:
-                self.winner = "Computer"
-                # debug_msg = f"DEBUG: last_game_mode={self.last_game_mode}, Computer score before={self.scores['Computer']}"
-                if self.last_game_mode == 'pvc':
-                    self.scores["Computer"] += 1
-                    # debug_msg += f", after={self.scores['Computer']}"
-                # self.debug_message = debug_msg
-                pygame.mixer.music.stop()
-                pygame.mixer.music.load("sound_track/lose.mp3")
-                pygame.mixer.music.play()
-                self.state = GameState.GAME_OVER
-            else:
-                self.state = GameState.PLAYER1_TURN
+    def fit_to_window(self):
+        """Fit the board viewport to the window, keeping the player's zoom relative to it"""
+        cell = board_cell_size()
+        zoom = self.camera.cell_size / self.base_cell_size
+        self.base_cell_size = cell
+        self.camera.resize((GRID_OFFSET_X, GRID_OFFSET_Y, WIDTH, HEIGHT), round(cell * zoom))
+
+    def follow_active_seeker(self):
+        """Point the camera at whoever's turn it is, unless the player panned away this turn"""
+        if self.state not in (GameState.PLAYER1_TURN, GameState.PLAYER2_TURN):
             return
-        # Hard: original logic
-        # First, decide if computer should use Move Target button
-        if not self.player2_moved_target:
-            computer_dist = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
-            player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-            
-            # Use Move Target if computer is far and player is getting close
-            if computer_dist > 6 and player_dist <= 4:
-                self.move_target_to_new_location()
-                self.player2_moved_target = True
-                self.state = GameState.PLAYER1_TURN
-                return
-        
-        # Decide whether to place a block or move
-        player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-        computer_dist = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
-        
-        # --- Gift box logic: go for the gift if it helps (hard mode) ---
-        go_for_gift = False
-        if self.gift_box_location:
-            path_to_gift = self.a_star_path(self.seeker2_pos, self.gift_box_location)
-            path_to_jerry = self.a_star_path(self.seeker2_pos, self.hidden_pos)
-            player_path_to_jerry = self.a_star_path(self.seeker1_pos, self.hidden_pos)
-            if self.gift_box_location in path_to_jerry:
-                go_for_gift = True
-            else:
-                if player_dist < computer_dist and (computer_dist - player_dist) <= 2:
-                    go_for_gift = True
-        if go_for_gift:
-            path = self.a_star_path(self.seeker2_pos, self.gift_box_location)
-            if len(path) > 1:
-                next_pos = path[1]
-                dx = next_pos[0] - self.seeker2_pos[0]
-                dy = next_pos[1] - self.seeker2_pos[1]
-                if dx == -1:
-                    self.spike_direction = "up"
-                elif dx == 1:
-                    self.spike_direction = "down"
-                elif dy == -1:
-                    self.spike_direction = "left"
-                elif dy == 1:
-                    self.spike_direction = "right"
-                else:
-                    self.spike_direction = "idle"
-                self.seeker2_pos = next_pos
-                # Trigger gift box animation and freeze opponent immediately
-                if self.seeker2_pos == self.gift_box_location:
-                    self.gift_box_popping = True
-                    self.gift_box_pop_position = self.gift_box_location
-                    self.gift_box_pop_frame_index = 0
-                    self.gift_box_pop_frame_timer = pygame.time.get_ticks()
-                    self.gift_box_location = None
-                    self.freeze_opponent(2)
-                self.state = GameState.PLAYER1_TURN
-                return
-        
-        # Enhanced block placement logic for hard mode
-        # More aggressive and strategic than normal mode
-        should_place_block = False
-        
-        # Condition 1: Player is close to Jerry and computer is farther
-        if player_dist <= 5 and computer_dist > player_dist:
-            should_place_block = True
-        
-        # Condition 2: Player is getting very close (within 3 steps)
-        elif player_dist <= 3:
-            should_place_block = True
-        
-        # Condition 3: Player is closer than computer by any margin
-        elif player_dist < computer_dist:
-            should_place_block = True
-        
-        # Condition 4: Strategic blocking - even if computer is closer, block to maintain advantage
-        elif computer_dist <= 4 and player_dist <= computer_dist + 2:
-            should_place_block = True
-        
-        # Higher probability and more aggressive for hard mode
-        if should_place_block and self.player2_blocks_remaining > 0 and random.random() < 0.9:
-            if self.computer_place_block():
-                self.state = GameState.PLAYER1_TURN
-                return
-        
-        # --- Block placement logic for normal mode ---
-        should_place_block = False
-        if player_dist <= 5 and computer_dist > player_dist:
-            should_place_block = True
-        elif player_dist <= 3:
-            should_place_block = True
-        elif player_dist < computer_dist:
-            should_place_block = True
-
-        if should_place_block and self.player2_blocks_remaining > 0 and random.random() < 0.5:  # 50% chance for normal mode
-            if self.computer_place_block():
-                self.state = GameState.PLAYER1_TURN
-                return
-        
-        # Regular movement logic
-        best_move = None
-        best_score = float('inf')
-        x, y = self.seeker2_pos
-        
-        # Consider both distance to Jerry and blocking player's path
-        for dx, dy in [(0,1),(1,0),(0,-1),(-1,0)]:
-            nx, ny = x+dx, y+dy
-            if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-                # Check if the move is blocked
-                if self.is_position_blocked((nx, ny)):
-                    continue
-                    
-                d = self.a_star_distance((nx, ny), self.hidden_pos)
-                
-                # Bonus score for moving towards Jerry
-                score = d
-                
-                # Consider blocking player's path if player is close to Jerry
-                player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                if player_dist <= 3:
-                    # Try to get closer to Jerry to compete
-                    score = d * 0.8  # Prioritize getting to Jerry
-                
-                if score < best_score:
-                    best_score = score
-                    best_move = (nx, ny)
-        
-        if best_move:
-            dx = best_move[0] - self.seeker2_pos[0]
-            dy = best_move[1] - self.seeker2_pos[1]
-            if dx == -1:
-                self.spike_direction = "up"
-            elif dx == 1:
-                self.spike_direction = "down"
-            elif dy == -1:
-                self.spike_direction = "left"
-            elif dy == 1:
-                self.spike_direction = "right"
-            else:
-                self.spike_direction = "idle"
-
-            self.seeker2_pos = best_move
-            if self.seeker2_pos == self.hidden_pos:
-                self.winner = "Computer"
-                #debug_msg = f"DEBUG: last_game_mode={self.last_game_mode}, Computer score before={self.scores['Computer']}"
-                if self.last_game_mode == 'pvc':
-                    self.scores["Computer"] += 1
-                    #debug_msg += f", after={self.scores['Computer']}"
-                #self.debug_message = debug_msg
-                pygame.mixer.music.stop()
-                pygame.mixer.music.load("sound_track/lose.mp3")
-                pygame.mixer.music.play()
-                self.state = GameState.GAME_OVER
-            else:
-                self.state = GameState.PLAYER1_TURN
+        if self.state != self.followed_turn:
+            self.followed_turn = self.state
+            self.camera.following = True
+        if self.camera.following:
+            self.camera.follow(self.seeker_pos(1 if self.state == GameState.PLAYER1_TURN else 2))
 
     def draw_grid(self):
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                rect = pygame.Rect(GRID_OFFSET_X + y * CELL_SIZE, GRID_OFFSET_Y + x * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+        cam = self.camera
+        self.follow_active_seeker()
+        self.timeline.update()
+        c = cam.cell_size
+        cell = (c, c)
+        assets = self.assets
+        # Only the cells inside the viewport are drawn, the rest are clipped away
+        screen.set_clip(cam.viewport)
+        first_row, end_row, first_col, end_col = cam.visible_range()
+        if c < LOD_CELL_SIZE and self.board_image is not None:
+            self.board_image.sync(self)
+            area = (first_col, first_row, end_col - first_col, end_row - first_row)
+            image = self.board_image.scaled("board", area, (area[2] * c, area[3] * c))
+            screen.blit(image, cam.cell_rect(first_row, first_col).topleft)
+            self.draw_block_preview()
+            screen.set_clip(None)
+            return
+        for x in range(first_row, end_row):
+            for y in range(first_col, end_col):
                 # pygame.draw.rect(screen, WHITE, rect)  # Removed to make background transparent
-                pygame.draw.rect(screen, BLACK, rect, 2)
+                pygame.draw.rect(screen, BLACK, cam.cell_rect(x, y), 2)
         
         # Draw cheese wedges for hiding spots (but not where players are standing)
+        cheese = self.sprite(assets.cheese_image, cell)
         for x, y in self.hiding_spots:
             # Only draw cheese if no player is on this spot
-            if (x, y) != self.seeker1_pos and (x, y) != self.seeker2_pos:
-                rect = pygame.Rect(GRID_OFFSET_X + y * CELL_SIZE, GRID_OFFSET_Y + x * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                screen.blit(self.cheese_image, rect.topleft)
+            if (x, y) != self.seeker1_pos and (x, y) != self.seeker2_pos and cam.is_visible(x, y):
+                screen.blit(cheese, cam.cell_rect(x, y).topleft)
         
-        # Draw animated gift box if present and not popping
-        if self.gift_box_location and not self.gift_box_popping:
-            gx, gy = self.gift_box_location
-            rect = pygame.Rect(GRID_OFFSET_X + gy * CELL_SIZE, GRID_OFFSET_Y + gx * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            now = pygame.time.get_ticks()
-            if now - self.gift_box_frame_timer > self.gift_box_frame_duration:
-                self.gift_box_frame_index = (self.gift_box_frame_index + 1) % len(self.gift_box_frames)
-                self.gift_box_frame_timer = now
-            current_frame = self.gift_box_frames[self.gift_box_frame_index]
-            screen.blit(current_frame, rect.topleft)
+        # Draw animated gift box if present
+        gift_frame = self.timeline.frame("gift_box")
+        if self.gift_box_location and gift_frame is not None and cam.is_visible(*self.gift_box_location):
+            current_frame = self.sprite(assets.gift_box_frames[gift_frame], cell)
+            screen.blit(current_frame, cam.cell_rect(*self.gift_box_location).topleft)
         
         # Draw player images (this will be on top of cheese if they're on a hiding spot)
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                rect = pygame.Rect(GRID_OFFSET_X + y * CELL_SIZE, GRID_OFFSET_Y + x * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                if (x, y) == self.seeker1_pos:
-                    if self.player1_frozen_turns > 0:
-                        screen.blit(self.tom_frozen_image, rect.topleft)
-                    elif self.player1_unfreezing:
-                        now = pygame.time.get_ticks()
-                        if now - self.player1_unfreeze_timer < self.unfreeze_anim_duration:
-                            jitter = self.unfreeze_anim_jitter
-                            offset_x = random.randint(-jitter, jitter)
-                            offset_y = random.randint(-jitter, jitter)
-                            screen.blit(self.tom_frozen_image, (rect.x + offset_x, rect.y + offset_y))
-                        else:
-                            self.player1_unfreezing = False
-                            self.tom_direction = "idle"
-                            screen.blit(self.tom_images[self.tom_direction], rect.topleft)
-                    else:
-                        screen.blit(self.tom_images[self.tom_direction], rect.topleft)
-                elif (x, y) == self.seeker2_pos:
-                    if self.player2_frozen_turns > 0:
-                        screen.blit(self.spike_frozen_image, rect.topleft)
-                    elif self.player2_unfreezing:
-                        now = pygame.time.get_ticks()
-                        if now - self.player2_unfreeze_timer < self.unfreeze_anim_duration:
-                            jitter = self.unfreeze_anim_jitter
-                            offset_x = random.randint(-jitter, jitter)
-                            offset_y = random.randint(-jitter, jitter)
-                            screen.blit(self.spike_frozen_image, (rect.x + offset_x, rect.y + offset_y))
-                        else:
-                            self.player2_unfreezing = False
-                            self.spike_direction = "idle"
-                            screen.blit(self.spike_images[self.spike_direction], rect.topleft)
-                    else:
-                        screen.blit(self.spike_images[self.spike_direction], rect.topleft)
-                if self.state == GameState.GAME_OVER and (x, y) == self.hidden_pos:
-                    screen.blit(self.jerry_image, rect.topleft)
+        pos1, pos2 = self.seeker_screen_cell(1), self.seeker_screen_cell(2)
+        if cam.is_visible(*pos1):
+            rect = cam.cell_rect(*pos1)
+            if self.player1_frozen_turns > 0:
+                screen.blit(self.sprite(assets.tom_frozen_image, cell), rect.topleft)
+            elif self.timeline.get("unfreeze1"):
+                jitter = self.unfreeze_anim_jitter
+                offset_x = random.randint(-jitter, jitter)
+                offset_y = random.randint(-jitter, jitter)
+                screen.blit(self.sprite(assets.tom_frozen_image, cell), (rect.x + offset_x, rect.y + offset_y))
+            else:
+                screen.blit(self.sprite(assets.tom_images[self.tom_direction], cell), rect.topleft)
+        if self.seeker2_pos != self.seeker1_pos and cam.is_visible(*pos2):
+            rect = cam.cell_rect(*pos2)
+            if self.player2_frozen_turns > 0:
+                screen.blit(self.sprite(assets.spike_frozen_image, cell), rect.topleft)
+            elif self.timeline.get("unfreeze2"):
+                jitter = self.unfreeze_anim_jitter
+                offset_x = random.randint(-jitter, jitter)
+                offset_y = random.randint(-jitter, jitter)
+                screen.blit(self.sprite(assets.spike_frozen_image, cell), (rect.x + offset_x, rect.y + offset_y))
+            else:
+                screen.blit(self.sprite(assets.spike_images[self.spike_direction], cell), rect.topleft)
+        if self.state == GameState.GAME_OVER and self.hidden_pos is not None and cam.is_visible(*self.hidden_pos):
+            screen.blit(self.sprite(assets.jerry_image, cell), cam.cell_rect(*self.hidden_pos).topleft)
         
         # Draw popping animation if active (on top of player)
-        if self.gift_box_popping and self.gift_box_pop_position:
-            gx, gy = self.gift_box_pop_position
-            rect = pygame.Rect(GRID_OFFSET_X + gy * CELL_SIZE, GRID_OFFSET_Y + gx * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            now = pygame.time.get_ticks()
-            if now - self.gift_box_pop_frame_timer > self.gift_box_pop_frame_duration:
-                self.gift_box_pop_frame_index += 1
-                self.gift_box_pop_frame_timer = now
-            if self.gift_box_pop_frame_index < len(self.gift_box_pop_frames):
-                current_frame = self.gift_box_pop_frames[self.gift_box_pop_frame_index]
-                screen.blit(current_frame, rect.topleft)
-            else:
-                # Animation finished, remove box
-                self.gift_box_popping = False
-                self.gift_box_pop_position = None
+        pop = self.timeline.get("gift_box_pop")
+        if pop is not None:
+            current_frame = self.sprite(assets.gift_box_pop_frames[pop.frame(self.timeline.time)], cell)
+            screen.blit(current_frame, cam.cell_rect(*pop.data["cell"]).topleft)
         
         # Draw blocks
         for block in self.blocks:
             x, y, orientation = block
             if orientation == "horizontal":
-                block_rect = pygame.Rect(GRID_OFFSET_X + y * CELL_SIZE, GRID_OFFSET_Y + x * CELL_SIZE, CELL_SIZE * 2, CELL_SIZE)
-                screen.blit(self.block_horizontal, block_rect.topleft)
+                if cam.is_visible(x, y, width=2):
+                    screen.blit(self.sprite(assets.block_horizontal, (c * 2, c)), cam.cell_rect(x, y).topleft)
             else:  # vertical
-                block_rect = pygame.Rect(GRID_OFFSET_X + y * CELL_SIZE, GRID_OFFSET_Y + x * CELL_SIZE, CELL_SIZE, CELL_SIZE * 2)
-                screen.blit(self.block_vertical, block_rect.topleft)
+                if cam.is_visible(x, y, height=2):
+                    screen.blit(self.sprite(assets.block_vertical, (c, c * 2)), cam.cell_rect(x, y).topleft)
         
         # Draw block preview
+        self.draw_block_preview()
+            # ✨ הצגת ג'רי רץ במיקום הישן 
+        running = self.timeline.get("jerry_running")
+        if running is not None:
+            current_frame = self.sprite(assets.jerry_running_frames[running.frame(self.timeline.time)], cell)
+            screen.blit(current_frame, cam.cell_rect(*running.data["cell"]).topleft)
+        screen.set_clip(None)
+
+    def seeker_screen_cell(self, player):
+        """Where to draw a seeker: between cells while it slides, on its cell otherwise"""
+        if self.seeker_slides is None or player not in self.seeker_slides:
+            return self.seeker_pos(player)
+        (px, py), (cx, cy) = self.seeker_slides[player]
+        a = self.render_alpha
+        return (px + (cx - px) * a, py + (cy - py) * a)
+
+    def slide_seekers(self):
+        """Move each seeker's on-screen cell a fixed distance per step towards its real cell"""
+        step = SIMULATION_STEP_MS / SEEKER_SLIDE_MS
+        for player in (1, 2):
+            target = self.seeker_pos(player)
+            current = self.seeker_slides.get(player, (target, target))[1]
+            dx, dy = target[0] - current[0], target[1] - current[1]
+            distance = abs(dx) + abs(dy)
+            # Longer jumps (a new round) are not animated
+            if distance <= step or distance > 1.5:
+                self.seeker_slides[player] = (current if distance <= step else target, target)
+            else:
+                self.seeker_slides[player] = (current, (current[0] + dx / distance * step,
+                                                        current[1] + dy / distance * step))
+
+    def simulation_step(self):
+        """Advance the game by one fixed step: frozen turns, the computer's turn and recording"""
+        if self.seeker_slides is not None:
+            self.slide_seekers()
+        # Handle freezing and skipping turns
+        if not self.skip_frozen_turn():
+            # --- Computer collects gift box logic ---
+            if self.state == GameState.PLAYER2_TURN and self.game_mode != 'pvp':
+                if self.gift_box_location and self.seeker2_pos == self.gift_box_location:
+                    self.collect_gift(2)
+
+            if self.state == GameState.PLAYER2_TURN and self.game_mode != 'pvp':
+                if not self.computer_thinking:
+                    self.computer_thinking = True
+                    self.computer_think_steps = 0
+                else:
+                    self.computer_think_steps += 1
+                    if self.computer_think_steps * SIMULATION_STEP_MS > COMPUTER_DELAY_MS:
+                        self.computer_move()
+                        self.computer_thinking = False
+
+        if self.recorder is not None and self.state != GameState.MENU:
+            self.recorder.record(self)
+
+    def advance(self, elapsed_ms):
+        """Run the simulation steps that elapsed_ms of wall time pays for
+
+        Returns how far the game is into the next step, from 0 to 1, for
+        drawing between the last two steps. Headless code can call
+        simulation_step directly, as fast as it likes.
+        """
+        self.simulation_lag = min(self.simulation_lag + elapsed_ms, MAX_CATCH_UP_MS)
+        while self.simulation_lag >= SIMULATION_STEP_MS:
+            self.simulation_step()
+            self.simulation_lag -= SIMULATION_STEP_MS
+        return self.simulation_lag / SIMULATION_STEP_MS
+
+    def draw_block_preview(self):
+        cam = self.camera
         if self.block_placement_mode and self.block_preview_pos is not None:
             x, y = self.block_preview_pos
             preview_color = GREEN if self.block_preview_valid else RED
             
             if self.block_orientation == "horizontal":
                 # Draw preview rectangle for horizontal block
-                preview_rect = pygame.Rect(GRID_OFFSET_X + y * CELL_SIZE, GRID_OFFSET_Y + x * CELL_SIZE, CELL_SIZE * 2, CELL_SIZE)
-                pygame.draw.rect(screen, preview_color, preview_rect, 3)
-                # Draw semi-transparent overlay
-                preview_surface = pygame.Surface((CELL_SIZE * 2, CELL_SIZE))
-                preview_surface.set_alpha(100)
-                preview_surface.fill(preview_color)
-                screen.blit(preview_surface, preview_rect.topleft)
+                preview_rect = cam.cell_rect(x, y, width=2)
             else:  # vertical
                 # Draw preview rectangle for vertical block
-                preview_rect = pygame.Rect(GRID_OFFSET_X + y * CELL_SIZE, GRID_OFFSET_Y + x * CELL_SIZE, CELL_SIZE, CELL_SIZE * 2)
-                pygame.draw.rect(screen, preview_color, preview_rect, 3)
-                # Draw semi-transparent overlay
-                preview_surface = pygame.Surface((CELL_SIZE, CELL_SIZE * 2))
-                preview_surface.set_alpha(100)
-                preview_surface.fill(preview_color)
-                screen.blit(preview_surface, preview_rect.topleft)
-            # ✨ הצגת ג'רי רץ במיקום הישן 
-        if self.show_jerry_running and self.jerry_running_pos:
-            if pygame.time.get_ticks() - self.jerry_running_start_time < 1100:
-                now = pygame.time.get_ticks()
-                if now - self.jerry_running_frame_timer > self.jerry_running_frame_duration:
-                    if self.jerry_running_frame_index < len(self.jerry_running_frames) - 1:
-                        self.jerry_running_frame_index += 1
-                    self.jerry_running_frame_timer = now
-
-                x, y = self.jerry_running_pos
-                rect = pygame.Rect(
-                    GRID_OFFSET_X + y * CELL_SIZE, 
-                    GRID_OFFSET_Y + x * CELL_SIZE, 
-                    CELL_SIZE, CELL_SIZE
-                )
-                current_frame = self.jerry_running_frames[self.jerry_running_frame_index]
-                screen.blit(current_frame, rect.topleft)
-            else:
-                self.show_jerry_running = False
-
+                preview_rect = cam.cell_rect(x, y, height=2)
+            pygame.draw.rect(screen, preview_color, preview_rect, 3)
+            # Draw semi-transparent overlay
+            preview_surface = pygame.Surface(preview_rect.size)
+            preview_surface.set_alpha(100)
+            preview_surface.fill(preview_color)
+            screen.blit(preview_surface, preview_rect.topleft)
+
+
+    def draw_minimap(self, topleft):
+        """Whole board in the side panel with the camera's view outlined, when it does not fit the viewport"""
+        cam = self.camera
+        if self.board_image is None or cam.visible_range() == (0, self.grid_size, 0, self.grid_size):
+            return
+        self.board_image.sync(self)
+        n = self.grid_size
+        rect = pygame.Rect(topleft, (MINIMAP_SIZE, MINIMAP_SIZE))
+        screen.blit(self.board_image.scaled("minimap", (0, 0, n, n), rect.size), rect.topleft)
+        board = n * cam.cell_size
+        view = pygame.Rect(rect.x + cam.offset_x * MINIMAP_SIZE // board, rect.y + cam.offset_y * MINIMAP_SIZE // board,
+                           max(2, cam.viewport.width * MINIMAP_SIZE // board),
+                           max(2, cam.viewport.height * MINIMAP_SIZE // board))
+        # Seekers are dots on top, a single cell can vanish when a large board is scaled down
+        for pos, color in ((self.seeker2_pos, board_image.SPIKE), (self.seeker1_pos, board_image.TOM)):
+            pygame.draw.circle(screen, color, (rect.x + (pos[1] * 2 + 1) * MINIMAP_SIZE // (2 * n),
+                                               rect.y + (pos[0] * 2 + 1) * MINIMAP_SIZE // (2 * n)), 3)
+        pygame.draw.rect(screen, RED, view.clip(rect), 1)
+        pygame.draw.rect(screen, BLACK, rect.inflate(4, 4), 2)
 
     def draw_animated_background(self):
         screen.fill((230, 230, 255))  
@@ -957,15 +735,20 @@ class HideSeekGame:
         button_height = 38
         button_spacing = 12
         # Main Menu button (leftmost)
-        self.main_menu_button = pygame.Rect(24, button_y, button_width, button_height)
-        pygame.draw.rect(screen, (200, 200, 255), self.main_menu_button, border_radius=8)
-        pygame.draw.rect(screen, BLACK, self.main_menu_button, 3, border_radius=8)
-        menu_text = self.font.render("Main Menu", True, (0, 0, 0))
-        menu_rect = menu_text.get_rect(center=self.main_menu_button.center)
-        screen.blit(menu_text, menu_rect)
+        if self.has_main_menu:
+            self.main_menu_button = pygame.Rect(24, button_y, button_width, button_height)
+            pygame.draw.rect(screen, (200, 200, 255), self.main_menu_button, border_radius=8)
+            pygame.draw.rect(screen, BLACK, self.main_menu_button, 3, border_radius=8)
+            menu_text = self.font.render("Main Menu", True, (0, 0, 0))
+            menu_rect = menu_text.get_rect(center=self.main_menu_button.center)
+            screen.blit(menu_text, menu_rect)
+            next_x = 24 + button_width + button_spacing
+        else:
+            self.main_menu_button = None
+            next_x = 24
         # Next Round button (to the right of Main Menu), only show if game is over
         if self.state == GameState.GAME_OVER:
-            self.next_round_button = pygame.Rect(24 + button_width + button_spacing, button_y, button_width, button_height)
+            self.next_round_button = pygame.Rect(next_x, button_y, button_width, button_height)
             pygame.draw.rect(screen, (200, 200, 255), self.next_round_button, border_radius=8)
             pygame.draw.rect(screen, BLACK, self.next_round_button, 3, border_radius=8)
             next_text = self.font.render("Next Round", True, (0, 0, 0))
@@ -989,7 +772,9 @@ class HideSeekGame:
         line_height = 32
         if self.state == GameState.PLAYER1_TURN or self.state == GameState.PLAYER2_TURN:
             # Show distance to Jerry for both players
-            if self.hidden_pos is not None:
+            # (not against the fair computer, where both sides only get the feedback)
+            fair_round = self.game_mode == 'pvc' and self.computer_difficulty == "fair"
+            if self.hidden_pos is not None and not fair_round:
                 dist1 = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
                 dist2 = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
                 screen.blit(self.font.render(f"Tom -> Jerry: {dist1} steps", True, BLACK), (ui_x, ui_y))
@@ -1049,12 +834,13 @@ class HideSeekGame:
             else:
                 self.place_block_button = None
         # Feedback image and game over text remain on the right
-        if self.feedback_text in self.feedback_images:
-            screen.blit(self.feedback_images[self.feedback_text], (ui_x, WINDOW_HEIGHT - 240))
+        if self.feedback_text in self.assets.feedback_images:
+            screen.blit(self.assets.feedback_images[self.feedback_text], (ui_x, WINDOW_HEIGHT - 240))
+        self.draw_minimap((ui_x, WINDOW_HEIGHT - 250 - MINIMAP_SIZE))
 
         # Allow clicking main menu anytime
         mouse_pressed = pygame.mouse.get_pressed()
-        if mouse_pressed[0] and self.main_menu_button.collidepoint(pygame.mouse.get_pos()):
+        if mouse_pressed[0] and self.main_menu_button and self.main_menu_button.collidepoint(pygame.mouse.get_pos()):
             pygame.mixer.music.stop()
             self.state = GameState.MENU
             self.show_title_screen()
@@ -1072,277 +858,72 @@ class HideSeekGame:
 
         # --- Display debug message if present ---
         if hasattr(self, 'debug_message') and self.debug_message:
-            debug_font = pygame.font.SysFont("Consolas", 22)
+            debug_font = get_font(22, "Consolas")
             debug_text = debug_font.render(self.debug_message, True, (200, 0, 0))
             screen.blit(debug_text, (40, 80))
 
-    def move_target_to_new_location(self):
-        """Move Jerry to a new random hiding location, but never to a position where a player is standing"""
-        if self.hiding_spots:
-            self.jerry_running_pos = self.hidden_pos
-            self.show_jerry_running = True
-            self.jerry_running_start_time = pygame.time.get_ticks()
-            self.jerry_running_frame_index = 0
-            self.jerry_running_frame_timer = pygame.time.get_ticks()
-
-            # Choose a new location different from current and not occupied by a player
-            possible_spots = [pos for pos in self.hiding_spots if pos != self.hidden_pos and pos != self.seeker1_pos and pos != self.seeker2_pos]
-            if not possible_spots:
-                # If all other spots are occupied, fallback to any spot not occupied by a player
-                possible_spots = [pos for pos in self.hiding_spots if pos != self.seeker1_pos and pos != self.seeker2_pos]
-            if possible_spots:
-                new_pos = random.choice(possible_spots)
-                self.hidden_pos = new_pos
-            # Update feedback for current player
-            if self.state == GameState.PLAYER1_TURN:
-                dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                self.feedback_text = self.get_feedback(dist)
-            elif self.state == GameState.PLAYER2_TURN:
-                dist = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
-                self.feedback_text = self.get_feedback(dist)
-
-    def start_game(self):
+    def start_game(self, layout=None, hidden_pos=None):
         pygame.mixer.music.load("sound_track/backgroud_music.mp3")
         pygame.mixer.music.play(-1) 
-        self.generate_hiding_spots()
-        self.hidden_pos = random.choice(self.hiding_spots)
-        self.seeker1_pos = (0, 0)
-        self.seeker2_pos = (GRID_SIZE - 1, GRID_SIZE - 1)
-        self.feedback_text = ""
-        self.winner = None
-        self.tom_direction = "idle"
-        self.spike_direction = "idle"
-        self.state = GameState.PLAYER1_TURN
-        self.player1_moved_target = False
-        self.player2_moved_target = False
-        # Reset block system
-        self.blocks = []
-        self.player1_blocks_remaining = 1
-        self.player2_blocks_remaining = 1
+        self.reset_round(layout, hidden_pos)
         self.block_placement_mode = False
         self.block_orientation = "horizontal"
         self.block_preview_pos = None
         self.block_preview_valid = False
-        # Reset freeze state
-        self.player1_frozen_turns = 0
-        self.player2_frozen_turns = 0
-        self.player1_unfreezing = False
-        self.player2_unfreezing = False
-        self.player1_unfreeze_timer = 0
-        self.player2_unfreeze_timer = 0
+        # Reset unfreeze animation
+        self.timeline.stop("unfreeze1")
+        self.timeline.stop("unfreeze2")
         # Reset gift box animation
-        self.gift_box_frame_index = 0
-        self.gift_box_frame_timer = pygame.time.get_ticks()
-        # Track last game mode for score display (always set to current game mode)
-        if self.game_mode:
-            self.last_game_mode = self.game_mode
-
-    def computer_place_block(self):
-        """Computer places a block strategically to interfere with player's path"""
-        if self.player2_blocks_remaining <= 0:
-            return False
-            
-        player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-        computer_dist = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
-        
-        # Only place block if player is closer to Jerry than computer
-        if player_dist >= computer_dist:
-            return False
-        
-        # For normal mode, be more aggressive with block placement
-        # Lower the threshold for "significant impact"
-        min_impact = 1 if self.computer_difficulty == "normal" else 1  # Hard mode can also place blocks with 1-step impact
-        
-        # Try to block the player's path
-        best_block = None
-        best_impact = 0
-        best_score = -1  # Higher score is better
-        
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                # Try horizontal block
-                if self.can_place_block(x, y, "horizontal"):
-                    # Check if this block would block the player's path
-                    old_player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                    old_computer_dist = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
-                    
-                    # Temporarily place block
-                    self.blocks.append((x, y, "horizontal"))
-                    new_player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                    new_computer_dist = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
-                    self.blocks.pop()  # Remove temporary block
-                    
-                    # Calculate impact (how much it increases player's path)
-                    player_impact = new_player_dist - old_player_dist
-                    computer_impact = new_computer_dist - old_computer_dist
-                    
-                    # Score this block placement
-                    # Higher score if it blocks player more and doesn't block computer
-                    score = player_impact * 2 - computer_impact
-                    
-                    # Hard mode gets bonus for strategic positioning
-                    if self.computer_difficulty == "hard" and self.hidden_pos is not None:
-                        # Bonus for significant impact
-                        if player_impact >= 3:
-                            score += 2
-                        # Bonus for blocking close to Jerry
-                        target_dist = abs(x - self.hidden_pos[0]) + abs(y - self.hidden_pos[1])
-                        if target_dist <= 2:
-                            score += 1
-                    
-                    if player_impact > best_impact and new_player_dist != float('inf') and score > best_score:
-                        best_impact = player_impact
-                        best_score = score
-                        best_block = (x, y, "horizontal")
-                
-                # Try vertical block
-                if self.can_place_block(x, y, "vertical"):
-                    # Check if this block would block the player's path
-                    old_player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                    old_computer_dist = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
-                    
-                    # Temporarily place block
-                    self.blocks.append((x, y, "vertical"))
-                    new_player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                    new_computer_dist = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
-                    self.blocks.pop()  # Remove temporary block
-                    
-                    # Calculate impact (how much it increases player's path)
-                    player_impact = new_player_dist - old_player_dist
-                    computer_impact = new_computer_dist - old_computer_dist
-                    
-                    # Score this block placement
-                    # Higher score if it blocks player more and doesn't block computer
-                    score = player_impact * 2 - computer_impact
-                    
-                    # Hard mode gets bonus for strategic positioning
-                    if self.computer_difficulty == "hard" and self.hidden_pos is not None:
-                        # Bonus for significant impact
-                        if player_impact >= 3:
-                            score += 2
-                        # Bonus for blocking close to Jerry
-                        target_dist = abs(x - self.hidden_pos[0]) + abs(y - self.hidden_pos[1])
-                        if target_dist <= 2:
-                            score += 1
-                    
-                    if player_impact > best_impact and new_player_dist != float('inf') and score > best_score:
-                        best_impact = player_impact
-                        best_score = score
-                        best_block = (x, y, "vertical")
-        
-        # Place the best block if it has significant impact
-        if best_block and best_impact >= min_impact:
-            x, y, orientation = best_block
-            self.place_block(x, y, orientation, 2)
-            return True
-        
-        # If no good strategic block found, try to block on the player's likely path
-        player_path = self.get_player_likely_path()
-        if len(player_path) > 1:  # If we have a path to block
-            # Try to block on the next few steps of the player's path
-            for i in range(1, min(4, len(player_path))):  # Look at next 3 steps
-                path_pos = player_path[i]
-                # Try horizontal block on path
-                if self.can_place_block(path_pos[0], path_pos[1], "horizontal"):
-                    # Check if this actually blocks the player's path
-                    old_player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                    self.blocks.append((path_pos[0], path_pos[1], "horizontal"))
-                    new_player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                    self.blocks.pop()
-                    if new_player_dist > old_player_dist and new_player_dist != float('inf'):
-                        self.place_block(path_pos[0], path_pos[1], "horizontal", 2)
-                        return True
-                # Try vertical block on path
-                if self.can_place_block(path_pos[0], path_pos[1], "vertical"):
-                    # Check if this actually blocks the player's path
-                    old_player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                    self.blocks.append((path_pos[0], path_pos[1], "vertical"))
-                    new_player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                    self.blocks.pop()
-                    if new_player_dist > old_player_dist and new_player_dist != float('inf'):
-                        self.place_block(path_pos[0], path_pos[1], "vertical", 2)
-                        return True
-        
-        # Fallback: try to block near the player's current position
-        if player_dist <= 4:  # Increased range for normal mode
-            # Try to block in the direction the player is likely to move
-            for dx, dy in [(0,1),(1,0),(0,-1),(-1,0)]:
-                nx, ny = self.seeker1_pos[0] + dx, self.seeker1_pos[1] + dy
-                if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
-                    # Try horizontal block near player
-                    if self.can_place_block(nx, ny, "horizontal"):
-                        # Check if this actually blocks the player's path
-                        old_player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                        self.blocks.append((nx, ny, "horizontal"))
-                        new_player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                        self.blocks.pop()
-                        if new_player_dist > old_player_dist and new_player_dist != float('inf'):
-                            self.place_block(nx, ny, "horizontal", 2)
-                            return True
-                    # Try vertical block near player
-                    if self.can_place_block(nx, ny, "vertical"):
-                        # Check if this actually blocks the player's path
-                        old_player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                        self.blocks.append((nx, ny, "vertical"))
-                        new_player_dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                        self.blocks.pop()
-                        if new_player_dist > old_player_dist and new_player_dist != float('inf'):
-                            self.place_block(nx, ny, "vertical", 2)
-                            return True
-        
-        return False
-
-    def get_player_likely_path(self):
-        """Get the likely path the player will take to reach Jerry"""
-        if not hasattr(self, '_player_path_cache') or self._player_path_cache[0] != (self.seeker1_pos, self.hidden_pos):
-            # Use A* to find the shortest path from player to Jerry
-            path = self.a_star_path(self.seeker1_pos, self.hidden_pos)
-            self._player_path_cache = ((self.seeker1_pos, self.hidden_pos), path)
-        return self._player_path_cache[1]
-
-    def a_star_path(self, start, goal):
-        """A* algorithm that returns the actual path, not just distance"""
-        if start == goal:
-            return [start]
-        
-        open_set = [(0, start)]
-        came_from = {}
-        g_score = {start: 0}
-        f_score = {start: abs(start[0]-goal[0]) + abs(start[1]-goal[1])}
-        
-        while open_set:
-            _, current = heapq.heappop(open_set)
-            if current == goal:
-                # Reconstruct path
-                path = []
-                while current in came_from:
-                    path.append(current)
-                    current = came_from[current]
-                path.append(start)
-                path.reverse()
-                return path
-            
-            for dx, dy in [(0,1),(1,0),(0,-1),(-1,0)]:
-                neighbor = (current[0]+dx, current[1]+dy)
-                if 0 <= neighbor[0] < GRID_SIZE and 0 <= neighbor[1] < GRID_SIZE:
-                    if self.is_position_blocked(neighbor):
-                        continue
-                    
-                    temp_g_score = g_score[current] + 1
-                    if neighbor not in g_score or temp_g_score < g_score[neighbor]:
-                        came_from[neighbor] = current
-                        g_score[neighbor] = temp_g_score
-                        f_score[neighbor] = temp_g_score + abs(neighbor[0]-goal[0]) + abs(neighbor[1]-goal[1])
-                        heapq.heappush(open_set, (f_score[neighbor], neighbor))
-        
-        return []  # No path found
+        self.timeline.start("gift_box", GIFT_BOX_FRAME_COUNT, self.gift_box_frame_duration, loop=True)
+
+    def cell_at(self, pos):
+        """Grid cell under a screen position, or None off the grid"""
+        return self.camera.cell_at(pos)
+
+    def update_block_preview(self, pos):
+        """Follow the mouse with the block preview while placing a block"""
+        if self.block_placement_mode:
+            self.block_preview_pos = self.cell_at(pos)
+            if self.block_preview_pos is not None:
+                self.block_preview_valid = self.legal_placement(*self.block_preview_pos, self.block_orientation)
+
+    def on_gift_collected(self, player, pos):
+        # Trigger gift box pop animation
+        self.timeline.start("gift_box_pop", len(self.assets.gift_box_pop_frames), self.gift_box_pop_frame_duration, cell=pos)
+
+    def on_target_moved(self, old_pos):
+        # Show Jerry running away from his old spot
+        self.timeline.start("jerry_running", len(self.assets.jerry_running_frames), self.jerry_running_frame_duration,
+                            duration=self.jerry_running_duration, cell=old_pos)
+
+    def on_unfrozen(self, player):
+        # Shake off the ice, then stand idle
+        if player == 1:
+            self.tom_direction = "idle"
+        else:
+            self.spike_direction = "idle"
+        self.timeline.start(f"unfreeze{player}", duration=self.unfreeze_anim_duration)
+
+    def on_round_over(self, player):
+        pygame.mixer.music.stop()
+        if player == 1:
+            pygame.mixer.music.load("sound_track/win.wav")
+        elif self.game_mode == 'pvp':
+            pygame.mixer.music.load("sound_track/spike_win.wav")
+        else:
+            pygame.mixer.music.load("sound_track/lose.mp3")
+        pygame.mixer.music.play()
 
     def run(self):
         self.show_title_screen()
         running = True
         player_turn = 1  # 1 for Tom, 2 for Spike (in PvP)
+        self.seeker_slides = {}
+        elapsed = self.clock.tick()
         while running:
             for event in pygame.event.get():
+                if self.handle_display_event(event):
+                    continue
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
@@ -1357,116 +938,21 @@ class HideSeekGame:
                         if event.key == pygame.K_r:
                             self.block_orientation = "vertical" if self.block_orientation == "horizontal" else "horizontal"
                         # Movement with block checking
-                        x, y = self.seeker1_pos
-                        moved = False
-                        if event.key == pygame.K_UP and x > 0:
-                            new_pos = (x - 1, y)
-                            if not self.is_position_blocked(new_pos):
-                                self.seeker1_pos = new_pos
-                                self.tom_direction = "up"
-                                moved = True
-                        elif event.key == pygame.K_DOWN and x < GRID_SIZE - 1:
-                            new_pos = (x + 1, y)
-                            if not self.is_position_blocked(new_pos):
-                                self.seeker1_pos = new_pos
-                                self.tom_direction = "down"
-                                moved = True
-                        elif event.key == pygame.K_LEFT and y > 0:
-                            new_pos = (x, y - 1)
-                            if not self.is_position_blocked(new_pos):
-                                self.seeker1_pos = new_pos
-                                self.tom_direction = "left"
-                                moved = True
-                        elif event.key == pygame.K_RIGHT and y < GRID_SIZE - 1:
-                            new_pos = (x, y + 1)
-                            if not self.is_position_blocked(new_pos):
-                                self.seeker1_pos = new_pos
-                                self.tom_direction = "right"
-                                moved = True
-                        if moved:
-                            # Check for gift box collection
-                            if self.gift_box_location and self.seeker1_pos == self.gift_box_location:
-                                self.gift_box_popping = True
-                                self.gift_box_pop_position = self.gift_box_location
-                                self.gift_box_pop_frame_index = 0
-                                self.gift_box_pop_frame_timer = pygame.time.get_ticks()
-                                self.gift_box_location = None
-                                self.freeze_opponent(1)
-                            if self.seeker1_pos == self.hidden_pos:
-                                self.winner = "Tom (Player 1)"
-                                if self.last_game_mode == 'pvp':
-                                    self.scores["Tom"] += 1
-                                else:
-                                    self.scores["Tom"] += 1
-                                pygame.mixer.music.stop()
-                                pygame.mixer.music.load("sound_track/win.wav")
-                                pygame.mixer.music.play()
-                                self.state = GameState.GAME_OVER
-                            else:
-                                dist = self.a_star_distance(self.seeker1_pos, self.hidden_pos)
-                                self.feedback_text = self.get_feedback(dist)
-                                if self.game_mode == 'pvp':
-                                    self.state = GameState.PLAYER2_TURN
-                                else:
-                                    self.state = GameState.PLAYER2_TURN
+                        if event.key in PLAYER1_KEYS:
+                            self.move_seeker(1, PLAYER1_KEYS[event.key])
                     elif self.state == GameState.PLAYER2_TURN:
                         if self.game_mode == 'pvp':
                             # Block rotation
                             if event.key == pygame.K_r:
                                 self.block_orientation = "vertical" if self.block_orientation == "horizontal" else "horizontal"
                             # Movement with block checking
-                            x, y = self.seeker2_pos
-                            moved = False
-                            if event.key == pygame.K_w and x > 0:
-                                new_pos = (x - 1, y)
-                                if not self.is_position_blocked(new_pos):
-                                    self.seeker2_pos = new_pos
-                                    self.spike_direction = "up"
-                                    moved = True
-                            elif event.key == pygame.K_s and x < GRID_SIZE - 1:
-                                new_pos = (x + 1, y)
-                                if not self.is_position_blocked(new_pos):
-                                    self.seeker2_pos = new_pos
-                                    self.spike_direction = "down"
-                                    moved = True
-                            elif event.key == pygame.K_a and y > 0:
-                                new_pos = (x, y - 1)
-                                if not self.is_position_blocked(new_pos):
-                                    self.seeker2_pos = new_pos
-                                    self.spike_direction = "left"
-                                    moved = True
-                            elif event.key == pygame.K_d and y < GRID_SIZE - 1:
-                                new_pos = (x, y + 1)
-                                if not self.is_position_blocked(new_pos):
-                                    self.seeker2_pos = new_pos
-                                    self.spike_direction = "right"
-                                    moved = True
-                            if moved:
-                                # Check for gift box collection
-                                if self.gift_box_location and self.seeker2_pos == self.gift_box_location:
-                                    self.gift_box_popping = True
-                                    self.gift_box_pop_position = self.gift_box_location
-                                    self.gift_box_pop_frame_index = 0
-                                    self.gift_box_pop_frame_timer = pygame.time.get_ticks()
-                                    self.gift_box_location = None
-                                    self.freeze_opponent(2)
-                                if self.seeker2_pos == self.hidden_pos:
-                                    self.winner = "Spike (Player 2)"
-                                    if self.last_game_mode == 'pvp':
-                                        self.scores["Spike"] += 1
-                                    elif self.last_game_mode == 'pvc':
-                                        self.scores["Computer"] += 1
-                                    pygame.mixer.music.stop()
-                                    if self.game_mode == 'pvp':
-                                        pygame.mixer.music.load("sound_track/spike_win.wav")
-                                    else:
-                                        pygame.mixer.music.load("sound_track/lose.mp3")
-                                    pygame.mixer.music.play()
-                                    self.state = GameState.GAME_OVER
-                                else:
-                                    dist = self.a_star_distance(self.seeker2_pos, self.hidden_pos)
-                                    self.feedback_text = self.get_feedback(dist)
-                                    self.state = GameState.PLAYER1_TURN
+                            if event.key in PLAYER2_KEYS:
+                                self.move_seeker(2, PLAYER2_KEYS[event.key])
+                elif event.type == pygame.MOUSEWHEEL:
+                    if self.state != GameState.MENU:
+                        self.camera.zoom(event.y, pygame.mouse.get_pos())
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button != 1:
+                    pass  # the wheel zooms and the right button drags the board
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if  self.next_round_button and self.next_round_button.collidepoint(event.pos):
                         self.start_game()
@@ -1476,92 +962,34 @@ class HideSeekGame:
                         self.state = GameState.MENU
                         self.show_title_screen()    
                     elif self.move_target_button and self.move_target_button.collidepoint(event.pos):
+                        # Moving Jerry ends the current player's turn
                         if self.state == GameState.PLAYER1_TURN and not self.player1_moved_target:
-                            self.move_target_to_new_location()
-                            self.player1_moved_target = True
-                            # End turn and switch to player 2
-                            if self.game_mode == 'pvp':
-                                self.state = GameState.PLAYER2_TURN
-                            else:
-                                self.state = GameState.PLAYER2_TURN
+                            self.use_move_target(1)
                         elif self.state == GameState.PLAYER2_TURN and not self.player2_moved_target:
-                            self.move_target_to_new_location()
-                            self.player2_moved_target = True
-                            # End turn and switch to player 1
-                            self.state = GameState.PLAYER1_TURN
+                            self.use_move_target(2)
                     elif self.place_block_button and self.place_block_button.collidepoint(event.pos):
                         # Enter block placement mode
                         self.block_placement_mode = True
                     elif self.block_placement_mode:
                         # Handle block placement
-                        mouse_x, mouse_y = event.pos
-                        if mouse_x >= GRID_OFFSET_X and mouse_y >= GRID_OFFSET_Y:  # Click is on the grid
-                            grid_x = (mouse_y - GRID_OFFSET_Y) // CELL_SIZE
-                            grid_y = (mouse_x - GRID_OFFSET_X) // CELL_SIZE
-                            if 0 <= grid_x < GRID_SIZE and 0 <= grid_y < GRID_SIZE:
-                                current_player = 1 if self.state == GameState.PLAYER1_TURN else 2
-                                if self.place_block(grid_x, grid_y, self.block_orientation, current_player):
-                                    self.block_placement_mode = False
-                                    self.block_preview_pos = None
-                                    # End turn after placing block
-                                    if self.game_mode == 'pvp':
-                                        if self.state == GameState.PLAYER1_TURN:
-                                            self.state = GameState.PLAYER2_TURN
-                                        else:
-                                            self.state = GameState.PLAYER1_TURN
-                                    else:
-                                        if self.state == GameState.PLAYER1_TURN:
-                                            self.state = GameState.PLAYER2_TURN
-                elif event.type == pygame.MOUSEMOTION:
-                    # Update block preview position
-                    if self.block_placement_mode:
-                        mouse_x, mouse_y = event.pos
-                        if mouse_x >= GRID_OFFSET_X and mouse_y >= GRID_OFFSET_Y:  # Mouse is on the grid
-                            grid_x = (mouse_y - GRID_OFFSET_Y) // CELL_SIZE
-                            grid_y = (mouse_x - GRID_OFFSET_X) // CELL_SIZE
-                            if 0 <= grid_x < GRID_SIZE and 0 <= grid_y < GRID_SIZE:
-                                self.block_preview_pos = (grid_x, grid_y)
-                                self.block_preview_valid = self.can_place_block(grid_x, grid_y, self.block_orientation)
-                            else:
+                        cell = self.cell_at(event.pos)
+                        if cell is not None:
+                            current_player = 1 if self.state == GameState.PLAYER1_TURN else 2
+                            if self.place_block(cell[0], cell[1], self.block_orientation, current_player):
+                                self.block_placement_mode = False
                                 self.block_preview_pos = None
-                        else:
-                            self.block_preview_pos = None
-
-            # Handle freezing and skipping turns
-            # Player 1 frozen logic
-            if self.state == GameState.PLAYER1_TURN and self.player1_frozen_turns > 0:
-                self.player1_frozen_turns -= 1
-                if self.player1_frozen_turns == 0:
-                    self.player1_unfreezing = True
-                    self.player1_unfreeze_timer = pygame.time.get_ticks()
-                self.state = GameState.PLAYER2_TURN if self.game_mode == 'pvp' else GameState.PLAYER2_TURN
-                continue
-            # Player 2 frozen logic
-            if self.state == GameState.PLAYER2_TURN and self.player2_frozen_turns > 0:
-                self.player2_frozen_turns -= 1
-                if self.player2_frozen_turns == 0:
-                    self.player2_unfreezing = True
-                    self.player2_unfreeze_timer = pygame.time.get_ticks()
-                self.state = GameState.PLAYER1_TURN
-                continue
-
-            # --- Computer collects gift box logic ---
-            if self.state == GameState.PLAYER2_TURN and self.game_mode != 'pvp':
-                if self.gift_box_location and self.seeker2_pos == self.gift_box_location:
-                    self.gift_box_popping = True
-                    self.gift_box_pop_position = self.gift_box_location
-                    self.gift_box_pop_frame_index = 0
-                    self.gift_box_pop_frame_timer = pygame.time.get_ticks()
-                    self.gift_box_location = None
-                    self.freeze_opponent(2)
+                                # End turn after placing block
+                                self.end_turn()
+                elif event.type == pygame.MOUSEMOTION:
+                    if event.buttons[2]:
+                        self.camera.pan(-event.rel[0], -event.rel[1])
+                    self.pointer_pos = event.pos
+            # Once per frame, also catches rotating, zooming and opening placement mode
+            if self.pointer_pos is not None:
+                self.update_block_preview(self.pointer_pos)
 
-            if self.state == GameState.PLAYER2_TURN and self.game_mode != 'pvp':
-                if not self.computer_thinking:
-                    self.computer_thinking = True
-                    self.computer_think_time = pygame.time.get_ticks()
-                elif pygame.time.get_ticks() - self.computer_think_time > 800:  # 800ms delay
-                    self.computer_move()
-                    self.computer_thinking = False
+            # Game logic in fixed steps, drawing at whatever rate the machine manages
+            self.render_alpha = self.advance(elapsed)
 
             screen.fill(LIGHT_GREEN)
             self.draw_animated_background()
@@ -1569,16 +997,158 @@ class HideSeekGame:
                 self.draw_grid()
             self.draw_ui()
             pygame.display.flip()
-            self.clock.tick(FPS)
+            elapsed = self.clock.tick(FPS)
         pygame.quit()
         sys.exit()
 
-    def freeze_opponent(self, player):
-        # player: 1 or 2 (the one who collected the gift)
-        if player == 1:
-            self.player2_frozen_turns = 2
-        else:
-            self.player1_frozen_turns = 2
+    def draw_replay_ui(self, replay, index, speed, playing):
+        ui_x = WINDOW_WIDTH - 220
+        opponent = "Spike" if self.last_game_mode == 'pvp' else "Computer"
+        lines = [f"Replay turn {index + 1} / {len(replay)}",
+                 f"Speed {speed}x" if playing else "Paused",
+                 f"Tom blocks: {self.player1_blocks_remaining}",
+                 f"Spike blocks: {self.player2_blocks_remaining}",
+                 f"Score: Tom {self.scores['Tom']} | {opponent} {self.scores[opponent]}",
+                 "Space: play / pause",
+                 "Up / Down: speed",
+                 "Left / Right: step",
+                 "PgUp / PgDn: 10 turns"]
+        for i, line in enumerate(lines):
+            screen.blit(self.font.render(line, True, BLACK), (ui_x, 80 + i * 32))
+        if self.state == GameState.GAME_OVER and self.winner:
+            win_text = self.big_font.render(f"{self.winner} Wins!", True, BLACK)
+            screen.blit(win_text, win_text.get_rect(center=(WINDOW_WIDTH // 2, 40)))
+        if self.feedback_text in self.assets.feedback_images:
+            screen.blit(self.assets.feedback_images[self.feedback_text], (ui_x, WINDOW_HEIGHT - 240))
+        # Timeline, click anywhere on it to jump there
+        bar = pygame.Rect(GRID_OFFSET_X, WINDOW_HEIGHT - 50, WIDTH, 16)
+        pygame.draw.rect(screen, WHITE, bar)
+        done = bar.width * (index + 1) // max(len(replay), 1)
+        pygame.draw.rect(screen, ORANGE, (bar.x, bar.y, done, bar.height))
+        pygame.draw.rect(screen, BLACK, bar, 2)
+        return bar
+
+    def draw_replay_frame(self, replay, index, speed, playing):
+        """Draw the restored frame of a replay, returns the timeline's rect"""
+        screen.fill(LIGHT_GREEN)
+        self.draw_animated_background()
+        self.draw_grid()
+        return self.draw_replay_ui(replay, index, speed, playing)
+
+    def restore_replay_frame(self, replay, index, previous=None):
+        """Show frame index of a replay, with the animations of the turn when it follows frame previous"""
+        gift, hidden = self.gift_box_location, self.hidden_pos
+        frozen = (self.player1_frozen_turns, self.player2_frozen_turns)
+        moved = (self.player1_moved_target, self.player2_moved_target)
+        replay.restore(self, index)
+        if previous is None or index != previous + 1:
+            return
+        if gift is not None and self.gift_box_location is None and gift in (self.seeker1_pos, self.seeker2_pos):
+            self.on_gift_collected(None, gift)
+        if hidden is not None and hidden != self.hidden_pos and moved != (self.player1_moved_target,
+                                                                           self.player2_moved_target):
+            self.on_target_moved(hidden)
+        for player, was_frozen, is_frozen in ((1, frozen[0], self.player1_frozen_turns),
+                                              (2, frozen[1], self.player2_frozen_turns)):
+            if was_frozen and not is_frozen:
+                self.on_unfrozen(player)
+
+    def view_replay(self, replay):
+        """Play a recorded game back, with seeking and up to 64x speed"""
+        index = 0
+        speed = 1
+        playing = True
+        carry = 0.0  # turns owed to playback since the last whole turn
+        replay.restore(self, index)
+        # Animations follow the playback position, so they pause, rewind and speed up with it
+        self.timeline.speed = 0
+        bar = None
+        while True:
+            target = index
+            for event in pygame.event.get():
+                if self.handle_display_event(event):
+                    continue
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    return
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        playing = not playing
+                    elif event.key == pygame.K_UP:
+                        speed = min(speed * 2, REPLAY_MAX_SPEED)
+                    elif event.key == pygame.K_DOWN:
+                        speed = max(speed // 2, 1)
+                    elif event.key in REPLAY_STEPS:
+                        target += REPLAY_STEPS[event.key]
+                    elif event.key == pygame.K_HOME:
+                        target = 0
+                    elif event.key == pygame.K_END:
+                        target = len(replay) - 1
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and bar and bar.collidepoint(event.pos):
+                    target = (event.pos[0] - bar.x) * len(replay) // bar.width
+                elif event.type == pygame.MOUSEWHEEL:
+                    self.camera.zoom(event.y, pygame.mouse.get_pos())
+                elif event.type == pygame.MOUSEMOTION and event.buttons[2]:
+                    self.camera.pan(-event.rel[0], -event.rel[1])
+            dt = self.clock.tick(FPS) / 1000
+            if playing:
+                carry += dt * speed * REPLAY_TURNS_PER_SECOND
+                target += int(carry)
+                carry -= int(carry)
+            target = max(0, min(target, len(replay) - 1))
+            if 0 < target - index <= REPLAY_MAX_SPEED:
+                # Step through the turns played this frame, so none of their animations are missed
+                for step in range(index + 1, target + 1):
+                    self.timeline.seek(step * 1000 / REPLAY_TURNS_PER_SECOND)
+                    self.restore_replay_frame(replay, step, step - 1)
+            elif target != index:
+                self.restore_replay_frame(replay, target)
+            index = target
+            self.timeline.seek((index + carry) * 1000 / REPLAY_TURNS_PER_SECOND)
+
+            bar = self.draw_replay_frame(replay, index, speed, playing)
+            pygame.display.flip()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tom and Spike hide and seek")
+    parser.add_argument("--record", metavar="PATH", help="save every turn to a replay file")
+    parser.add_argument("--replay", metavar="PATH", help="watch a replay file instead of playing")
+    parser.add_argument("--grid-size", type=int, help=f"board size in cells, {GRID_SIZE} by default and {arena.ARENA_GRID_SIZE} in an arena")
+    parser.add_argument("--pathfinding", choices=["auto"] + list(pathfinding.BACKENDS), default="auto",
+                        help="pathfinding backend, auto picks an exact one by board size; hpa is faster on big boards but approximate")
+    parser.add_argument("--telemetry", metavar="PATH", help="write a JSON lines record of every computer turn")
+    parser.add_argument("--fullscreen", action="store_true", help="start fullscreen, F11 switches back")
+    parser.add_argument("--arena", action="store_true", help="play an arena round with more seekers and Jerrys")
+    parser.add_argument("--seekers", type=int, default=4, help="arena seekers, 2 to 8")
+    parser.add_argument("--jerrys", type=int, default=2, help="arena Jerrys")
+    parser.add_argument("--computers", type=int, default=0, help="arena seekers played by the computer, the last ones")
+    args = parser.parse_args(argv)
+    if args.arena:
+        import arena_view  # it imports this module to draw with
+        try:
+            arena_view.play_arena(args.grid_size or arena.ARENA_GRID_SIZE, args.seekers, args.jerrys,
+                                  args.computers, fullscreen=args.fullscreen)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+    init_display(fullscreen=args.fullscreen)
+    grid_size = args.grid_size or GRID_SIZE
+    if args.replay:
+        with replay.ReplayFile(args.replay) as recorded:
+            HideSeekGame(grid_size=recorded.grid_size).view_replay(recorded)
+        return
+    recorder = replay.ReplayWriter(args.record, grid_size) if args.record else None
+    sink = telemetry.JsonlSink(args.telemetry) if args.telemetry else None
+    try:
+        game = HideSeekGame(pathfinding_backend=args.pathfinding, recorder=recorder, grid_size=grid_size)
+        game.telemetry = sink
+        game.run()
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if sink is not None:
+            sink.close()
+
 
 if __name__ == "__main__":
-    HideSeekGame().run()
+    main()
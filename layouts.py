@@ -0,0 +1,242 @@
+"""Board layout generation and bulk seeded layout files.
+
+A layout is the random part of a round: the hiding spots and the gift box.
+Cells are drawn without replacement, so generation time does not depend on
+how crowded the board is.
+
+Layout files hold millions of layouts in fixed-size records and are read
+back through a memory map. Benchmarks, tournaments and training runs can
+stream boards from them instead of generating new ones::
+
+    python layouts.py export boards.bin --count 1000000 --seed 7
+"""
+import argparse
+import mmap
+import random
+import struct
+import sys
+from array import array
+
+from pathfinding import NEIGHBORS, blocked_cells
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MIN_SPOTS = 8
+MAX_SPOTS = 12
+
+MAGIC = b"HSLAYT01"
+# magic, grid size, max spots, cell width in bytes, layout count, seed
+HEADER = struct.Struct("<8sHBBQQ")
+# Records are little-endian like the header, whatever the host's byte order
+SWAP_RECORDS = sys.byteorder == "big"
+EMPTY = 0xFFFFFFFF
+# Above this many cells a per-layout O(spots) draw beats one key per cell
+NUMPY_EXPORT_MAX_CELLS = 1024
+
+
+def start_positions(grid_size):
+    """Tom's and Spike's starting cells, which never hold a spot or the gift"""
+    return [(0, 0), (grid_size - 1, grid_size - 1)]
+
+
+def reachable_cells(grid_size, blocked, start):
+    """Flood fill from start over the cells that are not blocked"""
+    seen = {start}
+    frontier = [start]
+    while frontier:
+        cx, cy = frontier.pop()
+        for dx, dy in NEIGHBORS:
+            cell = (cx+dx, cy+dy)
+            if 0 <= cell[0] < grid_size and 0 <= cell[1] < grid_size \
+                    and cell not in seen and cell not in blocked:
+                seen.add(cell)
+                frontier.append(cell)
+    return seen
+
+
+def _skip_excluded(index, excluded):
+    """Map an index over the non-excluded cells to a real cell index
+
+    ``excluded`` must be sorted. Runs in O(len(excluded)).
+    """
+    for e in excluded:
+        if e <= index:
+            index += 1
+        else:
+            break
+    return index
+
+
+def sample_cells(grid_size, count, excluded, rng=random, blocks=()):
+    """Draw count distinct free cells, never one of the excluded cells
+
+    Without blocks every cell is reachable and the draw is O(count). With
+    blocks, only cells connected to the starting positions are candidates.
+    """
+    if blocks:
+        blocked = blocked_cells(blocks)
+        starts = start_positions(grid_size)
+        component = reachable_cells(grid_size, blocked, starts[0])
+        if not all(start in component for start in starts):
+            raise ValueError("The starting positions are not connected")
+        excluded = set(excluded)
+        candidates = sorted(cell for cell in component if cell not in excluded)
+        return rng.sample(candidates, count)
+    excluded = sorted({x * grid_size + y for x, y in excluded})
+    total = grid_size * grid_size - len(excluded)
+    picks = rng.sample(range(total), count)
+    return [divmod(_skip_excluded(i, excluded), grid_size) for i in picks]
+
+
+def generate_layout(grid_size, rng=random, blocks=(), min_spots=MIN_SPOTS, max_spots=MAX_SPOTS):
+    """Return (hiding_spots, gift_box_location) for a new round"""
+    spot_count = rng.randint(min_spots, max_spots)
+    cells = sample_cells(grid_size, spot_count + 1, start_positions(grid_size), rng, blocks)
+    return cells[:spot_count], cells[spot_count]
+
+
+def _cell_typecode(grid_size):
+    return "H" if grid_size * grid_size < 0xFFFF else "I"
+
+
+def export_layouts(path, grid_size, count, seed, max_spots=MAX_SPOTS, min_spots=MIN_SPOTS, chunk=65536):
+    """Write count seeded layouts to a layout file
+
+    Each record is ``[spot count, gift cell, spot cells..., padding]`` with
+    cells stored as ``x * grid_size + y``. The same seed always produces the
+    same file on the same generator. Boards up to 32x32 use a vectorised
+    NumPy draw when NumPy is installed, larger ones (or no NumPy) use
+    ``random.Random(seed)``.
+    """
+    typecode = _cell_typecode(grid_size)
+    width = array(typecode).itemsize
+    empty = EMPTY & ((1 << (8 * width)) - 1)
+    record = max_spots + 2
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, grid_size, max_spots, width, count, seed))
+        if np is not None and grid_size * grid_size <= NUMPY_EXPORT_MAX_CELLS:
+            _export_numpy(f, grid_size, count, seed, min_spots, max_spots, width, chunk)
+        else:
+            rng = random.Random(seed)
+            for _ in range(count):
+                spots, gift = generate_layout(grid_size, rng, (), min_spots, max_spots)
+                row = [len(spots), gift[0] * grid_size + gift[1]]
+                row.extend(x * grid_size + y for x, y in spots)
+                row.extend([empty] * (record - len(row)))
+                cells = array(typecode, row)
+                if SWAP_RECORDS:
+                    cells.byteswap()
+                cells.tofile(f)
+
+
+def sample_layout_rows(rng, count, grid_size, min_spots=MIN_SPOTS, max_spots=MAX_SPOTS, dtype=None):
+    """Draw count layouts at once as layout file records (needs NumPy)
+
+    ``rng`` is a ``numpy.random.Generator``. Each cell gets a random key and
+    the smallest keys win, so every row is a draw without replacement.
+    """
+    if dtype is None:
+        dtype = np.uint16 if grid_size * grid_size < 0xFFFF else np.uint32
+    empty = np.iinfo(dtype).max
+    starts = [x * grid_size + y for x, y in start_positions(grid_size)]
+    cells = np.array([c for c in range(grid_size * grid_size) if c not in starts], dtype=dtype)
+    picks = max_spots + 1
+    keys = rng.random((count, len(cells)))
+    chosen = np.argpartition(keys, picks - 1, axis=1)[:, :picks]
+    # argpartition does not shuffle its output, so order by the keys themselves
+    order = np.argsort(np.take_along_axis(keys, chosen, axis=1), axis=1)
+    chosen = cells[np.take_along_axis(chosen, order, axis=1)]
+    spot_counts = rng.integers(min_spots, max_spots + 1, size=count)
+    out = np.full((count, max_spots + 2), empty, dtype=dtype)
+    out[:, 0] = spot_counts
+    out[:, 1] = chosen[:, max_spots]  # never one of the spots
+    spots = chosen[:, :max_spots].copy()
+    spots[np.arange(max_spots) >= spot_counts[:, None]] = empty
+    out[:, 2:] = spots
+    return out
+
+
+def _export_numpy(f, grid_size, count, seed, min_spots, max_spots, width, chunk):
+    """Vectorised export in chunks of layout rows"""
+    rng = np.random.default_rng(seed)
+    dtype = np.uint16 if width == 2 else np.uint32
+    little = np.dtype(dtype).newbyteorder("<")
+    written = 0
+    # Keep each chunk's key matrix around 32 MB
+    chunk = max(1, min(chunk, (1 << 22) // (grid_size * grid_size)))
+    while written < count:
+        n = min(chunk, count - written)
+        sample_layout_rows(rng, n, grid_size, min_spots, max_spots, dtype).astype(little, copy=False).tofile(f)
+        written += n
+
+
+class LayoutFile:
+    """Random access to a layout file through a read-only memory map"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.grid_size, self.max_spots, width, self.count, self.seed = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a layout file")
+        self.record = self.max_spots + 2
+        self._view = memoryview(self._map)
+        self._cells = self._view[HEADER.size:].cast("H" if width == 2 else "I")
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """Return (hiding_spots, gift_box_location) of layout number index"""
+        if not -self.count <= index < self.count:
+            raise IndexError(index)
+        base = (index % self.count) * self.record
+        row = self._cells[base:base + self.record]
+        if SWAP_RECORDS:
+            row = array(self._cells.format, row)
+            row.byteswap()
+        n = self.grid_size
+        spots = [divmod(c, n) for c in row[2:2 + row[0]]]
+        return spots, divmod(row[1], n)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def as_array(self):
+        """Zero-copy (count, max_spots + 2) NumPy view of all records"""
+        dtype = np.dtype(self._cells.format).newbyteorder("<")
+        return np.frombuffer(self._cells, dtype=dtype).reshape(self.count, self.record)
+
+    def close(self):
+        self._cells.release()
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export seeded hide and seek board layouts")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="write layouts to a binary file")
+    export.add_argument("path")
+    export.add_argument("--count", type=int, default=100000)
+    export.add_argument("--seed", type=int, default=0)
+    export.add_argument("--grid-size", type=int, default=10)
+    args = parser.parse_args(argv)
+    export_layouts(args.path, args.grid_size, args.count, args.seed)
+    with LayoutFile(args.path) as layouts:
+        print(f"Wrote {len(layouts)} layouts for a {layouts.grid_size}x{layouts.grid_size} board to {args.path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
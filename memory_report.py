@@ -0,0 +1,256 @@
+"""Where the game's memory goes, and whether it keeps growing.
+
+``report(game)`` breaks a running game's memory down three ways: the pixel
+bytes of the loaded images by asset group, the game's surface caches, and
+the Python objects each subsystem holds (blocks, the path cache, placement
+masks, replay index, ...). When ``tracemalloc`` is tracing, the traced
+allocations are also listed by the module that made them. Surface pixels
+are allocated by SDL, outside of what ``tracemalloc`` sees, which is why
+they are counted from their sizes instead.
+
+The soak mode plays computer vs scripted player rounds with every frame
+drawn, as fast as the machine allows, for hours. It samples the process's
+memory, the traced allocations and the cache sizes every minute and flags
+any of them that only ever grew over the last samples, such as a surface
+created every frame and never released::
+
+    python memory_report.py                # one report after a few rounds
+    python memory_report.py --soak 8       # hours
+"""
+import argparse
+import os
+import random
+import time
+import tracemalloc
+
+import pygame
+
+import belief
+import hide_seek_game as ui
+from rules import DIRECTIONS, GameState
+from session_host import footprint
+from sprite_cache import surface_bytes
+
+SAMPLE_SECONDS = 60
+GROWTH_WINDOW = 10  # samples that must all grow before a metric is flagged
+WARMUP_SAMPLES = 10  # not judged while the bounded caches are still filling up
+GROWTH_MIN_BYTES = 256 * 1024  # ignore growth smaller than this over the window
+PLAYER_STEPS = 5  # simulation steps between the scripted player's moves
+DIFFICULTIES = ["normal", "hard", "fair"] if belief.available() else ["normal", "hard"]
+
+
+def surfaces_in(value):
+    """Every surface in a surface, list or dict of them, nested or not"""
+    if isinstance(value, pygame.Surface):
+        return [value]
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return [surface for item in value for surface in surfaces_in(item)]
+    return []
+
+
+def asset_groups():
+    """(surface count, pixel bytes) for every group of loaded images, nothing if not loaded yet"""
+    if ui._assets is None:
+        return {}
+    groups = {}
+    for name, value in vars(ui._assets).items():
+        surfaces = surfaces_in(value)
+        if surfaces:
+            groups[name] = (len(surfaces), sum(surface_bytes(s) for s in surfaces))
+    return groups
+
+
+def surface_caches(game):
+    """(surface count, pixel bytes) held by the window and the caches built while drawing"""
+    caches = {
+        "screen": [ui.screen] if ui.screen is not None else [],
+        "title_background": [ui._title_background] if ui._title_background is not None else [],
+        "scaled_sprites": list(game.scaled_sprites.values()),
+    }
+    if game.board_image is not None:
+        caches["board_image"] = [game.board_image.surface] + [image for _, image in game.board_image._scaled.values()]
+    return {name: (len(surfaces), sum(surface_bytes(s) for s in surfaces)) for name, surfaces in caches.items()}
+
+
+def subsystems(game):
+    """Bytes of Python objects held by each part of the game, shared assets excluded"""
+    assets = vars(ui._assets).values() if ui._assets is not None else ()
+    parts = {
+        "blocks": game.blocks,
+        "path_cache": game.path_service._cache,
+        "placement_masks": game._placement_masks,
+        "connectivity": game.connectivity,
+        "belief": game.belief,
+        "timeline": game.timeline,
+        "camera": game.camera,
+        "background_stars": game.stars,
+        "replay_index": getattr(game.recorder, "_index", None),
+        "telemetry_buffer": getattr(game.telemetry, "_buffer", None),
+    }
+    return {name: footprint(value, shared=assets) for name, value in parts.items() if value is not None}
+
+
+def traced_modules(limit=10):
+    """Traced bytes by allocating file, the largest first, empty unless tracemalloc is tracing"""
+    if not tracemalloc.is_tracing():
+        return {}
+    stats = tracemalloc.take_snapshot().statistics("filename")
+    return {os.path.basename(stat.traceback[0].filename): stat.size for stat in stats[:limit]}
+
+
+def rss_bytes():
+    """Resident memory of this process, or None where /proc is not available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def report(game):
+    return {
+        "assets": asset_groups(),
+        "surface caches": surface_caches(game),
+        "subsystems": subsystems(game),
+        "tracemalloc": traced_modules(),
+    }
+
+
+def print_report(sections):
+    for title, rows in sections.items():
+        if not rows:
+            continue
+        total = sum(row[1] if isinstance(row, tuple) else row for row in rows.values())
+        print(f"{title}: {total / 1024:.0f} KB")
+        for name, row in sorted(rows.items(), key=lambda item: -(item[1][1] if isinstance(item[1], tuple) else item[1])):
+            if isinstance(row, tuple):
+                print(f"  {name:<32} {row[0]:>5} surfaces {row[1] / 1024:>9.1f} KB")
+            else:
+                print(f"  {name:<32} {'':>14} {row / 1024:>9.1f} KB")
+    rss = rss_bytes()
+    if rss is not None:
+        print(f"process resident memory: {rss / 1024 / 1024:.1f} MB")
+
+
+def scripted_player(game, rng):
+    """Player 1 walks towards Jerry, with a random step or block now and then"""
+    if rng.random() < 0.05 and game.player1_blocks_remaining > 0:
+        for _ in range(10):
+            action = ("block", rng.randrange(game.grid_size), rng.randrange(game.grid_size),
+                      rng.choice(["horizontal", "vertical"]))
+            if game.take_action(1, action):
+                return
+    path = game.a_star_path(game.seeker1_pos, game.hidden_pos)
+    if len(path) > 1 and rng.random() < 0.7:
+        step = (path[1][0] - game.seeker1_pos[0], path[1][1] - game.seeker1_pos[1])
+        direction = next(name for name, delta in DIRECTIONS.items() if delta == step)
+        if game.take_action(1, ("move", direction)):
+            return
+    for direction in rng.sample(list(DIRECTIONS), len(DIRECTIONS)):
+        if game.take_action(1, ("move", direction)):
+            return
+    game.end_turn()
+
+
+class AutoPlay:
+    """Rounds against the computer, played one simulation step and one drawn frame at a time"""
+
+    def __init__(self, game, seed=0):
+        self.game = game
+        self.rng = random.Random(seed)
+        self.rounds = 0
+        self.frames = 0
+        ui.load_assets()
+        game.game_mode = "pvc"
+        game.seeker_slides = {}
+        self.new_round()
+
+    def new_round(self):
+        self.game.computer_difficulty = DIFFICULTIES[self.rounds % len(DIFFICULTIES)]
+        self.game.start_game()
+        self.rounds += 1
+
+    def frame(self):
+        game = self.game
+        if game.state == GameState.GAME_OVER:
+            self.new_round()
+        elif game.state == GameState.PLAYER1_TURN and self.frames % PLAYER_STEPS == 0:
+            scripted_player(game, self.rng)
+        game.simulation_step()
+        ui.screen.fill(ui.LIGHT_GREEN)
+        game.draw_animated_background()
+        game.draw_grid()
+        game.draw_ui()
+        pygame.display.flip()
+        self.frames += 1
+
+
+def sample(game):
+    """The numbers the soak watches for steady growth"""
+    values = {
+        "traced bytes": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None,
+        "resident bytes": rss_bytes(),
+        "surface cache bytes": sum(row[1] for row in surface_caches(game).values()),
+        "subsystem bytes": sum(subsystems(game).values()),
+    }
+    return {name: value for name, value in values.items() if value is not None}
+
+
+def growing(series, window=GROWTH_WINDOW, min_bytes=GROWTH_MIN_BYTES):
+    """True if the last window samples never went down and rose by at least min_bytes"""
+    if len(series) < window:
+        return False
+    recent = series[-window:]
+    return all(b >= a for a, b in zip(recent, recent[1:])) and recent[-1] - recent[0] >= min_bytes
+
+
+def soak(game, hours, sample_seconds=SAMPLE_SECONDS, seed=0):
+    """Play until hours have passed, printing samples and returning the metrics flagged as growing"""
+    play = AutoPlay(game, seed)
+    history = {}
+    flagged = set()
+    end = time.monotonic() + hours * 3600
+    next_sample = time.monotonic()
+    while True:
+        now = time.monotonic()
+        if now >= next_sample:
+            pygame.event.pump()
+            values = sample(game)
+            print(f"{time.strftime('%H:%M:%S')} rounds {play.rounds:>6} frames {play.frames:>9}  "
+                  + "  ".join(f"{name} {value / 1024 / 1024:.1f} MB" for name, value in values.items()), flush=True)
+            for name, value in values.items():
+                series = history.setdefault(name, [])
+                series.append(value)
+                if growing(series[WARMUP_SAMPLES:]) and name not in flagged:
+                    flagged.add(name)
+                    print(f"WARNING: {name} grew in each of the last {GROWTH_WINDOW} samples", flush=True)
+            next_sample = now + sample_seconds
+        if now >= end:
+            return flagged
+        play.frame()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the game's memory use, or soak test it for hours")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds to play before the report")
+    parser.add_argument("--soak", type=float, metavar="HOURS", help="auto-play for this long, flagging growth")
+    parser.add_argument("--sample-seconds", type=float, default=SAMPLE_SECONDS, help="time between soak samples")
+    args = parser.parse_args(argv)
+    tracemalloc.start()
+    game = ui.HideSeekGame()
+    if args.soak is not None:
+        flagged = soak(game, args.soak, args.sample_seconds)
+        print_report(report(game))
+        if flagged:
+            raise SystemExit("growing: " + ", ".join(sorted(flagged)))
+        return
+    play = AutoPlay(game)
+    while play.rounds <= args.rounds:
+        play.frame()
+    print_report(report(game))
+
+
+if __name__ == "__main__":
+    main()
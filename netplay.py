@@ -0,0 +1,378 @@
+"""Networked PvP: an asyncio server owns the rules, each player runs a client.
+
+The server holds the authoritative ``rules.RoundState``. Clients send their
+actions, the server checks them against the rules and broadcasts the
+accepted ones as small binary deltas, together with the random choices it
+made (the board layout and where Jerry runs to). Every client replays the
+deltas on its own RoundState, so each player runs the full renderer while a
+turn costs a few bytes on the wire.
+
+Clients learn Jerry's cell, just like the hot-seat screen shows both players
+their exact distance to him. The server decides every outcome, so a
+modified client can only confuse itself, never its opponent.
+
+    python netplay.py serve --port 5555
+    python netplay.py join 192.168.1.20 --port 5555
+"""
+import argparse
+import asyncio
+import random
+import struct
+import sys
+
+from rules import DIRECTIONS, GRID_SIZE, GameState, RoundState
+
+DIRECTION_NAMES = list(DIRECTIONS)  # wire index -> direction
+ORIENTATIONS = ["horizontal", "vertical"]
+DEFAULT_PORT = 5555
+MAX_GRID_SIZE = 0xFFFF  # WELCOME sends the grid size in two bytes
+
+# Client -> server actions
+MOVE = 0x01
+BLOCK = 0x02
+MOVE_TARGET = 0x03
+NEXT_ROUND = 0x04
+# Server -> client deltas
+WELCOME = 0x10
+ROUND = 0x11
+MOVED = 0x12
+BLOCKED = 0x13
+TARGET_MOVED = 0x14
+GIFT = 0x15
+SKIPPED = 0x16
+REJECTED = 0x17
+
+# Every message starts with its opcode byte, cells are x * grid_size + y.
+# A cell takes four bytes, enough for any board up to MAX_GRID_SIZE
+FORMATS = {
+    MOVE: struct.Struct("<BB"),  # direction
+    BLOCK: struct.Struct("<BIB"),  # cell, orientation
+    MOVE_TARGET: struct.Struct("<B"),
+    NEXT_ROUND: struct.Struct("<B"),
+    WELCOME: struct.Struct("<BBH"),  # player, grid size
+    ROUND: struct.Struct("<BBII"),  # spot count, gift cell, Jerry's cell, then the spot cells
+    MOVED: struct.Struct("<BBB"),  # player, direction
+    BLOCKED: struct.Struct("<BBIB"),  # player, cell, orientation
+    TARGET_MOVED: struct.Struct("<BBI"),  # player, Jerry's new cell
+    GIFT: struct.Struct("<BB"),  # player who picked it up
+    SKIPPED: struct.Struct("<BB"),  # frozen player whose turn was skipped
+    REJECTED: struct.Struct("<BB"),  # reason
+}
+
+# Reasons sent with REJECTED
+NOT_YOUR_TURN = 1
+ILLEGAL = 2
+ROUND_NOT_OVER = 3
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def pack(opcode, *fields):
+    return FORMATS[opcode].pack(opcode, *fields)
+
+
+def pack_round(spots, gift, hidden, grid_size):
+    cells = [x * grid_size + y for x, y in spots]
+    return (pack(ROUND, len(cells), gift[0] * grid_size + gift[1], hidden[0] * grid_size + hidden[1])
+            + struct.pack(f"<{len(cells)}I", *cells))
+
+
+async def read_message(reader):
+    """Read one message, returns (opcode, fields)"""
+    opcode = (await reader.readexactly(1))[0]
+    fmt = FORMATS.get(opcode)
+    if fmt is None:
+        raise ProtocolError(f"Unknown opcode {opcode:#x}")
+    fields = fmt.unpack(bytes([opcode]) + await reader.readexactly(fmt.size - 1))[1:]
+    if opcode == ROUND:
+        count = fields[0]
+        fields += (struct.unpack(f"<{count}I", await reader.readexactly(4 * count)),)
+    return opcode, fields
+
+
+class GameServer:
+    """Accepts two players and runs their rounds on one authoritative RoundState"""
+
+    def __init__(self, grid_size=GRID_SIZE, rng=random, layout_source=None):
+        if grid_size > MAX_GRID_SIZE:
+            raise ValueError(f"Online games are played on boards of up to {MAX_GRID_SIZE}x{MAX_GRID_SIZE}")
+        self.round = RoundState(grid_size, layout_source=layout_source, rng=rng)
+        self.round.game_mode = "pvp"
+        self.writers = {}  # player number -> StreamWriter
+        self.handlers = set()
+        self.server = None
+        self.bytes_sent = 0
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Start listening, returns the bound port"""
+        self.server = await asyncio.start_server(self._serve_player, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self.server.close()
+        for writer in list(self.writers.values()):
+            writer.close()
+        # Let the player handlers see their connections end before the loop stops
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def _serve_player(self, reader, writer):
+        player = next((p for p in (1, 2) if p not in self.writers), None)
+        if player is None:
+            writer.close()
+            return
+        self.writers[player] = writer
+        self.handlers.add(asyncio.current_task())
+        self._send(writer, pack(WELCOME, player, self.round.grid_size))
+        if len(self.writers) == 2:
+            self._broadcast(self.new_round())
+        try:
+            while True:
+                opcode, fields = await read_message(reader)
+                events, rejection = self.handle_action(player, opcode, fields)
+                if events:
+                    self._broadcast(events)
+                else:
+                    self._send(writer, rejection)
+                for other in list(self.writers.values()):
+                    await other.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError):
+            pass
+        finally:
+            self.writers.pop(player, None)
+            self.handlers.discard(asyncio.current_task())
+            writer.close()
+
+    def _send(self, writer, data):
+        writer.write(data)
+        self.bytes_sent += len(data)
+
+    def _broadcast(self, data):
+        for writer in self.writers.values():
+            self._send(writer, data)
+
+    def new_round(self):
+        r = self.round
+        r.reset_round()
+        return pack_round(r.hiding_spots, r.gift_box_location, r.hidden_pos, r.grid_size)
+
+    def handle_action(self, player, opcode, fields):
+        """Apply one action, returns (deltas for everyone, None) or (None, rejection for the sender)"""
+        r = self.round
+        n = r.grid_size
+        if opcode == NEXT_ROUND:
+            if r.state != GameState.GAME_OVER:
+                return None, pack(REJECTED, ROUND_NOT_OVER)
+            return self.new_round(), None
+        turn = GameState.PLAYER1_TURN if player == 1 else GameState.PLAYER2_TURN
+        if r.state != turn:
+            return None, pack(REJECTED, NOT_YOUR_TURN)
+        had_gift = r.gift_box_location is not None
+        if opcode == MOVE and fields[0] < len(DIRECTION_NAMES):
+            action = ("move", DIRECTION_NAMES[fields[0]])
+        elif opcode == BLOCK and fields[1] < len(ORIENTATIONS):
+            action = ("block", *divmod(fields[0], n), ORIENTATIONS[fields[1]])
+        elif opcode == MOVE_TARGET:
+            action = ("move_target",)
+        else:
+            return None, pack(REJECTED, ILLEGAL)
+        if not r.take_action(player, action):
+            return None, pack(REJECTED, ILLEGAL)
+        if opcode == MOVE:
+            events = [pack(MOVED, player, fields[0])]
+            if had_gift and r.gift_box_location is None:
+                events.append(pack(GIFT, player))
+        elif opcode == BLOCK:
+            events = [pack(BLOCKED, player, *fields)]
+        else:
+            events = [pack(TARGET_MOVED, player, r.hidden_pos[0] * n + r.hidden_pos[1])]
+        # Frozen players lose their turns without sending anything
+        while r.state != GameState.GAME_OVER:
+            frozen = 1 if r.state == GameState.PLAYER1_TURN else 2
+            if not r.skip_frozen_turn():
+                break
+            events.append(pack(SKIPPED, frozen))
+        return b"".join(events), None
+
+
+class GameClient:
+    """One player's connection, replays the server's deltas on a local RoundState
+
+    ``start_round`` is called with (layout, hidden_pos) when a round begins,
+    by default the state's ``reset_round``.
+    """
+
+    def __init__(self, state=None, start_round=None):
+        self.state = state if state is not None else RoundState()
+        self.state.game_mode = "pvp"
+        self.start_round = start_round or self.state.reset_round
+        self.player = None
+        self.reader = None
+        self.writer = None
+        self.rejections = 0
+
+    async def connect(self, host, port):
+        """Join a server, returns our player number"""
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        opcode, fields = await read_message(self.reader)
+        if opcode != WELCOME:
+            raise ProtocolError("Expected WELCOME")
+        self.player, grid_size = fields
+        if grid_size != self.state.grid_size:
+            raise ProtocolError(f"Server plays on a {grid_size}x{grid_size} board")
+        return self.player
+
+    def my_turn(self):
+        return self.state.state == (GameState.PLAYER1_TURN if self.player == 1 else GameState.PLAYER2_TURN)
+
+    def send_move(self, direction):
+        self.writer.write(pack(MOVE, DIRECTION_NAMES.index(direction)))
+
+    def send_block(self, x, y, orientation):
+        self.writer.write(pack(BLOCK, x * self.state.grid_size + y, ORIENTATIONS.index(orientation)))
+
+    def send_move_target(self):
+        self.writer.write(pack(MOVE_TARGET))
+
+    def send_next_round(self):
+        self.writer.write(pack(NEXT_ROUND))
+
+    async def drain(self):
+        await self.writer.drain()
+
+    async def receive(self):
+        """Wait for the next delta and apply it, returns (opcode, fields)"""
+        opcode, fields = await read_message(self.reader)
+        self.apply(opcode, fields)
+        return opcode, fields
+
+    def apply(self, opcode, fields):
+        s = self.state
+        n = s.grid_size
+        if opcode == ROUND:
+            _, gift, hidden, cells = fields
+            self.start_round(([divmod(c, n) for c in cells], divmod(gift, n)), divmod(hidden, n))
+        elif opcode == MOVED:
+            player, direction = fields
+            if not s.move_seeker(player, DIRECTION_NAMES[direction]):
+                raise ProtocolError("Out of sync: the server accepted a move we cannot make")
+        elif opcode == BLOCKED:
+            player, cell, orientation = fields
+            if not s.place_block(*divmod(cell, n), ORIENTATIONS[orientation], player):
+                raise ProtocolError("Out of sync: the server accepted a block we cannot place")
+            s.end_turn()
+        elif opcode == TARGET_MOVED:
+            player, cell = fields
+            s.use_move_target(player, divmod(cell, n))
+        elif opcode == GIFT:
+            # The move already picked it up, this only confirms it
+            if s.gift_box_location is not None:
+                raise ProtocolError("Out of sync: gift box still on the board")
+        elif opcode == SKIPPED:
+            if not s.skip_frozen_turn():
+                raise ProtocolError("Out of sync: skipped a player who is not frozen")
+        elif opcode == REJECTED:
+            self.rejections += 1
+        else:
+            raise ProtocolError(f"Unexpected opcode {opcode:#x}")
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def serve(host, port, grid_size=GRID_SIZE):
+    server = GameServer(grid_size)
+    port = await server.start(host, port)
+    print(f"Hide and seek server on {host}:{port}, waiting for two players")
+    async with server.server:
+        await server.server.serve_forever()
+
+
+def play_online(host, port):
+    """Join a server and play with the full renderer"""
+    asyncio.run(_play_online(host, port))
+
+
+async def _play_online(host, port):
+    import pygame
+    import hide_seek_game as ui
+
+    game = ui.HideSeekGame()
+    # The local title screen would block the connection, leaving is closing the window
+    game.has_main_menu = False
+    client = GameClient(game, start_round=game.start_game)
+    await client.connect(host, port)
+    pygame.display.set_caption(f"Hide and Seek - {'Tom' if client.player == 1 else 'Spike'} (online)")
+    keys = {**ui.PLAYER1_KEYS, **ui.PLAYER2_KEYS}  # own window, either key set works
+
+    async def receive_forever():
+        while True:
+            await client.receive()
+
+    receiver = asyncio.ensure_future(receive_forever())
+    running = True
+    while running and not receiver.done():
+        for event in pygame.event.get():
+            if game.handle_display_event(event):
+                continue
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and client.my_turn():
+                if event.key == pygame.K_r:
+                    game.block_orientation = "vertical" if game.block_orientation == "horizontal" else "horizontal"
+                elif event.key in keys:
+                    client.send_move(keys[event.key])
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if game.state == GameState.GAME_OVER and game.next_round_button \
+                        and game.next_round_button.collidepoint(event.pos):
+                    client.send_next_round()
+                elif not client.my_turn():
+                    pass
+                elif game.move_target_button and game.move_target_button.collidepoint(event.pos):
+                    client.send_move_target()
+                elif game.place_block_button and game.place_block_button.collidepoint(event.pos):
+                    game.block_placement_mode = True
+                elif game.block_placement_mode:
+                    cell = game.cell_at(event.pos)
+                    if cell is not None and game.can_place_block(*cell, game.block_orientation):
+                        client.send_block(*cell, game.block_orientation)
+                        game.block_placement_mode = False
+                        game.block_preview_pos = None
+            elif event.type == pygame.MOUSEMOTION:
+                game.pointer_pos = event.pos
+        if game.pointer_pos is not None:
+            game.update_block_preview(game.pointer_pos)
+        await client.drain()
+        ui.screen.fill(ui.LIGHT_GREEN)
+        game.draw_animated_background()
+        if game.state != GameState.MENU:
+            game.draw_grid()
+        game.draw_ui()
+        pygame.display.flip()
+        await asyncio.sleep(1 / ui.FPS)
+    receiver.cancel()
+    client.close()
+    pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play hide and seek PvP over the network")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_cmd = sub.add_parser("serve", help="host a match for two players")
+    serve_cmd.add_argument("--host", default="0.0.0.0")
+    serve_cmd.add_argument("--port", type=int, default=DEFAULT_PORT)
+    join = sub.add_parser("join", help="join a match")
+    join.add_argument("host")
+    join.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        asyncio.run(serve(args.host, args.port))
+    else:
+        play_online(args.host, args.port)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,605 @@
+"""Pathfinding backends for the hide and seek grid.
+
+Every backend answers the same two questions the game asks:
+``distance(start, goal, blocks)`` and ``path(start, goal, blocks)``.
+``blocks`` is the game's list of ``(x, y, orientation)`` tuples.
+"""
+import heapq
+import itertools
+from collections import OrderedDict
+
+import core
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python backend always works
+    np = None
+
+NEIGHBORS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+# Board size from which the NumPy wavefront beats the heap search
+# (see benchmarks/bench_pathfinding.py)
+NUMPY_CROSSOVER_GRID_SIZE = 60
+# Board size from which exact queries take longer than a frame, where the
+# approximate hierarchical search is worth asking for (see benchmarks/bench_pathfinding.py)
+HPA_GRID_SIZE = 200
+
+
+def block_cells(x, y, orientation):
+    """Return the two cells covered by a block"""
+    if orientation == "horizontal":
+        return ((x, y), (x, y + 1))
+    return ((x, y), (x + 1, y))
+
+
+def blocked_cells(blocks):
+    """Return the set of all cells covered by the given blocks"""
+    cells = set()
+    for x, y, orientation in blocks:
+        cells.update(block_cells(x, y, orientation))
+    return cells
+
+
+class PythonPathfinder:
+    """A* heap search over a grid of blocked cells, run by the core module"""
+    name = "python"
+
+    def __init__(self, grid_size):
+        self.grid_size = grid_size
+        self._blocks_key = None
+        self._blocked = bytearray(grid_size * grid_size)
+        self.nodes_expanded = 0  # cells taken off the open set, over all searches
+
+    def _sync(self, blocks):
+        key = tuple(blocks)
+        if key != self._blocks_key:
+            self._blocks_key = key
+            self._blocked = core.blocked_grid(self.grid_size, list(key))
+        return self._blocked
+
+    def distance(self, start, goal, blocks):
+        if start == goal:
+            return 0
+        size = self.grid_size
+        steps, expanded = core.grid_distance(size, self._sync(blocks), start[0] * size + start[1],
+                                             goal[0] * size + goal[1])
+        self.nodes_expanded += expanded
+        return float('inf') if steps == core.NO_PATH else steps
+
+    def path(self, start, goal, blocks):
+        if start == goal:
+            return [start]
+        size = self.grid_size
+        cells, expanded = core.grid_path(size, self._sync(blocks), start[0] * size + start[1],
+                                         goal[0] * size + goal[1])
+        self.nodes_expanded += expanded
+        return [divmod(cell, size) for cell in cells]  # No path found: []
+
+
+class NumpyPathfinder:
+    """Breadth-first wavefront expanded as whole-array operations
+
+    Each step grows the frontier by one ring with four shifted ORs over a
+    boolean occupancy grid. The work is restricted to the bounding box the
+    wavefront can have reached so far, so short queries stay cheap.
+    """
+    name = "numpy"
+
+    def __init__(self, grid_size):
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        self.grid_size = grid_size
+        self._blocks_key = None
+        self.free = np.ones((grid_size, grid_size), dtype=bool)
+        self.nodes_expanded = 0  # cells the wavefront reached, over all searches
+
+    def _sync(self, blocks):
+        key = tuple(blocks)
+        if key != self._blocks_key:
+            self._blocks_key = key
+            self.free = occupancy_grid(self.grid_size, blocks) == 0
+        return self.free
+
+    def _wavefront(self, start, goal, blocks):
+        """Run the wavefront from start, stopping early once goal is reached"""
+        free = self._sync(blocks)
+        size = self.grid_size
+        dist = np.full((size, size), -1, dtype=np.int32)
+        frontier = np.zeros((size, size), dtype=bool)
+        frontier[start] = True
+        dist[start] = 0
+        r0 = r1 = start[0]
+        c0 = c1 = start[1]
+        step = 0
+        while True:
+            # The next ring can only reach one cell beyond the current box
+            r0, r1 = max(r0 - 1, 0), min(r1 + 1, size - 1)
+            c0, c1 = max(c0 - 1, 0), min(c1 + 1, size - 1)
+            f = frontier[r0:r1 + 1, c0:c1 + 1]
+            nxt = np.zeros_like(f)
+            nxt[1:, :] |= f[:-1, :]
+            nxt[:-1, :] |= f[1:, :]
+            nxt[:, 1:] |= f[:, :-1]
+            nxt[:, :-1] |= f[:, 1:]
+            box_dist = dist[r0:r1 + 1, c0:c1 + 1]
+            nxt &= free[r0:r1 + 1, c0:c1 + 1]
+            nxt &= box_dist < 0
+            if not nxt.any():
+                break
+            step += 1
+            box_dist[nxt] = step
+            frontier[r0:r1 + 1, c0:c1 + 1] = nxt
+            if goal is not None and dist[goal] >= 0:
+                break
+        self.nodes_expanded += int(np.count_nonzero(box_dist >= 0))
+        return dist
+
+    def distance_field(self, source, blocks):
+        """Return steps from source to every cell, -1 where unreachable"""
+        return self._wavefront(source, None, blocks)
+
+    def distance(self, start, goal, blocks):
+        if start == goal:
+            return 0
+        d = int(self._wavefront(start, goal, blocks)[goal])
+        return d if d >= 0 else float('inf')
+
+    def path(self, start, goal, blocks):
+        if start == goal:
+            return [start]
+        dist = self._wavefront(start, goal, blocks)
+        d = int(dist[goal])
+        if d < 0:
+            return []  # No path found
+        # Walk back down the distance gradient from goal to start
+        size = self.grid_size
+        path = [goal]
+        x, y = goal
+        while d > 0:
+            for dx, dy in NEIGHBORS:
+                nx, ny = x+dx, y+dy
+                if 0 <= nx < size and 0 <= ny < size and dist[nx, ny] == d - 1:
+                    x, y = nx, ny
+                    break
+            path.append((x, y))
+            d -= 1
+        path.reverse()
+        return path
+
+
+class HierarchicalPathfinder:
+    """HPA* search over square clusters joined by border entrances
+
+    The board is cut into ``cluster_size`` squares. Free cell pairs across a
+    cluster border become entrances, and the steps between entrances of one
+    cluster are precomputed. A long query only searches this small abstract
+    graph and then refines the winning route cell by cell inside the clusters
+    it crosses. Borders and clusters are built the first time a query
+    reaches them, so a huge board costs nothing up front. When blocks
+    change, only the clusters holding the changed cells and their direct
+    neighbours are dropped, to be rebuilt when next needed.
+
+    Routes between far apart clusters are near-optimal, not always shortest.
+    Queries between the same or adjacent clusters use the exact flat search.
+    """
+    name = "hpa"
+
+    def __init__(self, grid_size, cluster_size=10):
+        self.grid_size = grid_size
+        self.cluster_size = cluster_size
+        self.clusters_per_side = (grid_size + cluster_size - 1) // cluster_size
+        self.blocked = set()
+        self._blocks_key = ()
+        self._flat = PythonPathfinder(grid_size)
+        # All three are filled in lazily and dropped around changed cells
+        self._borders = {}  # (cluster, next cluster) -> [(cell, cell), ...]
+        self._intra = {}  # cluster -> {entrance: {entrance: steps}}
+        self._inter = {}  # cluster -> {entrance: [entrance on the other side]}
+        self.cells_touched = 0  # cells and entrances visited by the last query
+        self._hierarchical_nodes = 0
+
+    def _cluster_of(self, cell):
+        return (cell[0] // self.cluster_size, cell[1] // self.cluster_size)
+
+    def _cluster_neighbors(self, cluster):
+        cx, cy = cluster
+        for dx, dy in NEIGHBORS:
+            if 0 <= cx+dx < self.clusters_per_side and 0 <= cy+dy < self.clusters_per_side:
+                yield (cx+dx, cy+dy)
+
+    def _border(self, a, b):
+        """Entrances between two adjacent clusters, found on first use"""
+        key = (a, b) if a < b else (b, a)
+        entrances = self._borders.get(key)
+        if entrances is None:
+            entrances = self._build_border(*key)
+        return entrances
+
+    def _build_border(self, a, b):
+        """Find the entrances between cluster a and the cluster below or right of it"""
+        cs = self.cluster_size
+        if b[0] == a[0]:  # b is to the right, the border runs down a column
+            inner, outer = b[1] * cs - 1, b[1] * cs
+            lane = range(a[0] * cs, min((a[0] + 1) * cs, self.grid_size))
+            pairs = [((i, inner), (i, outer)) for i in lane]
+        else:  # b is below, the border runs along a row
+            inner, outer = b[0] * cs - 1, b[0] * cs
+            lane = range(a[1] * cs, min((a[1] + 1) * cs, self.grid_size))
+            pairs = [((inner, i), (outer, i)) for i in lane]
+        entrances = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and pair[0] not in self.blocked and pair[1] not in self.blocked:
+                run.append(pair)
+                continue
+            # A short opening gets one entrance in the middle, a long one gets both ends
+            if len(run) >= 6:
+                entrances.extend([run[0], run[-1]])
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+        self._borders[(a, b)] = entrances
+        return entrances
+
+    def _inter_links(self, cluster):
+        """Entrance of this cluster -> the cells across the border it leads to"""
+        links = self._inter.get(cluster)
+        if links is None:
+            links = {}
+            for neighbor in self._cluster_neighbors(cluster):
+                for p, q in self._border(cluster, neighbor):
+                    inside, outside = (p, q) if self._cluster_of(p) == cluster else (q, p)
+                    links.setdefault(inside, []).append(outside)
+            self._inter[cluster] = links
+        return links
+
+    def _intra_edges(self, cluster):
+        """Entrance -> {entrance: steps} inside one cluster, built on first use"""
+        edges = self._intra.get(cluster)
+        if edges is None:
+            edges = self._build_intra(cluster)
+        return edges
+
+    def _build_intra(self, cluster):
+        nodes = self._inter_links(cluster)
+        edges = {}
+        for node in nodes:
+            dist, _ = self._local_bfs(node, cluster)
+            edges[node] = {other: dist[other] for other in nodes if other != node and other in dist}
+        self._intra[cluster] = edges
+        return edges
+
+    def _local_bfs(self, source, cluster, target=None):
+        """Breadth-first search that never leaves the given cluster"""
+        cs = self.cluster_size
+        x0, y0 = cluster[0] * cs, cluster[1] * cs
+        x1, y1 = min(x0 + cs, self.grid_size), min(y0 + cs, self.grid_size)
+        dist = {source: 0}
+        parent = {}
+        frontier = [source]
+        while frontier and target not in dist:
+            next_frontier = []
+            for x, y in frontier:
+                for dx, dy in NEIGHBORS:
+                    neighbor = (x+dx, y+dy)
+                    if x0 <= neighbor[0] < x1 and y0 <= neighbor[1] < y1 \
+                            and neighbor not in dist and neighbor not in self.blocked:
+                        dist[neighbor] = dist[(x, y)] + 1
+                        parent[neighbor] = (x, y)
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        self.cells_touched += len(dist)
+        return dist, parent
+
+    def sync(self, blocks):
+        """Bring the abstract graph up to date with the given blocks"""
+        key = tuple(blocks)
+        if key == self._blocks_key:
+            return
+        self._blocks_key = key
+        blocked = blocked_cells(blocks)
+        changed = blocked ^ self.blocked
+        self.blocked = blocked
+        if changed:
+            self.update_cells(changed)
+
+    def update_cells(self, cells):
+        """Drop the abstract graph around cells whose blocked state changed"""
+        dirty = {self._cluster_of(cell) for cell in cells
+                 if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size}
+        stale = set(dirty)
+        for cluster in dirty:
+            for neighbor in self._cluster_neighbors(cluster):
+                self._borders.pop((min(cluster, neighbor), max(cluster, neighbor)), None)
+                stale.add(neighbor)
+        for cluster in stale:
+            self._intra.pop(cluster, None)
+            self._inter.pop(cluster, None)
+
+    def _abstract_search(self, start, goal):
+        """A* over the entrance graph, returns (steps, route of waypoints)"""
+        start_cluster = self._cluster_of(start)
+        goal_cluster = self._cluster_of(goal)
+        dist, _ = self._local_bfs(start, start_cluster)
+        start_links = {n: dist[n] for n in self._intra_edges(start_cluster) if n in dist and n != start}
+        dist, _ = self._local_bfs(goal, goal_cluster)
+        goal_links = {n: dist[n] for n in self._intra_edges(goal_cluster) if n in dist}
+        # Ties on f go to the entry furthest along, so open boards are not searched in a wide band
+        open_set = [(0, 0, start)]
+        g_score = {start: 0}
+        came_from = {}
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+            if current == goal:
+                route = [goal]
+                while current in came_from:
+                    current = came_from[current]
+                    route.append(current)
+                route.reverse()
+                return g_score[goal], route
+            self.cells_touched += 1
+            if current == start:
+                edges = list(start_links.items())
+            else:
+                edges = list(self._intra_edges(self._cluster_of(current)).get(current, {}).items())
+            edges.extend((other, 1) for other in self._inter_links(self._cluster_of(current)).get(current, ()))
+            if current in goal_links:
+                edges.append((goal, goal_links[current]))
+            for neighbor, cost in edges:
+                temp = g_score[current] + cost
+                if neighbor not in g_score or temp < g_score[neighbor]:
+                    g_score[neighbor] = temp
+                    came_from[neighbor] = current
+                    f = temp + abs(neighbor[0]-goal[0]) + abs(neighbor[1]-goal[1])
+                    heapq.heappush(open_set, (f, -temp, neighbor))
+        return float('inf'), []
+
+    @property
+    def nodes_expanded(self):
+        """Cells and entrances visited, over all queries"""
+        return self._hierarchical_nodes + self._flat.nodes_expanded
+
+    def _is_near(self, start, goal):
+        sx, sy = self._cluster_of(start)
+        gx, gy = self._cluster_of(goal)
+        return abs(sx - gx) + abs(sy - gy) <= 1
+
+    def distance(self, start, goal, blocks):
+        if start == goal:
+            return 0
+        self.sync(blocks)
+        self.cells_touched = 0
+        if self._is_near(start, goal):
+            return self._flat.distance(start, goal, blocks)
+        steps = self._abstract_search(start, goal)[0]
+        self._hierarchical_nodes += self.cells_touched
+        return steps
+
+    def path(self, start, goal, blocks):
+        if start == goal:
+            return [start]
+        self.sync(blocks)
+        self.cells_touched = 0
+        if self._is_near(start, goal):
+            return self._flat.path(start, goal, blocks)
+        _, route = self._abstract_search(start, goal)
+        if not route:
+            self._hierarchical_nodes += self.cells_touched
+            return []  # No path found
+        path = [start]
+        for a, b in zip(route, route[1:]):
+            cluster = self._cluster_of(a)
+            if self._cluster_of(b) != cluster:
+                path.append(b)  # Crossing an entrance is a single step
+                continue
+            _, parent = self._local_bfs(a, cluster, target=b)
+            segment = []
+            cell = b
+            while cell != a:
+                segment.append(cell)
+                cell = parent[cell]
+            path.extend(reversed(segment))
+        self._hierarchical_nodes += self.cells_touched
+        return path
+
+
+class PathService:
+    """Single entry point for distance and path queries with a bounded LRU
+
+    Entries are keyed by ``(start, goal, blocks epoch)``. Whoever owns the
+    blocks list takes a fresh epoch from ``new_epoch()`` every time the list
+    changes, so stale entries are never returned and never need to be purged;
+    they simply age out of the LRU. Returned paths are shared, do not mutate them.
+    """
+
+    def __init__(self, pathfinder, maxsize=4096):
+        self.pathfinder = pathfinder
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._epochs = itertools.count(1)
+
+    def new_epoch(self):
+        """Return an epoch number that has never been used before"""
+        return next(self._epochs)
+
+    def _lookup(self, key):
+        try:
+            value = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _store(self, key, value):
+        self._cache[key] = value
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def distance(self, start, goal, blocks, epoch):
+        key = ("distance", start, goal, epoch)
+        value = self._lookup(key)
+        if value is None:
+            value = self.pathfinder.distance(start, goal, blocks)
+            self._store(key, value)
+        return value
+
+    def path(self, start, goal, blocks, epoch):
+        key = ("path", start, goal, epoch)
+        value = self._lookup(key)
+        if value is None:
+            value = self.pathfinder.path(start, goal, blocks)
+            self._store(key, value)
+        return value
+
+    def stats(self):
+        """Hit/miss counters for profiling overlays and logs"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def occupancy_grid(grid_size, blocks):
+    """Return a uint8 grid with 1 on every blocked cell"""
+    grid = np.zeros((grid_size, grid_size), dtype=np.uint8)
+    for x, y, orientation in blocks:
+        for cx, cy in block_cells(x, y, orientation):
+            if 0 <= cx < grid_size and 0 <= cy < grid_size:
+                grid[cx, cy] = 1
+    return grid
+
+
+
+def batch_distance_fields(free, sources):
+    """Distance fields for a stack of boards in one wavefront (needs NumPy)
+
+    ``free`` is a (boards, size, size) bool array of walkable cells and
+    ``sources`` a (boards, 2) array of start cells. Returns int16 steps from
+    each board's source, -1 where unreachable. All boards advance together,
+    so the cost is one set of array operations per step of the longest path.
+    """
+    boards = np.arange(len(sources))
+    dist = np.full(free.shape, -1, dtype=np.int16)
+    dist[boards, sources[:, 0], sources[:, 1]] = 0
+    frontier = dist == 0
+    unseen = free & ~frontier
+    nxt = np.empty_like(frontier)
+    step = 0
+    while True:
+        nxt[:, 0, :] = False
+        nxt[:, 1:, :] = frontier[:, :-1, :]
+        nxt[:, :-1, :] |= frontier[:, 1:, :]
+        nxt[:, :, 1:] |= frontier[:, :, :-1]
+        nxt[:, :, :-1] |= frontier[:, :, 1:]
+        nxt &= unseen
+        if not nxt.any():
+            return dist
+        step += 1
+        unseen ^= nxt
+        np.putmask(dist, nxt, step)
+        frontier, nxt = nxt, frontier
+
+
+def nearest_source_field(grid_size, blocked, sources):
+    """Steps from every cell to the nearest of sources, -1 where none can be reached
+
+    One breadth-first pass over the board, however many sources there are.
+    Returns a flat sequence indexed ``x * grid_size + y``: a NumPy array on
+    boards at or above the crossover size when NumPy is installed, else a list.
+    """
+    n = grid_size
+    if np is not None and grid_size >= NUMPY_CROSSOVER_GRID_SIZE:
+        free = np.ones((n, n), dtype=bool)
+        if blocked:
+            cells = np.array(list(blocked), dtype=np.intp)
+            inside = (cells >= 0).all(axis=1) & (cells < n).all(axis=1)
+            free[cells[inside, 0], cells[inside, 1]] = False
+        dist = np.full((n, n), -1, dtype=np.int32)
+        if sources:
+            cells = np.array(sources, dtype=np.intp)
+            dist[cells[:, 0], cells[:, 1]] = 0
+        frontier = dist == 0
+        unseen = free & ~frontier
+        nxt = np.empty_like(frontier)
+        step = 0
+        while True:
+            nxt[0, :] = False
+            nxt[1:, :] = frontier[:-1, :]
+            nxt[:-1, :] |= frontier[1:, :]
+            nxt[:, 1:] |= frontier[:, :-1]
+            nxt[:, :-1] |= frontier[:, 1:]
+            nxt &= unseen
+            if not nxt.any():
+                return dist.ravel()
+            step += 1
+            unseen ^= nxt
+            np.putmask(dist, nxt, step)
+            frontier, nxt = nxt, frontier
+    dist = [-1] * (n * n)
+    frontier = []
+    for x, y in sources:
+        if dist[x * n + y] < 0:
+            dist[x * n + y] = 0
+            frontier.append((x, y))
+    step = 0
+    while frontier:
+        step += 1
+        next_frontier = []
+        for x, y in frontier:
+            for dx, dy in NEIGHBORS:
+                nx, ny = x+dx, y+dy
+                if 0 <= nx < n and 0 <= ny < n and dist[nx * n + ny] < 0 and (nx, ny) not in blocked:
+                    dist[nx * n + ny] = step
+                    next_frontier.append((nx, ny))
+        frontier = next_frontier
+    return dist
+
+
+BACKENDS = {
+    "python": PythonPathfinder,
+    "numpy": NumpyPathfinder,
+    "hpa": HierarchicalPathfinder,
+}
+
+
+def available_backends():
+    """Names of the backends that can run in this interpreter"""
+    return [name for name in BACKENDS if name != "numpy" or np is not None]
+
+
+def auto_backend(grid_size):
+    """The backend "auto" stands for on a board of this size
+
+    Python below the measured NumPy crossover, NumPy above it. Both are
+    exact: feedback bands, wins and the fair computer's belief rely on true
+    step counts, so the approximate HPA* is only used when asked for.
+    """
+    return "numpy" if grid_size >= NUMPY_CROSSOVER_GRID_SIZE else "python"
+
+
+def make_pathfinder(backend, grid_size):
+    """Create a pathfinder by name
+
+    ``"auto"`` picks by board size, see ``auto_backend``. Asking for a
+    backend whose dependency is missing falls back to Python.
+    """
+    if backend == "auto":
+        backend = auto_backend(grid_size)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown pathfinding backend: {backend}")
+    if backend not in available_backends():
+        backend = "python"
+    return BACKENDS[backend](grid_size)
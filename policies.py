@@ -0,0 +1,433 @@
+"""Computer seekers as pluggable policies, each with a time budget per decision.
+
+A policy gets a read-only view of the round and returns the action to play,
+in the form ``RoundState.take_action`` takes: ("move", direction),
+("block", x, y, orientation), ("move_target",), or None to pass the turn.
+``decide`` is usually a generator that yields while it searches, so a host
+running many games can advance it a slice at a time; a policy that never
+needs to pause may return its action straight away.
+
+``RoundState.computer_turn`` runs the policy named by
+``computer_difficulty``. It adds up the CPU time the decision takes, and
+when a policy is still searching past its ``budget`` it is stopped at its
+next yield and the turn is played by its cheap ``fallback`` policy instead.
+Every decision's time goes into a histogram per policy, along with the
+overruns and any actions the rules refused, in ``RoundState.policy_stats``.
+
+The built-in difficulties are the policies "normal", "hard" and "fair".
+Others are added with ``register`` and picked the same way::
+
+    class Wanderer(policies.Policy):
+        def decide(self, view):
+            moves = view.legal_moves(2)
+            return ("move", view.rng.choice(moves)[0]) if moves else None
+
+    policies.register("wanderer", Wanderer)
+    r.computer_difficulty = "wanderer"
+"""
+import bisect
+import time
+
+import belief
+import core
+
+DEFAULT_BUDGET = 0.1  # CPU seconds per decision
+# Upper edges of the latency histogram's buckets in ms, the last bucket holds everything slower
+LATENCY_EDGES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+ORIENTATIONS = ("horizontal", "vertical")
+MIN_BLOCK_IMPACT = 1  # steps a block must add to Tom's path to be worth placing
+
+# What a policy may read through its view: the board, the seekers and the rules' queries
+VISIBLE = frozenset([
+    "grid_size", "rng", "state", "seeker1_pos", "seeker2_pos", "hidden_pos", "hiding_spots",
+    "gift_box_location", "blocks", "blocks_epoch", "player1_blocks_remaining", "player2_blocks_remaining",
+    "player1_moved_target", "player2_moved_target", "player1_frozen_turns", "player2_frozen_turns",
+    "last_feedback", "feedback_text", "seeker_pos", "legal_moves", "is_position_blocked", "can_place_block",
+    "legal_placement", "a_star_distance", "a_star_path", "get_feedback", "get_player_likely_path",
+    "trial_block", "trial_distances", "block_table",
+])
+# Hidden from policies that play fair and only know what is on screen
+PEEKING = frozenset(["hidden_pos", "get_player_likely_path", "trial_distances", "block_table"])
+
+
+class StateView:
+    """Read-only view of a RoundState for a policy, lists are handed out as tuples
+
+    ``trial_block`` is the one way to change the board, and it puts the
+    block back when its ``with`` ends.
+    """
+
+    def __init__(self, r, peeks=True):
+        object.__setattr__(self, "_r", r)
+        object.__setattr__(self, "_peeks", peeks)
+
+    def __getattr__(self, name):
+        if name not in VISIBLE or (not self._peeks and name in PEEKING):
+            raise AttributeError(f"policies cannot read {name!r}")
+        value = getattr(self._r, name)
+        return tuple(value) if isinstance(value, list) else value
+
+    def __setattr__(self, name, value):
+        raise AttributeError("a policy's view of the round is read-only")
+
+
+class Policy:
+    """Base class for computer seekers, which always play as player 2"""
+
+    name = None  # set by register
+    budget = DEFAULT_BUDGET  # CPU seconds per decision, None for no limit
+    fallback = "greedy"  # the policy that plays the turn when this one runs over
+    peeks = True  # False to be refused Jerry's position and the queries that use it
+
+    def __init__(self):
+        self.branch = None  # what the last decision chose, for telemetry
+        self.search = None  # the last block search's candidates and best score, for telemetry
+
+    def decide(self, view):
+        """The action to play, usually as a generator that yields while it searches"""
+        raise NotImplementedError
+
+    # --- Hooks from the rules, no-ops unless a policy remembers something ---
+
+    def on_new_round(self):
+        pass
+
+    def on_target_moved(self, view):
+        pass
+
+    def on_played(self, view):
+        """Called after every computer turn with the round as the action left it"""
+        pass
+
+
+class LatencyHistogram:
+    """CPU time of a policy's decisions, counted in buckets"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_EDGES_MS) + 1)
+        self.decisions = 0
+        self.seconds = 0.0
+        self.slowest = 0.0
+        self.overruns = 0  # decisions that went over the budget
+        self.rejected = 0  # actions the rules did not allow, played as a pass
+
+    def add(self, seconds, overrun=False):
+        self.counts[bisect.bisect_left(LATENCY_EDGES_MS, seconds * 1000)] += 1
+        self.decisions += 1
+        self.seconds += seconds
+        self.slowest = max(self.slowest, seconds)
+        self.overruns += overrun
+
+    def percentile(self, p):
+        """Upper edge in ms of the bucket holding the p-th percentile, inf past the last edge"""
+        if not self.decisions:
+            return 0
+        rank = p / 100 * self.decisions
+        seen = 0
+        for edge, count in zip(LATENCY_EDGES_MS + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return edge
+        return float('inf')
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.decisions += other.decisions
+        self.seconds += other.seconds
+        self.slowest = max(self.slowest, other.slowest)
+        self.overruns += other.overruns
+        self.rejected += other.rejected
+
+
+def print_stats(stats):
+    """One line per policy from a name -> LatencyHistogram dict"""
+    for name, h in sorted(stats.items()):
+        if not h.decisions:
+            continue
+        print(f"{name:<10} {h.decisions:>6} decisions, mean {h.seconds / h.decisions * 1000:7.2f} ms,"
+              f" p50 <= {h.percentile(50)} ms, p99 <= {h.percentile(99)} ms, slowest {h.slowest * 1000:.1f} ms,"
+              f" {h.overruns} over budget, {h.rejected} refused")
+
+
+def timed_decision(policy, view, stats, budget):
+    """Run policy.decide(view) a slice at a time, returns (action, whether it was stopped for overrunning)
+
+    Only the CPU time inside the policy's own slices counts, so games
+    running in between do not use up its budget.
+    """
+    policy.branch = None
+    policy.search = None
+    start = time.process_time()
+    decision = policy.decide(view)
+    elapsed = time.process_time() - start
+    if not hasattr(decision, "send"):
+        overrun = budget is not None and elapsed > budget
+        stats.add(elapsed, overrun)
+        return decision, False
+    while True:
+        start = time.process_time()
+        try:
+            next(decision)
+        except StopIteration as done:
+            elapsed += time.process_time() - start
+            # A late answer is still played, there is nothing left to save by dropping it
+            stats.add(elapsed, budget is not None and elapsed > budget)
+            return done.value, False
+        elapsed += time.process_time() - start
+        if budget is not None and elapsed > budget:
+            decision.close()
+            stats.add(elapsed, True)
+            return None, True
+        yield
+
+
+def blocking_pays(player_dist, computer_dist):
+    """Tom is close to Jerry, or closer than the computer"""
+    return (player_dist <= 5 and computer_dist > player_dist) or player_dist <= 3 or player_dist < computer_dist
+
+
+def holding_lead(player_dist, computer_dist):
+    """As blocking_pays, or the computer is close and Tom not far behind it"""
+    return blocking_pays(player_dist, computer_dist) or (computer_dist <= 4 and player_dist <= computer_dist + 2)
+
+
+def block_search(view, hard=False):
+    """The block that lengthens Tom's path to Jerry the most, or None; yields after every cell it tries
+
+    Returns (block, search), search being the candidates and best score for
+    telemetry when the full search ran. Hard adds a bonus for blocks that add
+    3 or more steps and for blocks next to Jerry.
+    """
+    hidden = view.hidden_pos
+    player_dist = view.a_star_distance(view.seeker1_pos, hidden)
+    computer_dist = view.a_star_distance(view.seeker2_pos, hidden)
+    # Only worth it while Tom is closer to Jerry than the computer
+    if player_dist >= computer_dist:
+        return None, None
+    best_block = None
+    best_impact = 0
+    best_score = -1
+    candidates = 0
+    table = view.block_table()
+    for x in range(view.grid_size):
+        for y in range(view.grid_size):
+            for orientation in ORIENTATIONS:
+                if not view.can_place_block(x, y, orientation):
+                    continue
+                candidates += 1
+                new_player_dist, new_computer_dist = view.trial_distances(x, y, orientation, table)
+                player_impact = new_player_dist - player_dist
+                # Higher score if it blocks Tom more and the computer less
+                score = core.block_score(player_dist, computer_dist, new_player_dist, new_computer_dist, x, y,
+                                         hidden, hard)
+                if player_impact > best_impact and new_player_dist != float('inf') and score > best_score:
+                    best_impact = player_impact
+                    best_score = score
+                    best_block = (x, y, orientation)
+            yield
+    search = {"candidates": candidates, "best_block": best_block, "best_score": best_score,
+              "best_impact": best_impact}
+    if best_block and best_impact >= MIN_BLOCK_IMPACT:
+        return best_block, search
+    # Otherwise any block on Tom's next few steps, or next to him when he is close, that slows him down
+    cells = list(view.get_player_likely_path()[1:4])
+    if player_dist <= 4:
+        x, y = view.seeker1_pos
+        cells += [(x + dx, y + dy) for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                  if 0 <= x + dx < view.grid_size and 0 <= y + dy < view.grid_size]
+    for x, y in cells:
+        for orientation in ORIENTATIONS:
+            if view.can_place_block(x, y, orientation):
+                with view.trial_block(x, y, orientation):
+                    new_player_dist = view.a_star_distance(view.seeker1_pos, hidden)
+                if player_dist < new_player_dist != float('inf'):
+                    return (x, y, orientation), search
+    return None, search
+
+
+def step_towards(view, goal):
+    """("move", direction) for the first step of the shortest path to goal, None if there is none"""
+    path = view.a_star_path(view.seeker2_pos, goal)
+    if len(path) < 2:
+        return None
+    for direction, cell in view.legal_moves(2):
+        if cell == tuple(path[1]):
+            return ("move", direction)
+    return None
+
+
+class SearchPolicy(Policy):
+    """The normal and hard computers, which know where Jerry is and search for blocks"""
+
+    hard = False
+    block_chances = ()  # (when, probability) of trying a block, in order
+
+    def __init__(self):
+        super().__init__()
+        self.previous = None  # the cell the computer last moved from
+
+    def on_new_round(self):
+        self.previous = None
+
+    def decide(self, view):
+        hidden = view.hidden_pos
+        computer_dist = view.a_star_distance(view.seeker2_pos, hidden)
+        player_dist = view.a_star_distance(view.seeker1_pos, hidden)
+        # Move Jerry when the computer is far and Tom is getting close
+        if not view.player2_moved_target and computer_dist > 6 and player_dist <= 4:
+            self.branch = "move_target"
+            return ("move_target",)
+        # Go for the gift if it is on the way, or if freezing Tom would let the computer catch up
+        gift = view.gift_box_location
+        if gift and (gift in view.a_star_path(view.seeker2_pos, hidden)
+                     or (player_dist < computer_dist and computer_dist - player_dist <= 2)):
+            action = step_towards(view, gift)
+            if action is not None:
+                self.branch = "gift"
+                return action
+        for when, chance in self.block_chances:
+            if when(player_dist, computer_dist) and view.player2_blocks_remaining > 0 and view.rng.random() < chance:
+                block, self.search = yield from block_search(view, self.hard)
+                if block is not None:
+                    self.branch = "block"
+                    return ("block",) + block
+        self.branch = "move"
+        return self.move(view, computer_dist)
+
+    def move(self, view, distance):
+        raise NotImplementedError
+
+
+class NormalPolicy(SearchPolicy):
+    block_chances = ((blocking_pays, 0.5),)
+
+    def move(self, view, distance):
+        """Towards Jerry, else sideways without stepping back, else anywhere"""
+        moves = view.legal_moves(2)
+        if not moves:
+            return None
+        distances = [view.a_star_distance(cell, view.hidden_pos) for _, cell in moves]
+        best = min(distances)
+        if best < distance:
+            choices = [name for (name, _), d in zip(moves, distances) if d == best]
+        else:
+            choices = [name for (name, cell), d in zip(moves, distances) if d == distance and cell != self.previous]
+            choices = choices or [name for name, _ in moves]
+        self.previous = view.seeker2_pos
+        return ("move", view.rng.choice(choices))
+
+
+class HardPolicy(SearchPolicy):
+    hard = True
+    block_chances = ((holding_lead, 0.9), (blocking_pays, 0.5))
+
+    def move(self, view, distance):
+        """The first of the moves that get closest to Jerry"""
+        moves = view.legal_moves(2)
+        if not moves:
+            return None
+        name, _ = min(moves, key=lambda move: view.a_star_distance(move[1], view.hidden_pos))
+        return ("move", name)
+
+
+class FairPolicy(Policy):
+    """Only knows what a human sees: the board and the feedback, learnt into a belief over the spots"""
+
+    peeks = False
+    fallback = "random"
+
+    def __init__(self):
+        super().__init__()
+        self.belief = None  # belief.SpotBelief for this round, made on the first turn
+
+    def on_new_round(self):
+        self.belief = None
+
+    def on_target_moved(self, view):
+        if self.belief is not None:
+            self.belief.target_moved((view.seeker1_pos, view.seeker2_pos))
+
+    def on_played(self, view):
+        # The computer's own feedback is on screen now
+        if self.belief is not None:
+            self.observe(view)
+
+    def observe(self, view):
+        """Feed the feedback on screen into the belief"""
+        self.belief.sync(view.blocks, view.blocks_epoch)
+        if view.last_feedback is not None:
+            pos, feedback, epoch = view.last_feedback
+            # Feedback from before a block was placed used other distances
+            if epoch == view.blocks_epoch:
+                self.belief.observe(pos, feedback)
+
+    def decide(self, view):
+        if self.belief is None:
+            self.belief = belief.SpotBelief(view.grid_size, view.hiding_spots)
+        self.belief.sync(view.blocks, view.blocks_epoch)
+        # Fields a new block changed are repaired a spot at a time, so the budget can stop the work
+        for _ in self.belief.repairs():
+            yield
+        self.observe(view)
+        # Move Target when Tom's feedback says he is close and we are not
+        if not view.player2_moved_target and view.last_feedback is not None:
+            pos, feedback, _ = view.last_feedback
+            if pos == view.seeker1_pos and feedback in ("BURNING", "HOT") \
+                    and self.belief.expected_distance([view.seeker2_pos])[0] > 6:
+                self.branch = "move_target"
+                return ("move_target",)
+        moves = view.legal_moves(2)
+        if not moves:
+            return None
+        scores = self.belief.score_moves([cell for _, cell in moves])
+        for i, (_, cell) in enumerate(moves):
+            if cell == view.gift_box_location:
+                scores[i] += 1.0  # the gift box is in plain sight
+        best = [name for (name, _), score in zip(moves, scores) if score >= scores.max() - 1e-9]
+        self.branch = "move"
+        return ("move", view.rng.choice(best))
+
+
+class GreedyPolicy(Policy):
+    """One step along the shortest path to Jerry, the fallback of the computers that peek"""
+
+    budget = None
+
+    def decide(self, view):
+        self.branch = "move"
+        return step_towards(view, view.hidden_pos)
+
+
+class RandomPolicy(Policy):
+    """Any legal move, the fallback that costs nothing and knows nothing"""
+
+    budget = None
+    peeks = False
+
+    def decide(self, view):
+        moves = view.legal_moves(2)
+        self.branch = "move"
+        return ("move", view.rng.choice(moves)[0]) if moves else None
+
+
+POLICIES = {}
+
+
+def register(name, factory):
+    """Make a policy available as a computer_difficulty, factory() returns a new Policy"""
+    POLICIES[name] = factory
+
+
+def make(name):
+    if name not in POLICIES:
+        raise ValueError(f"Unknown policy {name!r}, expected one of {sorted(POLICIES)}")
+    policy = POLICIES[name]()
+    policy.name = name
+    return policy
+
+
+register("normal", NormalPolicy)
+register("hard", HardPolicy)
+register("fair", FairPolicy)
+register("greedy", GreedyPolicy)
+register("random", RandomPolicy)
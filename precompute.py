@@ -0,0 +1,197 @@
+"""Block search tables kept on disk, keyed by board layout.
+
+The computer's block search tries every anchor on the board and asks how far
+both seekers would be from Jerry with a block there. Those answers depend
+only on the board and on Jerry's cell, not on the turn, so they are worked
+out once per board and hiding spot and kept in a table: the distance from
+the spot to every cell, first with the blocks already down, then with each
+possible extra block added (every anchor inside the board that is clear of
+blocks, hiding spots and the gift box). A search then reads its distances
+from the table instead of running two pathfinding searches per anchor.
+
+A board is identified by a hash of its grid size, hiding spots, gift box
+and blocks, so seeded runs that replay the same boards find their tables
+already built. Each table is one file of 16-bit distances, read back through
+a read-only memory map. The directory is kept under a byte budget by
+deleting the least recently used tables.
+"""
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from collections import OrderedDict
+
+from pathfinding import NEIGHBORS, block_cells, blocked_cells
+
+MAGIC = b"HSTABL01"
+# magic, grid size, candidate count
+HEADER = struct.Struct("<8sHxxI")
+UNREACHABLE = 0xFFFF
+ORIENTATIONS = ["horizontal", "vertical"]
+# Tables grow with cells squared, larger boards search as before
+MAX_CELLS = 400
+MAX_BYTES = 64 * 1024 * 1024
+OPEN_TABLES = 16
+
+
+def layout_key(grid_size, spots, gift, blocks):
+    """Hash of everything the tables depend on, the same whatever order spots and blocks come in"""
+    board = (grid_size, sorted(tuple(s) for s in spots), tuple(gift) if gift is not None else None,
+             sorted(tuple(b) for b in blocks))
+    return hashlib.blake2b(repr(board).encode(), digest_size=16).hexdigest()
+
+
+def candidates(grid_size, spots, gift, blocks):
+    """Anchors a block could take on this board, in the order the block search tries them"""
+    taken = blocked_cells(blocks)
+    taken.update(tuple(s) for s in spots)
+    if gift is not None:
+        taken.add(tuple(gift))
+    found = []
+    for x in range(grid_size):
+        for y in range(grid_size):
+            for orientation in ORIENTATIONS:
+                cells = block_cells(x, y, orientation)
+                if all(0 <= cx < grid_size and 0 <= cy < grid_size and (cx, cy) not in taken for cx, cy in cells):
+                    found.append((x, y, orientation))
+    return found
+
+
+def distance_field(grid_size, blocked, source):
+    """Steps from source to every cell, UNREACHABLE where it cannot get"""
+    field = array("H", [UNREACHABLE]) * (grid_size * grid_size)
+    field[source[0] * grid_size + source[1]] = 0
+    frontier = [source]
+    steps = 0
+    while frontier:
+        steps += 1
+        next_frontier = []
+        for x, y in frontier:
+            for dx, dy in NEIGHBORS:
+                nx, ny = x+dx, y+dy
+                if 0 <= nx < grid_size and 0 <= ny < grid_size and (nx, ny) not in blocked:
+                    i = nx * grid_size + ny
+                    if field[i] == UNREACHABLE:
+                        field[i] = steps
+                        next_frontier.append((nx, ny))
+        frontier = next_frontier
+    return field
+
+
+def write_table(path, grid_size, spots, gift, blocks, spot):
+    """Work out the table for Jerry on spot and write it to path"""
+    anchors = candidates(grid_size, spots, gift, blocks)
+    blocked = blocked_cells(blocks)
+    data = array("H")
+    for x, y, orientation in anchors:
+        data.extend((x, y, ORIENTATIONS.index(orientation)))
+    data.extend(distance_field(grid_size, blocked, spot))
+    for x, y, orientation in anchors:
+        data.extend(distance_field(grid_size, blocked.union(block_cells(x, y, orientation)), spot))
+    # Written under a temporary name first, so parallel runs never read half a table
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, grid_size, len(anchors)))
+        f.write(data.tobytes())
+    os.replace(temporary, path)
+
+
+class Table:
+    """Distances to one hiding spot on one board, through a read-only memory map"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # an empty file
+            self._file.close()
+            raise
+        if len(self._map) < HEADER.size or len(self._map) % 2:
+            self.close()
+            raise ValueError(f"{path} is not a complete block search table")
+        magic, self.grid_size, count = HEADER.unpack_from(self._map)
+        self._view = memoryview(self._map)
+        self._values = self._view[HEADER.size:].cast("H")
+        if magic != MAGIC or len(self._values) != count * 3 + (count + 1) * self.grid_size ** 2:
+            self.close()
+            raise ValueError(f"{path} is not a complete block search table")
+        anchors = self._values[:count * 3]
+        # Row 0 is the board as it is, row i + 1 has candidate i added
+        self.rows = {(anchors[i], anchors[i + 1], ORIENTATIONS[anchors[i + 2]]): i // 3 + 1
+                     for i in range(0, count * 3, 3)}
+        self._fields = self._values[count * 3:]
+
+    def distance(self, cell, block=None):
+        """Steps from cell to the spot, with block added if given (it must be one of the rows)"""
+        row = self.rows[block] if block is not None else 0
+        n = self.grid_size
+        steps = self._fields[row * n * n + cell[0] * n + cell[1]]
+        return float('inf') if steps == UNREACHABLE else steps
+
+    def close(self):
+        for view in ("_fields", "_values", "_view"):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        self._map.close()
+        self._file.close()
+
+
+class TableCache:
+    """Tables in a directory, at most max_bytes of them, least recently used deleted first"""
+
+    def __init__(self, directory, max_bytes=MAX_BYTES, max_cells=MAX_CELLS):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_cells = max_cells
+        self.hits = 0  # tables found on disk
+        self.builds = 0
+        self._open = OrderedDict()  # file name -> Table
+
+    def get(self, grid_size, spots, gift, blocks, spot):
+        """The table for Jerry on spot, built if no earlier run left it; None on boards too large"""
+        if grid_size * grid_size > self.max_cells:
+            return None
+        name = f"{layout_key(grid_size, spots, gift, blocks)}-{spot[0]}-{spot[1]}.tbl"
+        table = self._open.get(name)
+        if table is not None:
+            self._open.move_to_end(name)
+            return table
+        path = os.path.join(self.directory, name)
+        try:
+            table = Table(path)
+            os.utime(path)  # the modification time orders eviction
+            self.hits += 1
+        except (OSError, ValueError):
+            write_table(path, grid_size, spots, gift, blocks, spot)
+            table = Table(path)
+            self.builds += 1
+            self.evict()
+        self._open[name] = table
+        if len(self._open) > OPEN_TABLES:
+            self._open.popitem(last=False)[1].close()
+        return table
+
+    def evict(self):
+        """Delete the least recently used tables until the directory fits in max_bytes"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".tbl"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if os.path.basename(path) in self._open:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # in use by another process on Windows, try the next one
+            total -= size
+
+    def close(self):
+        while self._open:
+            self._open.popitem()[1].close()
@@ -0,0 +1,244 @@
+"""Recorded games with keyframes for fast seeking.
+
+A replay file holds one frame per turn. Every ``keyframe_interval`` frames,
+and whenever a new round starts, the frame is a keyframe with the full
+board: positions, blocks, hiding spots, gift box, freeze counters, scores.
+The frames in between only store the fields that changed and the blocks
+placed that turn. The header points to an index of (frame, offset) pairs
+for the keyframes, so seeking to any turn decodes one keyframe and at most
+``keyframe_interval`` small deltas, however long the game is.
+
+Files are read through a read-only memory map and decoded in place::
+
+    python hide_seek_game.py --record game.hsr
+    python hide_seek_game.py --replay game.hsr
+"""
+import bisect
+import mmap
+import struct
+
+from belief import FEEDBACK_BANDS
+from rules import GameState
+
+MAGIC = b"HSREPL01"
+# magic, grid size, keyframe interval, frame count, keyframe count, index offset
+HEADER = struct.Struct("<8sHHQQQ")
+KEYFRAME_INTERVAL = 64
+KEY = 0
+DELTA = 1
+NONE = 0xFFFFFFFF
+
+# Small enumerations stored by position
+STATES = list(GameState)
+MODES = [None, "pvc", "pvp"]
+FACINGS = ["idle", "up", "down", "left", "right"]
+FEEDBACK = [""] + FEEDBACK_BANDS
+WINNERS = [None, "Tom (Player 1)", "Spike (Player 2)", "Computer"]
+ORIENTATIONS = ["horizontal", "vertical"]
+
+FIELDS = ["state", "game_mode", "last_game_mode", "seeker1_x", "seeker1_y", "seeker2_x", "seeker2_y",
+          "hidden_x", "hidden_y", "gift_x", "gift_y", "player1_frozen_turns", "player2_frozen_turns",
+          "player1_blocks_remaining", "player2_blocks_remaining", "player1_moved_target",
+          "player2_moved_target", "score_tom", "score_spike", "score_computer", "tom_direction",
+          "spike_direction", "feedback_text", "winner"]
+SCALARS = struct.Struct(f"<{len(FIELDS)}I")
+COUNT = struct.Struct("<H")
+CHANGE = struct.Struct("<BI")
+BLOCK = struct.Struct("<HHB")
+CELL = struct.Struct("<HH")
+
+
+def scalars(r):
+    """The fixed-size part of a round as a tuple of integers"""
+    hidden = r.hidden_pos if r.hidden_pos is not None else (NONE, NONE)
+    gift = r.gift_box_location if r.gift_box_location is not None else (NONE, NONE)
+    return (STATES.index(r.state), MODES.index(r.game_mode), MODES.index(r.last_game_mode),
+            *r.seeker1_pos, *r.seeker2_pos, *hidden, *gift,
+            r.player1_frozen_turns, r.player2_frozen_turns,
+            r.player1_blocks_remaining, r.player2_blocks_remaining,
+            int(r.player1_moved_target), int(r.player2_moved_target),
+            r.scores["Tom"], r.scores["Spike"], r.scores["Computer"],
+            FACINGS.index(r.tom_direction), FACINGS.index(r.spike_direction),
+            FEEDBACK.index(r.feedback_text), WINNERS.index(r.winner))
+
+
+def apply_scalars(r, values):
+    (state, mode, last_mode, s1x, s1y, s2x, s2y, hx, hy, gx, gy, frozen1, frozen2, blocks1, blocks2,
+     moved1, moved2, tom, spike, computer, facing1, facing2, feedback, winner) = values
+    r.state = STATES[state]
+    r.game_mode = MODES[mode]
+    r.last_game_mode = MODES[last_mode]
+    r.seeker1_pos = (s1x, s1y)
+    r.seeker2_pos = (s2x, s2y)
+    r.hidden_pos = (hx, hy) if hx != NONE else None
+    r.gift_box_location = (gx, gy) if gx != NONE else None
+    r.player1_frozen_turns, r.player2_frozen_turns = frozen1, frozen2
+    r.player1_blocks_remaining, r.player2_blocks_remaining = blocks1, blocks2
+    r.player1_moved_target, r.player2_moved_target = bool(moved1), bool(moved2)
+    r.scores = {"Tom": tom, "Spike": spike, "Computer": computer}
+    r.tom_direction, r.spike_direction = FACINGS[facing1], FACINGS[facing2]
+    r.feedback_text = FEEDBACK[feedback]
+    r.winner = WINNERS[winner]
+
+
+class ReplayWriter:
+    """Append a frame for every change of a round"""
+
+    def __init__(self, path, grid_size, keyframe_interval=KEYFRAME_INTERVAL):
+        self._file = open(path, "wb")
+        self.grid_size = grid_size
+        self.keyframe_interval = keyframe_interval
+        self.frames = 0
+        self._index = []  # (frame, offset) of every keyframe
+        self._last = None  # (scalars, blocks, hiding spots) of the previous frame
+        self._since_key = 0
+        self._file.write(HEADER.pack(MAGIC, grid_size, keyframe_interval, 0, 0, 0))
+
+    def record(self, r):
+        """Write a frame if anything changed since the last one, returns True if it did"""
+        values = scalars(r)
+        blocks = tuple(r.blocks)
+        spots = tuple(r.hiding_spots)
+        last = self._last
+        if last is not None and values == last[0] and blocks == last[1] and spots == last[2]:
+            return False
+        out = bytearray()
+        new_round = last is None or spots != last[2] or blocks[:len(last[1])] != last[1]
+        if new_round or self._since_key >= self.keyframe_interval:
+            self._index.append((self.frames, self._file.tell()))
+            self._since_key = 0
+            out.append(KEY)
+            out += SCALARS.pack(*values)
+            self._pack_blocks(out, blocks)
+            out += COUNT.pack(len(spots))
+            for cell in spots:
+                out += CELL.pack(*cell)
+        else:
+            changes = [(i, v) for i, (v, old) in enumerate(zip(values, last[0])) if v != old]
+            out.append(DELTA)
+            out.append(len(changes))
+            for change in changes:
+                out += CHANGE.pack(*change)
+            self._pack_blocks(out, blocks[len(last[1]):])
+        self._file.write(out)
+        self._last = (values, blocks, spots)
+        self._since_key += 1
+        self.frames += 1
+        return True
+
+    @staticmethod
+    def _pack_blocks(out, blocks):
+        out += COUNT.pack(len(blocks))
+        for x, y, orientation in blocks:
+            out += BLOCK.pack(x, y, ORIENTATIONS.index(orientation))
+
+    def close(self):
+        """Write the keyframe index and fill in the header"""
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        for frame, offset in self._index:
+            self._file.write(struct.pack("<QQ", frame, offset))
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, self.grid_size, self.keyframe_interval, self.frames,
+                                     len(self._index), index_offset))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplayFile:
+    """Random access to a recorded game through a read-only memory map
+
+    Seeking forward from the last frame shown only decodes the frames in
+    between, so playback costs one delta per frame.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.grid_size, self.keyframe_interval, self.count, keyframes, index_offset = \
+            HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+        self._view = memoryview(self._map)
+        index = self._view[index_offset:index_offset + 16 * keyframes].cast("Q")
+        self._key_frames = index[0::2].tolist()
+        self._key_offsets = index[1::2].tolist()
+        index.release()
+        self._cursor = None  # (frame, offset after it, scalars, blocks, hiding spots)
+
+    def __len__(self):
+        return self.count
+
+    def frame(self, index):
+        """Return (scalars, blocks, hiding spots) of frame number index"""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        key = bisect.bisect_right(self._key_frames, index) - 1
+        cursor = self._cursor
+        if cursor is not None and self._key_frames[key] <= cursor[0] <= index:
+            frame, offset, values, blocks, spots = cursor
+            values = list(values)
+            blocks = list(blocks)
+        else:
+            frame = self._key_frames[key]
+            offset, values, blocks, spots = self._read_key(self._key_offsets[key])
+        while frame < index:
+            offset = self._read_delta(offset + 1, values, blocks)
+            frame += 1
+        self._cursor = (frame, offset, tuple(values), tuple(blocks), spots)
+        return self._cursor[2:]
+
+    def _read_key(self, offset):
+        view = self._view
+        offset += 1
+        values = list(SCALARS.unpack_from(view, offset))
+        offset += SCALARS.size
+        blocks = []
+        offset = self._read_blocks(offset, blocks)
+        (count,) = COUNT.unpack_from(view, offset)
+        offset += COUNT.size
+        end = offset + count * CELL.size
+        spots = tuple(CELL.iter_unpack(view[offset:end]))
+        return end, values, blocks, spots
+
+    def _read_delta(self, offset, values, blocks):
+        view = self._view
+        count = view[offset]
+        offset += 1
+        for field, value in CHANGE.iter_unpack(view[offset:offset + count * CHANGE.size]):
+            values[field] = value
+        return self._read_blocks(offset + count * CHANGE.size, blocks)
+
+    def _read_blocks(self, offset, blocks):
+        (count,) = COUNT.unpack_from(self._view, offset)
+        offset += COUNT.size
+        end = offset + count * BLOCK.size
+        blocks.extend((x, y, ORIENTATIONS[o]) for x, y, o in BLOCK.iter_unpack(self._view[offset:end]))
+        return end
+
+    def restore(self, r, index):
+        """Put a round in the state of frame number index"""
+        values, blocks, spots = self.frame(index)
+        apply_scalars(r, values)
+        if list(blocks) != r.blocks:
+            r.blocks = list(blocks)
+            r.blocks_epoch = r.path_service.new_epoch()
+        r.hiding_spots = list(spots)
+
+    def close(self):
+        self._cursor = None
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,507 @@
+"""Rules of a hide and seek round, independent of pygame.
+
+``RoundState`` holds everything that decides who wins: the board layout,
+seeker positions, blocks, the gift box, freeze counters and turn order, plus
+the computer opponent. The interactive game subclasses it and overrides the
+``on_*`` hooks to play sounds and animations. Headless users (training
+environments, servers, tools) use it directly.
+"""
+import random
+from contextlib import contextmanager
+from enum import Enum
+
+import core
+import layouts
+import pathfinding
+import policies
+import telemetry
+from connectivity import ConnectivityIndex
+
+GRID_SIZE = 10
+
+# Row/column step for each movement direction
+DIRECTIONS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
+# Placement mask values: the cheap checks passed but connectivity was not asked yet
+ILLEGAL, LEGAL, UNCHECKED = 0, 1, 2
+
+
+class GameState(Enum):
+    MENU = 1
+    PLAYER1_TURN = 2
+    PLAYER2_TURN = 3
+    GAME_OVER = 4
+
+
+class RoundState:
+    def __init__(self, grid_size=GRID_SIZE, pathfinding_backend="auto", layout_source=None, rng=random,
+                 path_service=None):
+        layout_grid_size = getattr(layout_source, "grid_size", grid_size)
+        if layout_grid_size != grid_size:
+            raise ValueError(f"The layouts are for a {layout_grid_size}x{layout_grid_size} board, "
+                             f"not {grid_size}x{grid_size}")
+        self.grid_size = grid_size
+        self.rng = rng  # the random module or a seeded random.Random
+        self.game_mode = None  # 'pvc' or 'pvp'
+        self.computer_difficulty = "normal"  # the computer's policy: 'normal', 'hard', 'fair' or a registered one
+        self.player1_moved_target = False
+        self.player2_moved_target = False
+        # Pathfinding backend: "python", "numpy", "hpa" or "auto" (picks by board size)
+        # All distance/path queries go through one cached service, which many
+        # games may share: every game gets its own blocks epochs from it
+        if path_service is None:
+            path_service = pathfinding.PathService(pathfinding.make_pathfinder(pathfinding_backend, grid_size))
+        self.path_service = path_service
+
+        # Block system variables
+        self.blocks = []  # List of block positions and orientations
+        self.blocks_epoch = self.path_service.new_epoch()  # Changes whenever self.blocks changes
+        self.connectivity = ConnectivityIndex(grid_size)
+        self._placement_masks = {}  # orientation -> (board signature, mask)
+        self.player1_blocks_remaining = 1
+        self.player2_blocks_remaining = 1
+
+        self.tom_direction = "idle"
+        self.spike_direction = "idle"
+
+        self.state = GameState.MENU
+        self.seeker1_pos, self.seeker2_pos = layouts.start_positions(grid_size)
+        self.hidden_pos = None
+        self.feedback_text = ""
+        self.last_feedback = None  # (cell, feedback, blocks epoch) last shown on screen
+        self._policies = {}  # name -> the policies.Policy playing it in this game
+        self.policy_stats = {}  # policy name -> policies.LatencyHistogram of its decisions
+        self.telemetry = None  # optional telemetry sink that gets a record of every computer turn
+        self.table_cache = None  # optional precompute.TableCache, many games may share one
+        self.ai_branch = None  # what the computer's last turn did, for telemetry
+        self.ai_fallback = False  # whether the last turn was played by the fallback policy
+        self.ai_block_search = None  # the last block search's candidates and best score
+        self.winner = None
+        self.hiding_spots = []
+        # Optional iterable of pre-generated (hiding_spots, gift_box) layouts, e.g. a layouts.LayoutFile
+        self._layouts = layout_source
+        self.layout_source = iter(layout_source) if layout_source is not None else None
+        self.gift_box_location = None
+        self.generate_hiding_spots()
+
+        # Freeze state
+        self.player1_frozen_turns = 0
+        self.player2_frozen_turns = 0
+
+        # --- Score tracking ---
+        self.scores = {"Tom": 0, "Spike": 0, "Computer": 0}
+        self.last_game_mode = None
+
+    # --- Hooks for the presentation layer, no-ops when headless ---
+
+    def on_gift_collected(self, player, pos):
+        pass
+
+    def on_target_moved(self, old_pos):
+        pass
+
+    def on_unfrozen(self, player):
+        pass
+
+    def on_round_over(self, player):
+        pass
+
+    def reset_round(self, layout=None, hidden_pos=None):
+        """Lay out a new board and put both seekers back on their start cells
+
+        ``layout`` (hiding spots, gift box) and ``hidden_pos`` replay a board
+        that was drawn elsewhere, e.g. by a network server.
+        """
+        if layout is None:
+            self.generate_hiding_spots()
+        else:
+            self.hiding_spots, self.gift_box_location = layout
+        self.hidden_pos = hidden_pos if hidden_pos is not None else self.rng.choice(self.hiding_spots)
+        self.seeker1_pos, self.seeker2_pos = layouts.start_positions(self.grid_size)
+        self.feedback_text = ""
+        self.last_feedback = None
+        for policy in self._policies.values():
+            policy.on_new_round()
+        self.winner = None
+        self.tom_direction = "idle"
+        self.spike_direction = "idle"
+        self.state = GameState.PLAYER1_TURN
+        self.player1_moved_target = False
+        self.player2_moved_target = False
+        # Reset block system
+        self.blocks = []
+        self.blocks_epoch = self.path_service.new_epoch()
+        self.player1_blocks_remaining = 1
+        self.player2_blocks_remaining = 1
+        # Reset freeze state
+        self.player1_frozen_turns = 0
+        self.player2_frozen_turns = 0
+        # Track last game mode for score display (always set to current game mode)
+        if self.game_mode:
+            self.last_game_mode = self.game_mode
+
+    def place_gift_box(self):
+        # Place the gift box at a random location not occupied by players or hiding spots
+        excluded = layouts.start_positions(self.grid_size) + self.hiding_spots
+        self.gift_box_location = layouts.sample_cells(self.grid_size, 1, excluded, self.rng, self.blocks)[0]
+
+    def generate_hiding_spots(self):
+        if self.layout_source is not None:
+            # Stream the next pre-generated board instead of rolling a new one
+            layout = next(self.layout_source, None)
+            if layout is None and iter(self._layouts) is not self._layouts:
+                # A file or list runs out: start again from its first board
+                self.layout_source = iter(self._layouts)
+                layout = next(self.layout_source, None)
+            if layout is not None:
+                self.hiding_spots, self.gift_box_location = layout
+                return
+            self.layout_source = None  # a spent iterator or an empty file, roll boards from now on
+        # Starting positions are excluded, and no cell is drawn twice
+        self.hiding_spots, self.gift_box_location = layouts.generate_layout(self.grid_size, self.rng)
+
+    def is_position_blocked(self, pos):
+        """Check if a position is blocked by any block"""
+        return core.cell_blocked(self.blocks, pos[0], pos[1])
+
+    def can_place_block(self, x, y, orientation):
+        """Check if a block can be placed at the given position and orientation"""
+        # In bounds, on free cells, off both seekers, the hiding spots and the gift box
+        if not core.placement_clear(self.grid_size, self.blocks, x, y, orientation, self.seeker1_pos,
+                                    self.seeker2_pos, self.hiding_spots, self.gift_box_location):
+            return False
+        # Never wall a seeker off from any hiding spot
+        if self.connectivity.placement_disconnects(x, y, orientation, self.blocks, self.blocks_epoch,
+                                                   (self.seeker1_pos, self.seeker2_pos), self.hiding_spots):
+            return False
+        return True
+
+    def placement_mask(self, orientation):
+        """Legal block anchors for one orientation, a bytearray indexed x * grid_size + y
+
+        Built with the same checks as can_place_block, except that anchors
+        passing every cheap check hold UNCHECKED until legal_placement asks
+        the connectivity question for them. Rebuilt when the blocks, seekers,
+        hiding spots or gift box change.
+        """
+        signature = (self.blocks_epoch, self.seeker1_pos, self.seeker2_pos, self.gift_box_location,
+                     tuple(self.hiding_spots))
+        cached = self._placement_masks.get(orientation)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        n = self.grid_size
+        mask = bytearray([UNCHECKED]) * (n * n)
+        if orientation == "horizontal":
+            mask[n - 1::n] = bytes(n)  # the second cell would be off the right edge
+            anchors = ((0, 0), (0, -1))  # anchors whose block covers a cell
+        else:
+            mask[(n - 1) * n:] = bytes(n)
+            anchors = ((0, 0), (-1, 0))
+        occupied = pathfinding.blocked_cells(self.blocks)
+        occupied.update((self.seeker1_pos, self.seeker2_pos), self.hiding_spots)
+        if self.gift_box_location is not None:
+            occupied.add(self.gift_box_location)
+        for cx, cy in occupied:
+            for dx, dy in anchors:
+                x, y = cx + dx, cy + dy
+                if 0 <= x < n and 0 <= y < n:
+                    mask[x * n + y] = ILLEGAL
+        self._placement_masks[orientation] = (signature, mask)
+        return mask
+
+    def legal_placement(self, x, y, orientation):
+        """Same answer as can_place_block, read from the placement mask"""
+        if not (0 <= x < self.grid_size and 0 <= y < self.grid_size):
+            return False
+        mask = self.placement_mask(orientation)
+        i = x * self.grid_size + y
+        if mask[i] == UNCHECKED:
+            disconnects = self.connectivity.placement_disconnects(
+                x, y, orientation, self.blocks, self.blocks_epoch, (self.seeker1_pos, self.seeker2_pos),
+                self.hiding_spots)
+            mask[i] = ILLEGAL if disconnects else LEGAL
+        return mask[i] == LEGAL
+
+    def place_block(self, x, y, orientation, player):
+        """Place a block at the given position and orientation"""
+        if self.can_place_block(x, y, orientation):
+            self.blocks.append((x, y, orientation))
+            self.blocks_epoch = self.path_service.new_epoch()
+            if player == 1:
+                self.player1_blocks_remaining -= 1
+            else:
+                self.player2_blocks_remaining -= 1
+            return True
+        return False
+
+    @contextmanager
+    def trial_block(self, x, y, orientation):
+        """Temporarily add a block, e.g. to measure its effect on distances"""
+        saved_epoch = self.blocks_epoch
+        self.blocks.append((x, y, orientation))
+        self.blocks_epoch = self.path_service.new_epoch()
+        try:
+            yield
+        finally:
+            self.blocks.pop()
+            self.blocks_epoch = saved_epoch
+
+    def block_table(self):
+        """Precomputed distances to Jerry for this board from the table cache, or None"""
+        if self.table_cache is None or self.hidden_pos not in self.hiding_spots \
+                or self.path_service.pathfinder.name == "hpa":
+            return None  # the hpa backend's distances are approximate, the tables' are exact
+        return self.table_cache.get(self.grid_size, self.hiding_spots, self.gift_box_location, self.blocks,
+                                    self.hidden_pos)
+
+    def trial_distances(self, x, y, orientation, table=None):
+        """Both seekers' distances to Jerry if a block were added, read from table when given"""
+        if table is not None:
+            block = (x, y, orientation)
+            return table.distance(self.seeker1_pos, block), table.distance(self.seeker2_pos, block)
+        with self.trial_block(x, y, orientation):
+            return (self.a_star_distance(self.seeker1_pos, self.hidden_pos),
+                    self.a_star_distance(self.seeker2_pos, self.hidden_pos))
+
+    def a_star_distance(self, start, goal):
+        return self.path_service.distance(start, goal, self.blocks, self.blocks_epoch)
+
+    def a_star_path(self, start, goal):
+        """A* algorithm that returns the actual path, not just distance"""
+        return self.path_service.path(start, goal, self.blocks, self.blocks_epoch)
+
+    def get_player_likely_path(self):
+        """Get the likely path the player will take to reach Jerry"""
+        # Use A* to find the shortest path from player to Jerry
+        return self.a_star_path(self.seeker1_pos, self.hidden_pos)
+
+    def get_feedback(self, distance):
+        if distance == 0:
+            return "FOUND"
+        elif distance <= 2:
+            return "BURNING"
+        elif distance <= 4:
+            return "HOT"
+        elif distance <= 6:
+            return "WARM"
+        elif distance <= 10:
+            return "COOL"
+        return "COLD"
+
+    def show_feedback(self, pos):
+        """Show the feedback for a seeker standing on pos"""
+        self.feedback_text = self.get_feedback(self.a_star_distance(pos, self.hidden_pos))
+        # Everything on screen is public, so the fair computer may learn from it
+        self.last_feedback = (pos, self.feedback_text, self.blocks_epoch)
+
+    def move_target_to_new_location(self, new_pos=None):
+        """Move Jerry to a new random hiding location, but never to a position where a player is standing
+
+        ``new_pos`` replays a spot that was drawn elsewhere.
+        """
+        if self.hiding_spots:
+            old_pos = self.hidden_pos
+
+            # Choose a new location different from current and not occupied by a player
+            possible_spots = [pos for pos in self.hiding_spots if pos != self.hidden_pos and pos != self.seeker1_pos and pos != self.seeker2_pos]
+            if not possible_spots:
+                # If all other spots are occupied, fallback to any spot not occupied by a player
+                possible_spots = [pos for pos in self.hiding_spots if pos != self.seeker1_pos and pos != self.seeker2_pos]
+            if new_pos is not None:
+                self.hidden_pos = new_pos
+            elif possible_spots:
+                new_pos = self.rng.choice(possible_spots)
+                self.hidden_pos = new_pos
+            self.last_feedback = None
+            for policy in self._policies.values():
+                policy.on_target_moved(policies.StateView(self, policy.peeks))
+            # Update feedback for current player
+            if self.state == GameState.PLAYER1_TURN:
+                self.show_feedback(self.seeker1_pos)
+            elif self.state == GameState.PLAYER2_TURN:
+                self.show_feedback(self.seeker2_pos)
+            self.on_target_moved(old_pos)
+
+    def freeze_opponent(self, player):
+        # player: 1 or 2 (the one who collected the gift)
+        if player == 1:
+            self.player2_frozen_turns = 2
+        else:
+            self.player1_frozen_turns = 2
+
+    def seeker_pos(self, player):
+        return self.seeker1_pos if player == 1 else self.seeker2_pos
+
+    def legal_moves(self, player):
+        """(direction, cell) for every move the player's seeker could make"""
+        x, y = self.seeker_pos(player)
+        moves = []
+        for name, (dx, dy) in DIRECTIONS.items():
+            cell = (x + dx, y + dy)
+            if 0 <= cell[0] < self.grid_size and 0 <= cell[1] < self.grid_size and not self.is_position_blocked(cell):
+                moves.append((name, cell))
+        return moves
+
+    def end_turn(self):
+        self.state = GameState.PLAYER2_TURN if self.state == GameState.PLAYER1_TURN else GameState.PLAYER1_TURN
+
+    def move_seeker(self, player, direction):
+        """Move a player's seeker one cell and resolve the turn
+
+        Returns False, and keeps the turn, if the move would leave the board
+        or run into a block.
+        """
+        x, y = self.seeker_pos(player)
+        dx, dy = DIRECTIONS[direction]
+        new_pos = (x + dx, y + dy)
+        if not (0 <= new_pos[0] < self.grid_size and 0 <= new_pos[1] < self.grid_size):
+            return False
+        if self.is_position_blocked(new_pos):
+            return False
+        if player == 1:
+            self.seeker1_pos = new_pos
+            self.tom_direction = direction
+        else:
+            self.seeker2_pos = new_pos
+            self.spike_direction = direction
+        # Check for gift box collection
+        if self.gift_box_location and new_pos == self.gift_box_location:
+            self.collect_gift(player)
+        if new_pos == self.hidden_pos:
+            self.declare_winner(player)
+        else:
+            self.show_feedback(new_pos)
+            self.end_turn()
+        return True
+
+    def take_action(self, player, action):
+        """Play ("move", direction), ("block", x, y, orientation) or ("move_target",)
+
+        Returns False, and changes nothing, when it is not the player's turn
+        or the rules do not allow the action.
+        """
+        if self.state != (GameState.PLAYER1_TURN if player == 1 else GameState.PLAYER2_TURN):
+            return False
+        kind = action[0]
+        if kind == "move":
+            return action[1] in DIRECTIONS and self.move_seeker(player, action[1])
+        if kind == "block":
+            _, x, y, orientation = action
+            remaining = self.player1_blocks_remaining if player == 1 else self.player2_blocks_remaining
+            if remaining <= 0 or orientation not in ("horizontal", "vertical") \
+                    or not (0 <= x < self.grid_size and 0 <= y < self.grid_size) \
+                    or not self.place_block(x, y, orientation, player):
+                return False
+            self.end_turn()
+            return True
+        if kind == "move_target":
+            if self.player1_moved_target if player == 1 else self.player2_moved_target:
+                return False
+            self.use_move_target(player)
+            return True
+        return False
+
+    def use_move_target(self, player, new_pos=None):
+        """Spend the player's one Move Target and end their turn"""
+        self.move_target_to_new_location(new_pos)
+        if player == 1:
+            self.player1_moved_target = True
+        else:
+            self.player2_moved_target = True
+        self.end_turn()
+
+    def collect_gift(self, player):
+        """The player picks up the gift box, which freezes their opponent"""
+        pos = self.gift_box_location
+        self.gift_box_location = None
+        self.freeze_opponent(player)
+        self.on_gift_collected(player, pos)
+
+    def skip_frozen_turn(self):
+        """Use up the current player's turn if they are frozen, returns True if it did"""
+        if self.state == GameState.PLAYER1_TURN and self.player1_frozen_turns > 0:
+            self.player1_frozen_turns -= 1
+            if self.player1_frozen_turns == 0:
+                self.on_unfrozen(1)
+            self.state = GameState.PLAYER2_TURN
+            return True
+        if self.state == GameState.PLAYER2_TURN and self.player2_frozen_turns > 0:
+            self.player2_frozen_turns -= 1
+            if self.player2_frozen_turns == 0:
+                self.on_unfrozen(2)
+            self.state = GameState.PLAYER1_TURN
+            return True
+        return False
+
+    def declare_winner(self, player):
+        if player == 1:
+            self.winner = "Tom (Player 1)"
+            self.scores["Tom"] += 1
+        elif self.game_mode == 'pvp':
+            self.winner = "Spike (Player 2)"
+            if self.last_game_mode == 'pvp':
+                self.scores["Spike"] += 1
+            elif self.last_game_mode == 'pvc':
+                self.scores["Computer"] += 1
+        else:
+            self.winner = "Computer"
+            if self.last_game_mode == 'pvc':
+                self.scores["Computer"] += 1
+        self.state = GameState.GAME_OVER
+        self.on_round_over(player)
+
+    def computer_move(self):
+        """Play the computer's whole turn"""
+        for _ in self.computer_turn():
+            pass
+
+    def computer_turn(self):
+        """The computer's turn as a generator that yields while it searches
+
+        A host running many games advances it a little at a time, so one long
+        block search cannot hold up the other games. With a telemetry sink set
+        the turn is recorded as it runs.
+        """
+        turn = self._computer_turn()
+        if self.telemetry is not None:
+            turn = telemetry.recorded_turn(self, turn)
+        return turn
+
+    def _computer_turn(self):
+        policy = self.policy(self.computer_difficulty)
+        action, overran = yield from policies.timed_decision(
+            policy, policies.StateView(self, policy.peeks), self.stats_for(policy), policy.budget)
+        played = policy
+        if overran:
+            # Too slow this time, the cheap fallback plays the turn
+            played = self.policy(policy.fallback)
+            action, _ = yield from policies.timed_decision(
+                played, policies.StateView(self, played.peeks), self.stats_for(played), played.budget)
+        self.ai_fallback = overran
+        self.ai_branch = played.branch or (action[0] if action else "pass")
+        if policy.search is not None:
+            self.ai_block_search = policy.search
+        if action is None or not self.take_action(2, action):
+            if action is not None:
+                self.stats_for(played).rejected += 1
+            self.end_turn()
+        for p in {policy, played}:
+            p.on_played(policies.StateView(self, p.peeks))
+
+    def policy(self, name):
+        """The policy playing as name in this game, made on first use"""
+        policy = self._policies.get(name)
+        if policy is None:
+            policy = self._policies[name] = policies.make(name)
+        return policy
+
+    def stats_for(self, policy):
+        if policy.name not in self.policy_stats:
+            self.policy_stats[policy.name] = policies.LatencyHistogram()
+        return self.policy_stats[policy.name]
+
+    @property
+    def belief(self):
+        """The fair computer's belief.SpotBelief for this round, None before its first turn"""
+        fair = self._policies.get("fair")
+        return fair.belief if fair is not None else None
@@ -0,0 +1,220 @@
+"""Headless host running many rounds at once on one asyncio loop.
+
+Every session is a plain ``rules.RoundState``. The sessions share what is
+read-only or keyed so it cannot mix games up: one pathfinder and one
+``PathService`` LRU, whose epochs are unique across all the sessions
+using it. The cache is sized per session, so its share of memory grows
+with the number of games rather than with how busy one of them is.
+
+Players act through ``submit`` and wait with ``wait_turn``. Computer turns
+run on a single scheduler task as ``RoundState.computer_turn`` generators:
+each one is advanced for at most ``slice_seconds`` and then sent to the
+back of the queue, so one slow block search on a crowded board delays the
+other games by a slice, not by the whole search. A computer turn that
+raises is logged and closes its own session only.
+"""
+import asyncio
+import enum
+import itertools
+import logging
+import random
+import sys
+import time
+from collections import deque
+
+import pathfinding
+from rules import GRID_SIZE, GameState, RoundState
+
+SLICE_SECONDS = 0.001
+PATH_CACHE_PER_SESSION = 64
+MAX_SESSIONS = 1000
+
+log = logging.getLogger(__name__)
+
+
+class Session:
+    """One hosted round, the players waiting on it and its computer's work so far"""
+
+    def __init__(self, session_id, round_state):
+        self.id = session_id
+        self.round = round_state
+        self.turn = None  # the computer's unfinished computer_turn() generator
+        self.changed = asyncio.Event()
+        self.ai_seconds = 0.0
+        self.ai_slices = 0
+
+
+def footprint(obj, shared=()):
+    """Bytes held by obj and everything it references, except the shared objects"""
+    seen = {id(s) for s in shared}
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, (type, enum.Enum)) or type(item).__name__ == "module":
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        nbytes = getattr(item, "nbytes", None)
+        if isinstance(nbytes, int) and getattr(item, "base", None) is None:
+            total += nbytes  # NumPy arrays own their buffer outside getsizeof
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__"):
+            stack.append(vars(item))
+    return total
+
+
+class SessionHost:
+    """Many concurrent rounds, human or computer, sharing one pathfinding cache
+
+    ``memory_budget`` is the most bytes a new session may take up, measured
+    with ``footprint`` when it is created, apart from the shared objects.
+    """
+
+    def __init__(self, grid_size=GRID_SIZE, pathfinding_backend="auto", max_sessions=MAX_SESSIONS,
+                 path_cache_per_session=PATH_CACHE_PER_SESSION, slice_seconds=SLICE_SECONDS,
+                 memory_budget=None, telemetry=None, table_cache=None):
+        pathfinder = pathfinding.make_pathfinder(pathfinding_backend, grid_size)
+        if pathfinder.name == "hpa":
+            # Its cluster graph follows one blocks list, sessions would rebuild it in turn
+            raise ValueError("The hpa backend cannot be shared between sessions")
+        self.grid_size = grid_size
+        self.path_service = pathfinding.PathService(pathfinder, max_sessions * path_cache_per_session)
+        self.max_sessions = max_sessions
+        self.slice_seconds = slice_seconds
+        self.memory_budget = memory_budget
+        self.telemetry = telemetry  # optional sink for computer turn records, tagged with the session id
+        self.table_cache = table_cache  # optional precompute.TableCache for the computer's block searches
+        self.sessions = {}
+        self._ids = itertools.count(1)
+        self._ready = deque()  # sessions whose computer has a turn to play
+        self._wakeup = asyncio.Event()
+        self._scheduler = None
+
+    def start(self):
+        """Start playing computer turns on the running loop"""
+        self._scheduler = asyncio.get_running_loop().create_task(self._run_computer_turns())
+
+    async def close(self):
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            await asyncio.gather(self._scheduler, return_exceptions=True)
+            self._scheduler = None
+
+    def create_session(self, mode="pvc", difficulty="normal", seed=None):
+        """Start a new round, returns its Session
+
+        In 'pvc' the host plays Spike (player 2) at the given difficulty, in
+        'pvp' both players submit their own actions.
+        """
+        if len(self.sessions) >= self.max_sessions:
+            raise RuntimeError(f"The host is full ({self.max_sessions} sessions)")
+        r = RoundState(self.grid_size, rng=random.Random(seed), path_service=self.path_service)
+        r.game_mode = mode
+        r.computer_difficulty = difficulty
+        r.table_cache = self.table_cache
+        r.reset_round()
+        session = Session(next(self._ids), r)
+        if self.telemetry is not None:
+            r.telemetry = self.telemetry.tagged(session=session.id)
+        if self.memory_budget is not None:
+            size = self.session_footprint(session)
+            if size > self.memory_budget:
+                raise RuntimeError(f"A session takes {size} bytes, over the budget of {self.memory_budget}")
+        self.sessions[session.id] = session
+        return session
+
+    def close_session(self, session_id):
+        session = self.sessions.pop(session_id)
+        session.turn = None
+        self._notify(session)
+
+    def session_footprint(self, session):
+        """Bytes one session holds on its own, without the shared pathfinding cache"""
+        return footprint(session, shared=(self.path_service, session.changed, self.telemetry, self.table_cache))
+
+    def submit(self, session_id, player, action):
+        """Play a player's action, returns False if the rules refuse it
+
+        Actions use the ``RoundState.take_action`` tuples. In 'pvc' only
+        player 1 may submit.
+        """
+        session = self.sessions[session_id]
+        r = session.round
+        if r.game_mode == "pvc" and player != 1:
+            return False
+        if not r.take_action(player, action):
+            return False
+        self._after_action(session)
+        return True
+
+    def next_round(self, session_id):
+        """Start the next round of a finished session, returns False if it is still running"""
+        session = self.sessions[session_id]
+        if session.round.state != GameState.GAME_OVER:
+            return False
+        session.round.reset_round()
+        self._notify(session)
+        return True
+
+    async def wait_turn(self, session_id, player):
+        """Wait until it is the player's turn or the round is over, returns the state"""
+        session = self.sessions[session_id]
+        turn = GameState.PLAYER1_TURN if player == 1 else GameState.PLAYER2_TURN
+        while session.round.state not in (turn, GameState.GAME_OVER) and session.id in self.sessions:
+            await session.changed.wait()
+        return session.round.state
+
+    def _after_action(self, session):
+        r = session.round
+        while r.state != GameState.GAME_OVER and r.skip_frozen_turn():
+            pass
+        if r.game_mode == "pvc" and r.state == GameState.PLAYER2_TURN:
+            session.turn = r.computer_turn()
+            self._ready.append(session)
+            self._wakeup.set()
+        self._notify(session)
+
+    def _notify(self, session):
+        # Wake everyone waiting now, later waiters get a fresh event
+        session.changed.set()
+        session.changed = asyncio.Event()
+
+    async def _run_computer_turns(self):
+        clock = time.perf_counter
+        while True:
+            if not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            session = self._ready.popleft()
+            if session.turn is None:
+                continue  # closed while it waited
+            start = clock()
+            deadline = start + self.slice_seconds
+            failed = False
+            try:
+                while clock() < deadline:
+                    next(session.turn)
+            except StopIteration:
+                session.turn = None
+            except Exception:
+                # A bug in one game's computer ends that game, not the host's scheduler
+                log.exception("Computer turn failed in session %s, closing it", session.id)
+                session.turn = None
+                failed = True
+            else:
+                self._ready.append(session)
+            session.ai_seconds += clock() - start
+            session.ai_slices += 1
+            if session.turn is None and session.id in self.sessions:
+                if failed:
+                    self.close_session(session.id)
+                else:
+                    self._after_action(session)
+            # Give the players' coroutines a chance between slices
+            await asyncio.sleep(0)
@@ -0,0 +1,61 @@
+"""Scaled copies of the game's images, kept under a byte budget.
+
+Sprites are loaded once at their original resolution. Whenever the board
+is drawn at a size, the default one or another because the player zoomed
+or the window was resized, each original is scaled the first time it is
+drawn at that size and the copy is kept here, keyed by the original and
+the size. Only the images that actually get drawn are scaled, so a
+resize never rescales every animation frame at once. Once the copies take
+more than ``max_bytes`` the least recently drawn ones are dropped, so sizes
+the window no longer uses do not stay in memory.
+"""
+from collections import OrderedDict
+
+import pygame
+
+MAX_BYTES = 32 * 1024 * 1024
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+class SpriteCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # (image id, size) -> (image, scaled copy), the image is kept so its id is never reused
+        self._scaled = OrderedDict()
+
+    def get(self, image, size):
+        """image scaled to size, scaled on the first request for that size"""
+        key = (id(image), size)
+        entry = self._scaled.get(key)
+        if entry is not None:
+            self._scaled.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        scaled = pygame.transform.scale(image, size)
+        self._scaled[key] = (image, scaled)
+        self.bytes += surface_bytes(scaled)
+        # The copy just made stays, even on its own over budget
+        while self.bytes > self.max_bytes and len(self._scaled) > 1:
+            _, (_, dropped) = self._scaled.popitem(last=False)
+            self.bytes -= surface_bytes(dropped)
+            self.evictions += 1
+        return scaled
+
+    def values(self):
+        """The scaled copies, least recently used first"""
+        return [scaled for _, scaled in self._scaled.values()]
+
+    def clear(self):
+        self._scaled.clear()
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self._scaled)
@@ -0,0 +1,179 @@
+"""Per-turn records of what the computer decided and what it cost.
+
+Set ``RoundState.telemetry`` to a sink and every computer turn writes one
+record to it: the branch it took (Move Target, gift chase, block or move),
+the block search's candidate count and best score, the pathfinding queries
+it made, how many of them missed the cache and ran a search, the nodes those
+searches expanded, and the wall time spent in the turn. With no sink set
+nothing is measured, ``computer_turn`` hands back the plain generator.
+
+Records are buffered and written as JSON lines, one per turn::
+
+    python hide_seek_game.py --telemetry ai.jsonl
+    python telemetry.py ai.jsonl
+
+The second command prints where the computer spent its time, by difficulty
+and branch.
+"""
+import argparse
+import json
+import time
+from collections import defaultdict
+
+BUFFER_RECORDS = 1000
+
+
+class JsonlSink:
+    """Buffered JSON lines file, written out every buffer_records records"""
+
+    def __init__(self, path, buffer_records=BUFFER_RECORDS):
+        self.path = path
+        self.buffer_records = buffer_records
+        self._file = open(path, "w", encoding="utf-8")
+        self._buffer = []
+
+    def write(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.buffer_records:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write("".join(json.dumps(record, separators=(",", ":")) + "\n" for record in self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+
+    def tagged(self, **tags):
+        """A sink writing here that adds tags, e.g. a game number, to every record"""
+        return TaggedSink(self, tags)
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemorySink:
+    """Keeps the records in a list, for benchmarks and tools"""
+
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+    def tagged(self, **tags):
+        return TaggedSink(self, tags)
+
+
+class TaggedSink:
+    def __init__(self, sink, tags):
+        self.sink = sink
+        self.tags = tags
+
+    def write(self, record):
+        record.update(self.tags)
+        self.sink.write(record)
+
+    def tagged(self, **tags):
+        return TaggedSink(self.sink, {**self.tags, **tags})
+
+
+def recorded_turn(r, turn):
+    """Run a computer_turn generator and write a record of it to r.telemetry
+
+    Counters are only read around each slice of the turn, so other games
+    sharing the path service between slices do not count towards this one.
+    """
+    service = r.path_service
+    pathfinder = service.pathfinder
+    r.ai_branch = None
+    r.ai_block_search = None
+    seeker1, seeker2, hidden = r.seeker1_pos, r.seeker2_pos, r.hidden_pos
+    seconds = 0.0
+    queries = searches = nodes = slices = 0
+    while True:
+        hits, misses = service.hits, service.misses
+        expanded = getattr(pathfinder, "nodes_expanded", 0)
+        start = time.perf_counter()
+        try:
+            next(turn)
+            done = False
+        except StopIteration:
+            done = True
+        seconds += time.perf_counter() - start
+        queries += service.hits - hits + service.misses - misses
+        searches += service.misses - misses
+        nodes += getattr(pathfinder, "nodes_expanded", 0) - expanded
+        slices += 1
+        if done:
+            break
+        yield
+    record = {
+        "difficulty": r.computer_difficulty,
+        "branch": r.ai_branch,
+        "fallback": r.ai_fallback,
+        "ms": round(seconds * 1000, 3),
+        "slices": slices,
+        "queries": queries,
+        "searches": searches,
+        "nodes": nodes,
+        "seeker1": seeker1,
+        "seeker2": seeker2,
+        "hidden": hidden,
+        "blocks": len(r.blocks),
+    }
+    if r.ai_block_search is not None:
+        record.update(r.ai_block_search)
+    if r.ai_branch == "block":
+        record["placed"] = r.blocks[-1]  # may not be best_block when the fallbacks chose
+    r.telemetry.write(record)
+
+
+def read(path):
+    """Yield the records of a JSON lines file"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def summarize(records):
+    """Totals per (difficulty, branch): turns, milliseconds, searches, nodes, slowest turn"""
+    totals = defaultdict(lambda: {"turns": 0, "ms": 0.0, "max_ms": 0.0, "searches": 0, "nodes": 0,
+                                  "candidates": 0})
+    for record in records:
+        row = totals[(record["difficulty"], record["branch"])]
+        row["turns"] += 1
+        row["ms"] += record["ms"]
+        row["max_ms"] = max(row["max_ms"], record["ms"])
+        row["searches"] += record["searches"]
+        row["nodes"] += record["nodes"]
+        row["candidates"] += record.get("candidates", 0)
+    return dict(totals)
+
+
+def print_summary(totals):
+    total_ms = sum(row["ms"] for row in totals.values()) or 1.0
+    print(f"{'difficulty':<10} {'branch':<12} {'turns':>7} {'time':>6} {'mean ms':>8} {'max ms':>8}"
+          f" {'searches':>9} {'nodes':>10} {'candidates':>10}")
+    for (difficulty, branch), row in sorted(totals.items(), key=lambda item: -item[1]["ms"]):
+        print(f"{difficulty:<10} {branch or '-':<12} {row['turns']:>7} {row['ms'] / total_ms:>6.1%}"
+              f" {row['ms'] / row['turns']:>8.3f} {row['max_ms']:>8.2f} {row['searches']:>9}"
+              f" {row['nodes']:>10} {row['candidates']:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize computer turn telemetry")
+    parser.add_argument("path", help="JSON lines file written with --telemetry")
+    args = parser.parse_args(argv)
+    print_summary(summarize(read(args.path)))
+
+
+if __name__ == "__main__":
+    main()